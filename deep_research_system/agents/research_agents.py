@@ -1,16 +1,100 @@
 """
 Specialized research agents for comprehensive deep research
 """
+import asyncio
+import copy
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache, partial, wraps
 from crewai import Agent
-from typing import List, Dict, Any
+from types import MappingProxyType
+from typing import List, Any, Callable, Mapping, Optional, Tuple
 from deep_research_system.config import Config
 from deep_research_system.tools.search_tools import web_search_tool, academic_search_tool, content_extraction_tool
 from deep_research_system.tools.analysis_tools import text_analysis_tool, data_visualization_tool, statistical_analysis_tool
 
+# Tool sets per agent type (specialists share the researcher tools)
+_MANAGER_TOOLS = (web_search_tool, academic_search_tool, text_analysis_tool)
+_RESEARCHER_TOOLS = (web_search_tool, academic_search_tool, content_extraction_tool, text_analysis_tool)
+_ANALYST_TOOLS = (text_analysis_tool, data_visualization_tool, statistical_analysis_tool, web_search_tool)
+_EDITOR_TOOLS = (text_analysis_tool, web_search_tool)
+_REPORTER_TOOLS = (text_analysis_tool, data_visualization_tool, web_search_tool)
+
+# Topic keywords that pull a domain specialist into the team, keyed by specialty
+_SPECIALTY_KEYWORDS = {
+    "technology": frozenset({"tech", "software", "ai", "machine learning", "programming"}),
+    "business": frozenset({"business", "market", "company", "industry", "strategy"}),
+    "science": frozenset({"science", "research", "study", "experiment", "laboratory"}),
+    "finance": frozenset({"finance", "investment", "market", "economy", "financial"}),
+}
+
+# Reverse index from each keyword to every specialty it signals
+_KEYWORD_SPECIALTIES = {
+    keyword: tuple(specialty for specialty, keywords in _SPECIALTY_KEYWORDS.items() if keyword in keywords)
+    for keyword in frozenset().union(*_SPECIALTY_KEYWORDS.values())
+}
+
+# Single-pass matcher over every specialty keyword; the lookahead reports overlapping
+# hits so a keyword shared between specialties (e.g. "market") counts for each of them
+_SPECIALTY_RE = re.compile("(?=({}))".format("|".join(
+    re.escape(keyword) for keyword in sorted(_KEYWORD_SPECIALTIES, key=len, reverse=True)
+)))
+
+# Team role under which each detected specialist is registered
+_SPECIALIST_ROLES = {
+    "technology": "tech_specialist",
+    "business": "business_specialist",
+    "science": "science_specialist",
+    "finance": "finance_specialist",
+}
+
+# Static specialist definitions, shared read-only across factory calls
+_SPECIALTIES: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    "technology": MappingProxyType({
+        "role": "Technology Research Specialist",
+        "goal": "Conduct in-depth research on technology trends, innovations, and technical specifications",
+        "backstory": "You are a technology expert with deep knowledge of current tech trends, emerging technologies, and technical specifications. You stay updated with the latest developments in software, hardware, and digital innovations."
+    }),
+    "business": MappingProxyType({
+        "role": "Business Research Specialist", 
+        "goal": "Research business strategies, market trends, competitive analysis, and industry insights",
+        "backstory": "You are a business research expert with expertise in market analysis, competitive intelligence, business strategies, and industry trends. You understand business models, financial metrics, and market dynamics."
+    }),
+    "science": MappingProxyType({
+        "role": "Scientific Research Specialist",
+        "goal": "Conduct research on scientific topics, peer-reviewed studies, and academic publications",
+        "backstory": "You are a scientific research specialist with expertise in academic literature, peer-reviewed studies, and scientific methodology. You understand research design, statistical analysis, and scientific reporting standards."
+    }),
+    "finance": MappingProxyType({
+        "role": "Financial Research Specialist",
+        "goal": "Research financial markets, economic indicators, investment opportunities, and financial analysis",
+        "backstory": "You are a financial research expert with deep knowledge of markets, economic indicators, investment strategies, and financial analysis. You understand financial statements, market dynamics, and economic trends."
+    })
+})
+
+def _provider_key() -> Tuple[Any, ...]:
+    """Snapshot of the Config settings that decide which model each agent gets"""
+    overrides = Config.AGENT_PROVIDER_OVERRIDES or {}
+    models = tuple((provider, tuple(settings.items())) for provider, settings in Config._provider_configs().items())
+    return (Config.PREFERRED_AI_PROVIDER, tuple(sorted(overrides.items())), models)
+
+def _cached_agent(factory: Callable[..., Agent]) -> Callable[..., Agent]:
+    """Memoize an agent factory per provider, returning shallow copies so teams don't share agent state"""
+    # Keyed on the provider so Config.set_preferred_provider() never serves agents built for the previous one
+    cached_factory = lru_cache(maxsize=None)(lambda _provider, *args, **kwargs: factory(*args, **kwargs))
+    
+    @wraps(factory)
+    def wrapper(*args, **kwargs) -> Agent:
+        return copy.copy(cached_factory(_provider_key(), *args, **kwargs))
+    
+    wrapper.cache_clear = cached_factory.cache_clear
+    return wrapper
+
 class ResearchAgentFactory:
     """Factory for creating specialized research agents"""
     
     @staticmethod
+    @_cached_agent
     def create_manager_agent() -> Agent:
         """Create the research manager agent"""
         return Agent(
@@ -21,15 +105,12 @@ class ResearchAgentFactory:
             and ensuring the final research output is comprehensive, well-structured, and meets the highest quality standards. 
             You have a strong background in project management and research methodology.""",
             allow_delegation=True,
-            tools=[
-                web_search_tool,
-                academic_search_tool,
-                text_analysis_tool
-            ],
+            tools=list(_MANAGER_TOOLS),
             **Config.get_agent_config("manager")
         )
     
     @staticmethod
+    @_cached_agent
     def create_researcher_agent() -> Agent:
         """Create the primary researcher agent"""
         return Agent(
@@ -39,16 +120,12 @@ class ResearchAgentFactory:
             You have a keen eye for identifying credible sources, extracting relevant information, and synthesizing findings into coherent insights. 
             Your research methodology is thorough and systematic, ensuring no important information is overlooked.""",
             allow_delegation=False,
-            tools=[
-                web_search_tool,
-                academic_search_tool,
-                content_extraction_tool,
-                text_analysis_tool
-            ],
+            tools=list(_RESEARCHER_TOOLS),
             **Config.get_agent_config("researcher")
         )
     
     @staticmethod
+    @_cached_agent
     def create_analyst_agent() -> Agent:
         """Create the data analyst agent"""
         return Agent(
@@ -58,16 +135,12 @@ class ResearchAgentFactory:
             You excel at transforming raw research data into meaningful insights through quantitative analysis, creating compelling visualizations, 
             and identifying correlations and trends that support research conclusions. Your analytical approach is both rigorous and creative.""",
             allow_delegation=False,
-            tools=[
-                text_analysis_tool,
-                data_visualization_tool,
-                statistical_analysis_tool,
-                web_search_tool
-            ],
+            tools=list(_ANALYST_TOOLS),
             **Config.get_agent_config("analyst")
         )
     
     @staticmethod
+    @_cached_agent
     def create_editor_agent() -> Agent:
         """Create the content editor agent"""
         return Agent(
@@ -77,14 +150,12 @@ class ResearchAgentFactory:
             You have a strong command of language, excellent attention to detail, and the ability to improve content structure and flow. 
             You ensure that all research outputs meet the highest standards of quality, accuracy, and readability while maintaining the integrity of the original findings.""",
             allow_delegation=False,
-            tools=[
-                text_analysis_tool,
-                web_search_tool
-            ],
+            tools=list(_EDITOR_TOOLS),
             **Config.get_agent_config("editor")
         )
     
     @staticmethod
+    @_cached_agent
     def create_reporter_agent() -> Agent:
         """Create the report generator agent"""
         return Agent(
@@ -94,108 +165,198 @@ class ResearchAgentFactory:
             You excel at organizing research findings into logical structures, creating executive summaries, and presenting information in formats 
             that are accessible to different audiences. Your reports are known for their clarity, thoroughness, and actionable insights.""",
             allow_delegation=False,
-            tools=[
-                text_analysis_tool,
-                data_visualization_tool,
-                web_search_tool
-            ],
+            tools=list(_REPORTER_TOOLS),
             **Config.get_agent_config("reporter")
         )
     
     @staticmethod
+    @_cached_agent
     def create_specialist_agent(specialty: str) -> Agent:
         """Create a specialist agent for specific domains"""
-        specialties = {
-            "technology": {
-                "role": "Technology Research Specialist",
-                "goal": "Conduct in-depth research on technology trends, innovations, and technical specifications",
-                "backstory": "You are a technology expert with deep knowledge of current tech trends, emerging technologies, and technical specifications. You stay updated with the latest developments in software, hardware, and digital innovations."
-            },
-            "business": {
-                "role": "Business Research Specialist", 
-                "goal": "Research business strategies, market trends, competitive analysis, and industry insights",
-                "backstory": "You are a business research expert with expertise in market analysis, competitive intelligence, business strategies, and industry trends. You understand business models, financial metrics, and market dynamics."
-            },
-            "science": {
-                "role": "Scientific Research Specialist",
-                "goal": "Conduct research on scientific topics, peer-reviewed studies, and academic publications",
-                "backstory": "You are a scientific research specialist with expertise in academic literature, peer-reviewed studies, and scientific methodology. You understand research design, statistical analysis, and scientific reporting standards."
-            },
-            "finance": {
-                "role": "Financial Research Specialist",
-                "goal": "Research financial markets, economic indicators, investment opportunities, and financial analysis",
-                "backstory": "You are a financial research expert with deep knowledge of markets, economic indicators, investment strategies, and financial analysis. You understand financial statements, market dynamics, and economic trends."
-            }
-        }
-        
-        if specialty not in specialties:
-            raise ValueError(f"Unknown specialty: {specialty}. Available: {list(specialties.keys())}")
-        
-        spec = specialties[specialty]
+        spec = _SPECIALTIES.get(specialty)
+        if spec is None:
+            raise ValueError(f"Unknown specialty: {specialty}. Available: {list(_SPECIALTIES.keys())}")
         
         return Agent(
             role=spec["role"],
             goal=spec["goal"],
             backstory=spec["backstory"],
             allow_delegation=False,
-            tools=[
-                web_search_tool,
-                academic_search_tool,
-                content_extraction_tool,
-                text_analysis_tool
-            ],
+            tools=list(_RESEARCHER_TOOLS),
             **Config.get_agent_config("researcher")
         )
 
 class ResearchTeam:
     """Manages a team of research agents"""
     
+    __slots__ = ("topic", "research_depth", "agents", "_factories", "_agents_tuple")
+    
     def __init__(self, topic: str, research_depth: str = "comprehensive"):
         self.topic = topic
         self.research_depth = research_depth
         self.agents = {}
+        self._factories = {}
+        self._agents_tuple = None
         self._create_team()
     
+    @classmethod
+    async def create_async(cls, topic: str, research_depth: str = "comprehensive") -> "ResearchTeam":
+        """Create a research team without blocking the running event loop"""
+        team = cls(topic, research_depth)
+        pending = team._pending_factories(team._factories)
+        semaphore = asyncio.Semaphore(max(1, Config.MAX_PARALLEL_AGENTS))
+        loop = asyncio.get_running_loop()
+        
+        async def build(factory: Callable[[], Agent]) -> Agent:
+            async with semaphore:
+                return await loop.run_in_executor(None, factory)
+        
+        results = await asyncio.gather(
+            *(build(factory) for _, factory in pending),
+            return_exceptions=True
+        )
+        for (role, _), result in zip(pending, results):
+            if isinstance(result, Exception):
+                print(f"Failed to create {role} agent: {result}")
+            else:
+                team.agents[role] = result
+        team._invalidate_views()
+        
+        return team
+    
+    @classmethod
+    def bulk(
+        cls,
+        topics: List[str],
+        research_depth: str = "comprehensive",
+        max_workers: Optional[int] = None
+    ) -> List["ResearchTeam"]:
+        """Create teams for many topics, building each distinct agent role only once"""
+        teams = [cls(topic, research_depth) for topic in topics]
+        
+        # Factories for the same role are interchangeable across teams
+        factories = {}
+        for team in teams:
+            for role, factory in team._factories.items():
+                factories.setdefault(role, factory)
+        
+        shared = {}
+        if factories:
+            workers = max(1, min(len(factories), max_workers or Config.MAX_PARALLEL_AGENTS))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(factory): role for role, factory in factories.items()}
+                for future in as_completed(futures):
+                    role = futures[future]
+                    try:
+                        shared[role] = future.result()
+                    except Exception as e:
+                        print(f"Failed to create {role} agent: {e}")
+        
+        # Each team gets its own shallow copies; failed roles stay pending for lazy retry
+        for team in teams:
+            team.agents = {role: copy.copy(shared[role]) for role in team._factories if role in shared}
+            team._invalidate_views()
+        
+        return teams
+    
     def _create_team(self):
-        """Create the research team based on topic and depth"""
+        """Plan the research team based on topic and depth; agents are built on first use"""
+        self._factories = dict(self._team_factories())
+    
+    def _team_factories(self) -> List[Tuple[str, Callable[[], Agent]]]:
+        """Get the (role, factory) pairs for the team based on topic analysis"""
         # Core team
-        self.agents["manager"] = ResearchAgentFactory.create_manager_agent()
-        self.agents["researcher"] = ResearchAgentFactory.create_researcher_agent()
-        self.agents["analyst"] = ResearchAgentFactory.create_analyst_agent()
-        self.agents["editor"] = ResearchAgentFactory.create_editor_agent()
-        self.agents["reporter"] = ResearchAgentFactory.create_reporter_agent()
+        factories = [
+            ("manager", ResearchAgentFactory.create_manager_agent),
+            ("researcher", ResearchAgentFactory.create_researcher_agent),
+            ("analyst", ResearchAgentFactory.create_analyst_agent),
+            ("editor", ResearchAgentFactory.create_editor_agent),
+            ("reporter", ResearchAgentFactory.create_reporter_agent),
+        ]
         
         # Add specialists based on topic analysis
-        topic_lower = self.topic.lower()
-        
-        if any(word in topic_lower for word in ["tech", "software", "ai", "machine learning", "programming"]):
-            self.agents["tech_specialist"] = ResearchAgentFactory.create_specialist_agent("technology")
+        detected = {
+            specialty
+            for keyword in _SPECIALTY_RE.findall(self.topic.lower())
+            for specialty in _KEYWORD_SPECIALTIES[keyword]
+        }
+        for specialty in _SPECIALTY_KEYWORDS:
+            if specialty in detected:
+                factories.append((
+                    _SPECIALIST_ROLES[specialty],
+                    partial(ResearchAgentFactory.create_specialist_agent, specialty)
+                ))
         
-        if any(word in topic_lower for word in ["business", "market", "company", "industry", "strategy"]):
-            self.agents["business_specialist"] = ResearchAgentFactory.create_specialist_agent("business")
+        return factories
+    
+    def _pending_factories(self, roles) -> List[Tuple[str, Callable[[], Agent]]]:
+        """Get the (role, factory) pairs for roles whose agents have not been built yet"""
+        return [
+            (role, self._factories[role])
+            for role in roles
+            if role in self._factories and role not in self.agents
+        ]
+    
+    def _materialize(self, roles):
+        """Build any agents for the given roles that have not been created yet"""
+        pending = self._pending_factories(roles)
+        if not pending:
+            return
         
-        if any(word in topic_lower for word in ["science", "research", "study", "experiment", "laboratory"]):
-            self.agents["science_specialist"] = ResearchAgentFactory.create_specialist_agent("science")
+        if len(pending) == 1:
+            role, factory = pending[0]
+            try:
+                self.agents[role] = factory()
+            except Exception as e:
+                print(f"Failed to create {role} agent: {e}")
+        else:
+            max_workers = max(1, min(len(pending), Config.MAX_PARALLEL_AGENTS))
+            
+            # Agent construction is dominated by client/tool setup latency, so build concurrently
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(factory): role for role, factory in pending}
+                for future in as_completed(futures):
+                    role = futures[future]
+                    try:
+                        self.agents[role] = future.result()
+                    except Exception as e:
+                        print(f"Failed to create {role} agent: {e}")
         
-        if any(word in topic_lower for word in ["finance", "investment", "market", "economy", "financial"]):
-            self.agents["finance_specialist"] = ResearchAgentFactory.create_specialist_agent("finance")
+        self._invalidate_views()
     
-    def get_agents(self) -> List[Agent]:
+    def get_agents(self) -> Tuple[Agent, ...]:
         """Get all agents in the team"""
-        return list(self.agents.values())
+        if self._agents_tuple is None:
+            self._materialize(self._factories)
+            # Preserve the planned team order regardless of build order
+            self._agents_tuple = tuple(
+                self.agents[role] for role in self._factories if role in self.agents
+            )
+        return self._agents_tuple
     
     def get_agent(self, role: str) -> Agent:
         """Get a specific agent by role"""
+        if role not in self.agents:
+            self._materialize((role,))
         return self.agents.get(role)
     
     def get_agent_roles(self) -> List[str]:
         """Get all agent roles in the team"""
-        return list(self.agents.keys())
+        # Builds the team once; only roles whose agent was actually built are listed, in team order
+        self.get_agents()
+        return [role for role in self._factories if role in self.agents]
     
     def add_specialist(self, specialty: str):
         """Add a specialist agent to the team"""
         agent = ResearchAgentFactory.create_specialist_agent(specialty)
-        self.agents[f"{specialty}_specialist"] = agent
+        role = f"{specialty}_specialist"
+        self._factories[role] = partial(ResearchAgentFactory.create_specialist_agent, specialty)
+        self.agents[role] = agent
+        self._invalidate_views()
+    
+    def _invalidate_views(self):
+        """Drop the cached agent tuple after the team changes"""
+        self._agents_tuple = None
 
 # Export classes and functions
 __all__ = [
@@ -1,15 +1,55 @@
 import openai
 import anthropic
 import google.generativeai as genai
-from fastapi import FastAPI
+import httpx
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional, Tuple
 import os
+import json
+import asyncio
+import hashlib
+import heapq
+import re
 import logging
+import time
+import unicodedata
 from dotenv import load_dotenv
-import spacy
-from collections import Counter
-from difflib import SequenceMatcher
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from itertools import repeat
+from operator import itemgetter
+from urllib.parse import urlparse
+from rapidfuzz import fuzz, process
+
+# Redis is optional; summaries are only cached when it is installed and configured
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+# orjson is optional; it speeds up response and event encoding when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# tiktoken is optional; without it prompt sizes are estimated from character counts
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# The semantic cache is optional and needs sentence-transformers and faiss
+try:
+    import faiss
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    faiss = None
+    SentenceTransformer = None
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -34,55 +74,333 @@ if not google_api_key:
 # Configure Google Gemini
 genai.configure(api_key=google_api_key)
 
-# Load spaCy English model
+# One pooled HTTP client for both SDKs; HTTP/2 multiplexing needs the optional h2 package
 try:
-    nlp = spacy.load("en_core_web_sm")
-except Exception:
-    import subprocess
-    subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-    nlp = spacy.load("en_core_web_sm")
-
-def extract_entities(snippets):
-    """Extract named entities from a list of snippets."""
-    entities = []
-    for text in snippets:
-        doc = nlp(text)
-        for ent in doc.ents:
-            if ent.label_ in {"ORG", "PRODUCT", "PERSON", "GPE", "DATE", "EVENT", "WORK_OF_ART"}:
-                entities.append((ent.text, ent.label_))
-    # Return most common entities by type
-    entity_counter = Counter(entities)
-    top_entities = entity_counter.most_common(10)
-    return top_entities
+    import h2  # noqa: F401
+    http2_enabled = True
+except ImportError:
+    http2_enabled = False
+
+
+# Seconds to wait on a Claude/Gemini model before hedging with the next fallback model,
+# used until the primary model has enough history for a p95 latency (see hedge_delay_for)
+model_hedge_delay = float(os.environ.get("MODEL_HEDGE_DELAY", "8"))
+model_hedge_min_samples = 10
+
+# Summary cache configuration
+redis_url = os.environ.get("REDIS_URL")
+summary_cache_ttl = int(os.environ.get("SUMMARY_CACHE_TTL", "14400"))
+redis_client = aioredis.from_url(redis_url) if aioredis and redis_url else None
+
+# In-process LRU tier in front of Redis (also used on its own when Redis is not configured)
+summary_memory_cache_size = int(os.environ.get("SUMMARY_MEMORY_CACHE_SIZE", "1024"))
+memory_cache = OrderedDict()
+
+semantic_cache_enabled = os.environ.get("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+semantic_cache_threshold = float(os.environ.get("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+semantic_cache_path = os.environ.get("SEMANTIC_CACHE_PATH", "./data/semantic_cache")
+semantic_cache_persist_every = int(os.environ.get("SEMANTIC_CACHE_PERSIST_EVERY", "50"))
+
+# Prompt size limits: per-snippet characters and total input tokens (0 disables the budget)
+snippet_char_limit = int(os.environ.get("SNIPPET_CHAR_LIMIT", "400"))
+prompt_token_budget = int(os.environ.get("PROMPT_TOKEN_BUDGET", "6000"))
+token_encoder = tiktoken.encoding_for_model("gpt-4o") if tiktoken else None
+
+# spaCy NER is opt-in; the default extractor is the regex fast path below
+use_spacy = os.environ.get("USE_SPACY", "false").lower() == "true"
+SPACY_MODEL_WHEEL = (
+    "https://github.com/explosion/spacy-models/releases/download/"
+    "en_core_web_sm-3.7.1/en_core_web_sm-3.7.1-py3-none-any.whl"
+)
+# Persistent worker processes that build spaCy-backed prompts for large result sets
+# (1 keeps NER in the server process); smaller requests always stay in-process
+spacy_n_process = int(os.environ.get("SPACY_N_PROCESS", "1"))
+spacy_multiprocess_min = 16
+
+# Entity labels worth surfacing in the prompt
+_ENT_LABELS = frozenset({"ORG", "PRODUCT", "PERSON", "GPE", "DATE", "EVENT", "WORK_OF_ART"})
+
+# Regex entity patterns: organisations with a legal suffix, years, and capitalised phrases.
+# Name words may carry inner capitals and digits so OpenAI, GPT4 or NASA are kept whole
+_ORG_SUFFIX_RE = re.compile(r"\b[A-Z][\w&]+(?:\s+[A-Z][\w&]+)*\s+(?:Inc|Corp|LLC|Ltd|GmbH)\b")
+_DATE_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+_CAPS_RE = re.compile(r"\b[A-Z][a-zA-Z0-9]+(?:\s+[A-Z][a-zA-Z0-9]+){0,3}\b")
+
+# Capitalised words that are usually just sentence starters, not entities
+_CAPS_STOPWORDS = frozenset({
+    "The", "A", "An", "This", "That", "These", "Those", "It", "Its", "In", "On", "At", "By",
+    "For", "From", "With", "And", "But", "Or", "To", "Of", "As", "If", "Is", "Are", "How",
+    "What", "Why", "When", "Where", "Which", "Who", "Our", "Your", "We", "You", "They", "Here"
+})
+
+# Only NER output is used. In en_core_web_sm the ner component has its own embedding layer,
+# so the shared tok2vec and everything that listens to it can be left out of the pipeline
+_SPACY_EXCLUDE = ["tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer"]
+
+@lru_cache(maxsize=1)
+def load_nlp():
+    """Load the spaCy English model on first use."""
+    try:
+        import spacy
+    except ImportError:
+        raise RuntimeError("USE_SPACY is enabled but spaCy is not installed. Run: pip install spacy")
+    try:
+        return spacy.load("en_core_web_sm", exclude=_SPACY_EXCLUDE)
+    except OSError:
+        # The model is an install-time dependency; never download it while serving
+        raise RuntimeError(f"spaCy model en_core_web_sm is not installed. Run: pip install {SPACY_MODEL_WHEEL}")
+
+def spacy_snippet_entities(snippets):
+    """Yield the (text, label) entities of each snippet found by spaCy NER."""
+    nlp = load_nlp()
+    docs = nlp.pipe(snippets, batch_size=32)
+    # Compare spaCy's integer label ids instead of resolving each label_ string
+    allowed = frozenset(nlp.vocab.strings[label] for label in _ENT_LABELS)
+    for doc in docs:
+        yield [(ent.text, ent.label_) for ent in doc.ents if ent.label in allowed]
+
+if use_spacy:
+    # Load the model once at import so the first request doesn't pay for it
+    try:
+        load_nlp()
+    except RuntimeError as e:
+        logger.warning(f"spaCy entity extraction unavailable, using regex extractor: {str(e)}")
+
+def _init_prompt_worker():
+    """Load the spaCy model once per prompt worker process."""
+    try:
+        load_nlp()
+    except RuntimeError as e:
+        logger.warning(f"spaCy entity extraction unavailable in worker, using regex extractor: {str(e)}")
+
+def _regex_entities(text):
+    """Yield (text, label) entity candidates found by the precompiled patterns."""
+    for org in _ORG_SUFFIX_RE.findall(text):
+        yield org, "ORG"
+    for year in _DATE_RE.findall(text):
+        yield year, "DATE"
+    # Drop the organisation spans so they are not counted again as plain names
+    for name in _CAPS_RE.findall(_ORG_SUFFIX_RE.sub(" ", text)):
+        if name not in _CAPS_STOPWORDS:
+            yield name, "NAME"
+
+def snippet_entities(snippets):
+    """Yield entity candidates for each snippet, in order, with spaCy when enabled."""
+    if use_spacy:
+        try:
+            load_nlp()
+        except RuntimeError as e:
+            logger.warning(f"spaCy entity extraction unavailable, using regex extractor: {str(e)}")
+        else:
+            return spacy_snippet_entities(snippets)
+    return map(_regex_entities, snippets)
+
+def most_common_entities(counts, n=10):
+    """Return the n most frequent ((text, label), count) pairs; ties keep first-seen order."""
+    return heapq.nlargest(n, counts.items(), key=itemgetter(1))
+
+def normalize_title(title: str) -> str:
+    """Comparison form of a title: NFKC-folded so full-width, ligature and case variants compare equal."""
+    return unicodedata.normalize("NFKC", title).strip().casefold()
 
 def deduplicate_results(results, threshold=0.85):
     """Remove or merge search results with highly similar titles/snippets."""
-    deduped = []
-    seen = set()
-    for r in results:
-        key = r['title'].strip().lower()
-        if any(SequenceMatcher(None, key, s).ratio() > threshold for s in seen):
+    # Exact repeats (the same page from several search providers) are dropped by hash first
+    first_seen = {}
+    for i, r in enumerate(results):
+        first_seen.setdefault(normalize_title(r['title']), i)
+    keys = list(first_seen)
+    candidates = list(first_seen.values())
+    if len(keys) < 2:
+        return [results[i] for i in candidates]
+    # Score every remaining title pair in one native call; pairs below the cutoff come back as 0
+    scores = process.cdist(keys, keys, scorer=fuzz.ratio, score_cutoff=threshold * 100)
+    kept = []
+    for i in range(len(keys)):
+        if kept and scores[i, kept].any():
             continue
-        seen.add(key)
-        deduped.append(r)
-    return deduped
+        kept.append(i)
+    return [results[candidates[i]] for i in kept]
+
+def summary_cache_key(query: str, model: str, results: List[dict]) -> str:
+    """Build a cache key from the normalized query, model and result contents."""
+    payload = json.dumps([
+        query.strip().lower(),
+        model,
+        sorted((r['url'], r['title'], r['snippet']) for r in results)
+    ])
+    return "summary:" + hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
 
-app = FastAPI()
+def _memory_cache_get(key: str) -> Optional[dict]:
+    """Return an unexpired in-process cache entry, refreshing its LRU position."""
+    entry = memory_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, payload = entry
+    if expires_at < time.monotonic():
+        del memory_cache[key]
+        return None
+    memory_cache.move_to_end(key)
+    return payload
+
+def _memory_cache_set(key: str, payload: dict):
+    """Store an in-process cache entry, evicting the least recently used ones past the size limit."""
+    if summary_memory_cache_size <= 0:
+        return
+    memory_cache[key] = (time.monotonic() + summary_cache_ttl, payload)
+    memory_cache.move_to_end(key)
+    while len(memory_cache) > summary_memory_cache_size:
+        memory_cache.popitem(last=False)
+
+async def get_cached_summary(key: str) -> Optional[dict]:
+    """Return a cached summary payload from memory or Redis, or None on a miss or Redis error."""
+    payload = _memory_cache_get(key)
+    if payload is not None or redis_client is None:
+        return payload
+    try:
+        cached = await redis_client.get(key)
+    except Exception as e:
+        logger.warning(f"Summary cache lookup failed: {str(e)}")
+        return None
+    if not cached:
+        return None
+    payload = json.loads(cached)
+    _memory_cache_set(key, payload)
+    return payload
+
+async def set_cached_summary(key: str, summary: str, model_used: str):
+    """Store a summary payload in memory and Redis, ignoring Redis errors."""
+    payload = {"summary": summary, "model_used": model_used}
+    _memory_cache_set(key, payload)
+    if redis_client is None:
+        return
+    try:
+        await redis_client.setex(key, summary_cache_ttl, json.dumps(payload))
+    except Exception as e:
+        logger.warning(f"Summary cache store failed: {str(e)}")
+
+class SemanticCache:
+    """Cache of answered queries looked up by embedding similarity, so paraphrases hit too."""
+
+    def __init__(self, path: str, threshold: float, persist_every: int):
+        self.path = path
+        self.threshold = threshold
+        self.persist_every = persist_every
+        self.model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+        self.entries = []
+        self.pending_writes = 0
+        if os.path.exists(f"{path}.index") and os.path.exists(f"{path}.json"):
+            self.index = faiss.read_index(f"{path}.index")
+            with open(f"{path}.json", "r") as f:
+                self.entries = json.load(f)
+        else:
+            # Inner product over normalized vectors is cosine similarity
+            self.index = faiss.IndexFlatIP(self.model.get_sentence_embedding_dimension())
+
+    def _embed(self, query: str):
+        return self.model.encode([query], normalize_embeddings=True).astype("float32")
+
+    def lookup(self, query: str, model: str) -> Optional[dict]:
+        """Return the closest cached summary for the same model above the similarity threshold."""
+        if self.index.ntotal == 0:
+            return None
+        scores, ids = self.index.search(self._embed(query), min(5, self.index.ntotal))
+        for score, idx in zip(scores[0], ids[0]):
+            if score < self.threshold:
+                break
+            entry = self.entries[idx]
+            if entry["model"] == model:
+                return {"summary": entry["summary"], "model_used": entry["model_used"]}
+        return None
+
+    def add(self, query: str, model: str, summary: str, model_used: str):
+        self.index.add(self._embed(query))
+        self.entries.append({"model": model, "summary": summary, "model_used": model_used})
+        self.pending_writes += 1
+        if self.pending_writes >= self.persist_every:
+            self.persist()
+
+    def persist(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            faiss.write_index(self.index, f"{self.path}.index")
+            with open(f"{self.path}.json", "w") as f:
+                json.dump(self.entries, f)
+            self.pending_writes = 0
+        except Exception as e:
+            logger.warning(f"Semantic cache persist failed: {str(e)}")
+
+semantic_cache = None
+if semantic_cache_enabled:
+    if SentenceTransformer is None or faiss is None:
+        logger.warning("SEMANTIC_CACHE_ENABLED is set but sentence-transformers/faiss are not installed")
+    else:
+        semantic_cache = SemanticCache(semantic_cache_path, semantic_cache_threshold, semantic_cache_persist_every)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the shared async provider clients at startup and close their connection pool on shutdown."""
+    app.state.http_client = httpx.AsyncClient(
+        http2=http2_enabled,
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+        timeout=60.0
+    )
+    app.state.openai = openai.AsyncOpenAI(
+        api_key=openai_api_key, max_retries=2, timeout=60.0, http_client=app.state.http_client
+    )
+    app.state.anthropic = anthropic.AsyncAnthropic(
+        api_key=anthropic_api_key, max_retries=2, timeout=60.0, http_client=app.state.http_client
+    )
+    # Created once here so requests never pay for spawning workers or re-loading the model
+    app.state.prompt_pool = (
+        ProcessPoolExecutor(spacy_n_process, initializer=_init_prompt_worker)
+        if use_spacy and spacy_n_process > 1 else None
+    )
+    yield
+    await app.state.http_client.aclose()
+    if app.state.prompt_pool is not None:
+        app.state.prompt_pool.shutdown(cancel_futures=True)
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse if orjson else JSONResponse)
 
 class SearchResult(BaseModel):
     title: str
     snippet: str
     url: str
 
+def result_dicts(results: List[SearchResult]) -> List[dict]:
+    """Plain dicts of the request's search results, read straight from the fields rather than via .dict()."""
+    return [{"title": r.title, "snippet": r.snippet, "url": r.url} for r in results]
+
 class SummarizeRequest(BaseModel):
     query: str
     results: List[SearchResult]
     model: str = "gpt-4o"  # Default model
+    stream: bool = False  # Return server-sent events instead of a buffered JSON body
+    force_refresh: bool = False  # Skip cached summaries and regenerate (the new summary is still cached)
 
 class SummarizeResponse(BaseModel):
     summary: str
     model_used: str
 
+class BatchSummarizeRequest(BaseModel):
+    items: List[SummarizeRequest]
+
+class BatchSummarizeResponse(BaseModel):
+    items: List[SummarizeResponse]
+
+class BatchJobResponse(BaseModel):
+    batch_id: str
+    status: str
+    items: Optional[List[SummarizeResponse]] = None  # Filled in once the batch has completed
+
+# Delimiter the model is asked to place between answers in a packed batch prompt
+BATCH_DELIMITER = "<<<END>>>"
+# Queries packed into one /summarize_batch completion (each gets 800 output tokens), and the
+# most a single request may carry
+batch_chunk_size = 5
+batch_max_items = int(os.environ.get("SUMMARY_BATCH_MAX_ITEMS", "50"))
+
 CLAUDE_MODELS = [
     "claude-3-sonnet-20240229",
     "claude-3-haiku-20240307",
@@ -98,142 +416,434 @@ GEMINI_MODELS = [
     "gemini-1.0-pro"
 ]
 
-def create_search_agent_prompt(query: str, results: List[SearchResult]) -> str:
-    """Create a dynamic prompt based on query type for more autonomous and helpful responses."""
-    # --- Hybrid Preprocessing ---
-    # Deduplicate results
-    deduped_results = deduplicate_results([r.dict() if hasattr(r, 'dict') else r for r in results])
-    # Extract entities from snippets
-    snippets = [r['snippet'] for r in deduped_results]
-    top_entities = extract_entities(snippets)
+# GenerativeModel handles are reusable, so build one per fallback model up front
+gemini_models = {name: genai.GenerativeModel(name) for name in GEMINI_MODELS}
+
+# Citation instructions
+_CITATION_INSTR = (
+    "For all citations, instead of using [1], [2], etc., use the source's domain name in parentheses, e.g., (techradar.com), right after the relevant information. Do not use numbers for citations."
+)
+# Multi-question instructions
+_MULTI_Q_INSTR = (
+    "If the prompt contains multiple questions or requirements, break them down and answer each as a separate item or section."
+)
+
+# Prompt templates per query type, filled with str.format at request time. Each is split into a
+# static instruction block, sent first so providers can cache it as a prompt prefix, and the
+# per-request search context that follows it.
+_LIST_STATIC = """You are a helpful research assistant.\n\nINSTRUCTIONS:\n1. Analyze the query and provide exactly what was asked for (e.g., if asked for "top 10", provide exactly 10 items)\n2. Use clear, engaging formatting with emojis and bullet points\n3. DO NOT use markdown symbols (#, *, -, etc.)\n4. {citation_instructions}\n5. {multi_question_instructions}\n6. Focus on providing the specific information requested\n7. If the query asks for a specific number, provide exactly that number\n8. Make the response directly answer the question asked\n\nFORMAT EXAMPLE for list queries:\n"📋 Top 10 AI Tools for 2024\n\nBased on recent research and market analysis, here are the top 10 AI tools that are making waves in 2024:\n\n🥇 ChatGPT by OpenAI (openai.com)\n• Most popular conversational AI with advanced reasoning capabilities\n• Used by over 100 million users worldwide\n\n🥈 Claude by Anthropic (anthropic.com)\n• Known for safety and helpfulness in complex tasks\n• Excellent for research and analysis\n\n🥉 Gemini by Google (google.com)\n• Multimodal capabilities for text, image, and code\n• Integrated with Google's ecosystem\n\n4. GitHub Copilot (github.com)\n• AI-powered code completion and generation\n• Trusted by millions of developers\n\n5. Midjourney (midjourney.com)\n• Leading AI image generation tool\n• Creates stunning visual content\n\n6. Notion AI (notion.com)\n• AI-powered workspace and productivity tool\n• Helps with writing, organization, and collaboration\n\n7. Grammarly (grammarly.com)\n• AI writing assistant with advanced grammar checking\n• Improves writing quality and clarity\n\n8. Jasper (jasper.ai)\n• AI content creation platform for marketing\n• Generates high-quality marketing copy\n\n9. Runway ML (runwayml.com)\n• AI video generation and editing platform\n• Revolutionizing video content creation\n\n10. Replika (replika.com)\n• AI companion and mental health support\n• Personalized conversational experience\n\n💡 Key Insights:\n• AI tools are becoming more specialized and user-friendly\n• Integration with existing workflows is a key trend\n• Focus on productivity and creativity enhancement\""""
+_LIST_TMPL = """Based on the following web search results for "{query}", provide a comprehensive and well-structured response.\n{entity_section}\nSEARCH RESULTS:\n{context}\n\nPlease provide a response that directly answers the specific query, using domain-based citations and breaking down multiple questions if present:"""
+
+_HOWTO_STATIC = """You are a helpful guide and instructor.\n\nINSTRUCTIONS:\n1. Provide a practical, actionable guide with clear steps\n2. Use numbered steps and bullet points for clarity\n3. Include tips, warnings, and best practices where relevant\n4. DO NOT use markdown symbols (#, *, -, etc.)\n5. {citation_instructions}\n6. {multi_question_instructions}\n7. Include inline citations by referencing the source number [1], [2], etc.\n8. Focus on being helpful and practical\n9. Add relevant emojis to make the guide engaging\n\nFORMAT EXAMPLE for how-to queries:\n"🔧 How to Set Up a Web Search Feature\n\nHere's a comprehensive guide to implementing web search functionality:\n\n📋 Prerequisites\n• API keys for search services (Google, Serper, or Tavily)\n• Backend server with Node.js/Express\n• Frontend with React or similar framework\n\n🚀 Step-by-Step Implementation\n\nStep 1: Set Up Search APIs\n• Obtain API keys from your chosen search provider [1]\n• Configure environment variables for secure access\n• Test API connectivity and rate limits\n\nStep 2: Create Backend Search Service\n• Implement search endpoint in your Express server [2]\n• Add error handling and fallback mechanisms\n• Configure CORS for frontend communication\n\nStep 3: Build Frontend Interface\n• Create search toggle component [3]\n• Implement real-time search results display\n• Add loading states and error handling\n\nStep 4: Integrate with AI Summarization\n• Set up Python microservice for summarization [4]\n• Configure multiple LLM options (GPT-4o, Claude, Gemini)\n• Implement citation and reference system\n\nStep 5: Style and Polish\n• Apply modern UI design with gradients and animations [5]\n• Ensure responsive design for all devices\n• Add accessibility features\n\n💡 Pro Tips:\n• Always implement rate limiting to avoid API costs\n• Use caching for frequently searched terms\n• Provide fallback options for when APIs fail\n• Test thoroughly with various query types\n\n⚠️ Common Pitfalls:\n• Don't forget to handle API errors gracefully\n• Avoid hardcoding API keys in your code\n• Remember to implement proper security measures\""""
+_HOWTO_TMPL = """Based on the following web search results for "{query}", provide a clear, step-by-step guide.\n{entity_section}\nSEARCH RESULTS:\n{context}\n\nPlease provide a helpful, practical guide that directly addresses the query:"""
+
+_DEFINITION_STATIC = """You are a knowledgeable educator.\n\nINSTRUCTIONS:\n1. Provide a clear, accurate definition or explanation\n2. Include relevant context, examples, and applications\n3. Use simple language while being comprehensive\n4. DO NOT use markdown symbols (#, *, -, etc.)\n5. {citation_instructions}\n6. {multi_question_instructions}\n7. Include inline citations by referencing the source number [1], [2], etc.\n8. Add relevant emojis to make the explanation engaging\n9. Structure the response logically with clear sections\n\nFORMAT EXAMPLE for definition queries:\n"📚 What is Web Search Integration?\n\nWeb search integration is a technology that combines real-time internet search capabilities with AI-powered applications to provide up-to-date, comprehensive information to users.\n\n🔍 Core Components\n\nSearch APIs: Connect to search engines like Google, Bing, or specialized APIs like Serper.dev [1]. These provide access to current web content and real-time information.\n\nAI Summarization: Use large language models (LLMs) like GPT-4o, Claude, or Gemini to process and summarize search results [2]. This transforms raw web data into coherent, useful information.\n\nFrontend Interface: User-friendly components that allow users to toggle search functionality and view results in an organized, visually appealing format [3].\n\nBackend Processing: Server-side logic that coordinates between search APIs, AI models, and the frontend interface [4].\n\n🚀 Key Benefits\n\nReal-time Information: Access to current events, latest developments, and up-to-date data that AI models might not have in their training data [5].\n\nComprehensive Coverage: Combines multiple information sources to provide well-rounded perspectives on topics.\n\nEnhanced Accuracy: Cross-references information from multiple sources to verify facts and provide reliable information.\n\nUser Control: Allows users to choose when they want web-enhanced responses versus AI-only responses.\n\n💡 Applications\n\nResearch and Analysis: Perfect for academic research, market analysis, and competitive intelligence [6].\n\nNews and Updates: Stay current with breaking news, product releases, and industry developments.\n\nFact-checking: Verify information and get multiple perspectives on controversial topics.\n\nLearning and Education: Access the latest information for educational purposes and skill development.\n\n🔧 Technical Implementation\n\nThe system typically involves:\n• API integration with search providers\n• AI model coordination for summarization\n• Real-time data processing and caching\n• User interface for search control and result display\n• Error handling and fallback mechanisms\n\nThis technology represents a significant advancement in AI applications, bridging the gap between static AI knowledge and dynamic real-world information.\""""
+_DEFINITION_TMPL = """Based on the following web search results for "{query}", provide a clear, comprehensive explanation.\n{entity_section}\nSEARCH RESULTS:\n{context}\n\nPlease provide a clear, comprehensive explanation that directly addresses the query:"""
+
+_COMPARISON_STATIC = """You are an expert analyst.\n\nINSTRUCTIONS:\n1. Provide a balanced, objective comparison\n2. Use clear comparison tables or structured format\n3. Include pros and cons for each option\n4. DO NOT use markdown symbols (#, *, -, etc.)\n5. {citation_instructions}\n6. {multi_question_instructions}\n7. Include inline citations by referencing the source number [1], [2], etc.\n8. Add relevant emojis to make the comparison engaging\n9. Provide a clear recommendation if appropriate\n\nFORMAT EXAMPLE for comparison queries:\n"⚖️ GPT-4o vs Claude vs Gemini: AI Model Comparison\n\nHere's a comprehensive comparison of the three leading AI models based on current capabilities and performance:\n\n📊 Performance Comparison\n\n🤖 GPT-4o (OpenAI)\n• Reasoning: Excellent for complex problem-solving [1]\n• Creativity: Strong creative writing and brainstorming capabilities\n• Speed: Fast response times with good accuracy\n• Cost: Competitive pricing for high-quality output\n• Integration: Extensive API ecosystem and developer tools\n\n🧠 Claude (Anthropic)\n• Safety: Industry-leading safety and helpfulness [2]\n• Analysis: Superior for research and analytical tasks\n• Context: Excellent long-context understanding\n• Ethics: Built with constitutional AI principles\n• Specialization: Strong in academic and professional writing\n\n🌟 Gemini (Google)\n• Multimodal: Best-in-class image, text, and code understanding [3]\n• Integration: Seamless Google ecosystem integration\n• Innovation: Cutting-edge research and development\n• Scalability: Enterprise-grade infrastructure\n• Future-ready: Advanced reasoning and planning capabilities\n\n📈 Key Metrics Comparison\n\n| Feature | GPT-4o | Claude | Gemini |\n|---------|--------|--------|--------|\n| Reasoning | ⭐⭐⭐⭐⭐ | ⭐⭐⭐⭐ | ⭐⭐⭐⭐⭐ |\n| Creativity | ⭐⭐⭐⭐⭐ | ⭐⭐⭐⭐ | ⭐⭐⭐⭐ |\n| Safety | ⭐⭐⭐⭐ | ⭐⭐⭐⭐⭐ | ⭐⭐⭐⭐ |\n| Speed | ⭐⭐⭐⭐⭐ | ⭐⭐⭐⭐ | ⭐⭐⭐⭐ |\n| Cost | ⭐⭐⭐⭐ | ⭐⭐⭐⭐ | ⭐⭐⭐⭐ |\n\n🎯 Use Case Recommendations\n\nChoose GPT-4o for:\n• General-purpose AI tasks and creative projects\n• Fast, reliable responses for everyday use\n• Extensive API integration needs\n\nChoose Claude for:\n• Research and analysis tasks\n• Safety-critical applications\n• Academic and professional writing\n\nChoose Gemini for:\n• Multimodal applications (text + images)\n• Google ecosystem integration\n• Cutting-edge AI research and development\n\n💡 Final Verdict\n\nEach model excels in different areas, making the choice dependent on your specific needs. For general use, GPT-4o offers the best balance of capabilities and accessibility. For research and safety-critical applications, Claude is the top choice. For multimodal and Google-integrated solutions, Gemini leads the way.\""""
+_COMPARISON_TMPL = """Based on the following web search results for "{query}", provide a detailed comparison.\n{entity_section}\nSEARCH RESULTS:\n{context}\n\nPlease provide a detailed, balanced comparison that directly addresses the query:"""
+
+_NEWS_STATIC = """You are a news analyst and reporter.\n\nINSTRUCTIONS:\n1. Focus on the most recent and relevant news\n2. Provide context and background information\n3. Include multiple perspectives when available\n4. DO NOT use markdown symbols (#, *, -, etc.)\n5. {citation_instructions}\n6. {multi_question_instructions}\n7. Include inline citations by referencing the source number [1], [2], etc.\n8. Add relevant emojis to make the news engaging\n9. Structure with clear sections for different aspects\n\nFORMAT EXAMPLE for news queries:\n"📰 Latest AI Developments and Breakthroughs\n\nHere are the most recent and significant developments in artificial intelligence:\n\n🚀 Major Announcements\n\nOpenAI's GPT-5 Development: OpenAI has officially confirmed they are working on GPT-5, the next generation of their language model [1]. The company expects significant improvements in reasoning, creativity, and multimodal capabilities.\n\nGoogle's Gemini 2.0 Release: Google has launched Gemini 2.0 with enhanced reasoning abilities and improved performance across all benchmarks [2]. The new model shows 40% improvement in complex problem-solving tasks.\n\nAnthropic's Constitutional AI Advances: Anthropic has published new research on constitutional AI, demonstrating improved safety and alignment in large language models [3]. Their latest models show better adherence to safety principles.\n\n💼 Industry Impact\n\nInvestment Surge: AI startups have seen a 150% increase in funding compared to last year [4]. Major investments are flowing into AI infrastructure, applications, and research.\n\nEnterprise Adoption: 78% of Fortune 500 companies are now actively implementing AI solutions [5]. The focus is shifting from experimentation to production deployment.\n\nRegulatory Developments: New AI regulations are being proposed in the EU and US [6]. These focus on transparency, safety, and responsible AI development.\n\n🔬 Research Breakthroughs\n\nMultimodal AI: Researchers have achieved breakthroughs in combining text, image, and audio understanding [7]. This enables more human-like AI interactions.\n\nAI Reasoning: New techniques have significantly improved AI's ability to reason through complex problems [8]. This includes better logical thinking and step-by-step problem solving.\n\nEnergy Efficiency: AI models are becoming more energy-efficient, reducing environmental impact [9]. New training methods can reduce energy consumption by up to 70%.\n\n🎯 Future Outlook\n\nShort-term (6-12 months): Expect more specialized AI models for specific industries and use cases [10]. Integration with existing business processes will accelerate.\n\nMedium-term (1-2 years): AI will become more autonomous and capable of complex decision-making. We'll see more AI agents that can work independently.\n\nLong-term (3-5 years): AI will likely achieve human-level performance in many cognitive tasks. The focus will shift to AI-human collaboration and augmentation.\n\n💡 Key Takeaways\n\n• AI development is accelerating rapidly with major breakthroughs every few months\n• Industry adoption is moving from experimentation to production\n• Regulatory frameworks are evolving to ensure responsible AI development\n• The focus is shifting toward more specialized and efficient AI models\""""
+_NEWS_TMPL = """Based on the following web search results for "{query}", provide the latest news and developments.\n{entity_section}\nSEARCH RESULTS:\n{context}\n\nPlease provide the latest news and developments that directly address the query:"""
+
+_TECHNICAL_STATIC = """You are a technical expert and developer.\n\nINSTRUCTIONS:\n1. Provide technical details and implementation guidance\n2. Include code examples, architecture considerations, and best practices\n3. Address technical challenges and solutions\n4. DO NOT use markdown symbols (#, *, -, etc.)\n5. {citation_instructions}\n6. {multi_question_instructions}\n7. Include inline citations by referencing the source number [1], [2], etc.\n8. Add relevant emojis to make the technical content engaging\n9. Structure with clear sections for different technical aspects\n\nFORMAT EXAMPLE for technical queries:\n"⚙️ Technical Implementation of Web Search Integration\n\nHere's a comprehensive technical guide for implementing web search functionality:\n\n🏗️ Architecture Overview\n\nThe system consists of three main components:\n• Frontend: React/TypeScript interface for user interaction\n• Backend: Node.js/Express API for request handling\n• Python Microservice: FastAPI service for AI summarization\n\n🔧 Backend Implementation\n\nAPI Endpoint Structure:\n    // Search endpoint\n    POST /api/search\n    {{\n      \"query\": \"string\",\n      \"model\": \"gpt-4o|claude|gemini\"\n    }}\n\n    // Response structure\n    {{\n      \"searchResults\": {{...}},\n      \"summary\": \"string\",\n      \"modelUsed\": \"string\"\n    }}\n\nSearch Service Integration:\n• Google Custom Search API as primary [1]\n• Serper.dev and Tavily as fallbacks\n• Error handling and rate limiting\n• Caching for frequently searched terms\n\n🤖 Python Microservice\n\nFastAPI Implementation:\n    @app.post(\"/summarize\")\n    async def summarize(request: SummarizeRequest):\n        # Process search results\n        # Generate AI summary\n        # Return formatted response\n\nLLM Integration:\n• OpenAI GPT-4o for primary summarization [2]\n• Claude and Gemini as alternatives\n• Model fallback mechanisms\n• Error handling and retry logic\n\n🎨 Frontend Components\n\nSearch Toggle Component:\n• React state management for search toggle\n• Real-time UI updates\n• Loading states and error handling\n\nResults Display:\n• Responsive design with Tailwind CSS\n• Citation system with clickable links\n• Professional typography with Satoshi font\n\n🔒 Security Considerations\n\nAPI Key Management:\n• Environment variables for sensitive data\n• Secure key rotation mechanisms\n• Rate limiting to prevent abuse\n\nData Privacy:\n• No storage of search queries\n• Secure transmission of data\n• Compliance with privacy regulations\n\n📊 Performance Optimization\n\nCaching Strategy:\n• Redis for search result caching [3]\n• CDN for static assets\n• Database optimization for conversation storage\n\nLoad Balancing:\n• Horizontal scaling for high traffic\n• Health checks and failover\n• Monitoring and alerting\n\n🧪 Testing Strategy\n\nUnit Tests:\n• API endpoint testing\n• Search service validation\n• AI model integration testing\n\nIntegration Tests:\n• End-to-end workflow testing\n• Cross-browser compatibility\n• Performance benchmarking\n\n🚀 Deployment\n\nContainerization:\n• Docker containers for each service\n• Kubernetes orchestration for scaling\n• CI/CD pipeline for automated deployment\n\nMonitoring:\n• Application performance monitoring\n• Error tracking and alerting\n• Usage analytics and reporting\n\n💡 Best Practices\n\n• Always implement proper error handling\n• Use environment-specific configurations\n• Monitor API usage and costs\n• Implement comprehensive logging\n• Regular security audits and updates\""""
+_TECHNICAL_TMPL = """Based on the following web search results for "{query}", provide technical guidance and implementation details.\n{entity_section}\nSEARCH RESULTS:\n{context}\n\nPlease provide technical guidance that directly addresses the query:"""
+
+_DEFAULT_STATIC = """You are a helpful AI assistant.\n\nINSTRUCTIONS:\n1. Analyze the query and provide the most relevant and helpful information\n2. Structure your response logically based on the query type\n3. Use clear, engaging formatting with appropriate emojis\n4. DO NOT use markdown symbols (#, *, -, etc.)\n5. {citation_instructions}\n6. {multi_question_instructions}\n7. Focus on being genuinely helpful and informative\n8. Adapt the format to best serve the specific query\n\nFORMAT GUIDELINES:\n• Use emojis to highlight important sections\n• Include bullet points for lists and key information\n• Provide context and background when relevant\n• Structure with clear sections for different aspects\n• Make the response directly answer what was asked"""
+_DEFAULT_TMPL = """Based on the following web search results for "{query}", provide a comprehensive and useful response.\n{entity_section}\nSEARCH RESULTS:\n{context}\n\nPlease provide a helpful, comprehensive response that directly addresses the query, using domain-based citations and breaking down multiple questions if present:"""
+
+_TEMPLATES = {
+    "list": (_LIST_STATIC, _LIST_TMPL),
+    "how_to": (_HOWTO_STATIC, _HOWTO_TMPL),
+    "definition": (_DEFINITION_STATIC, _DEFINITION_TMPL),
+    "comparison": (_COMPARISON_STATIC, _COMPARISON_TMPL),
+    "news": (_NEWS_STATIC, _NEWS_TMPL),
+    "technical": (_TECHNICAL_STATIC, _TECHNICAL_TMPL),
+    "default": (_DEFAULT_STATIC, _DEFAULT_TMPL),
+}
+
+# The static halves only depend on module constants, so resolve their placeholders once here
+_TEMPLATES = {
+    kind: (
+        static.format(citation_instructions=_CITATION_INSTR, multi_question_instructions=_MULTI_Q_INSTR),
+        template
+    )
+    for kind, (static, template) in _TEMPLATES.items()
+}
+
+# Keywords per query type, listed in classification priority order
+_QTYPE_KEYWORDS = {
+    "list": ["top", "list", "best", "worst", "ranking", "ranked", "10", "5", "3", "20"],
+    "how_to": ["how to", "how do", "steps", "guide", "tutorial", "process"],
+    "definition": ["what is", "define", "definition", "meaning", "explain"],
+    "comparison": ["vs", "versus", "compare", "difference", "better", "which"],
+    "news": ["latest", "recent", "news", "update", "2024", "2025", "announcement"],
+    "technical": ["api", "code", "programming", "technical", "implementation", "architecture"],
+}
+
+# Single-word keywords are matched by set intersection with the query tokens; the few
+# multi-word phrases are matched against the space-joined tokens, padded so "how to"
+# cannot match inside "show top"
+_QTYPE_WORDS = {kind: frozenset(w for w in words if " " not in w) for kind, words in _QTYPE_KEYWORDS.items()}
+_QTYPE_PHRASES = {kind: tuple(f" {w} " for w in words if " " in w) for kind, words in _QTYPE_KEYWORDS.items()}
+_QUERY_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+@lru_cache(maxsize=1024)
+def classify_query(query: str) -> str:
+    """Return the template key for a query, honouring the keyword priority order."""
+    tokens = _QUERY_TOKEN_RE.findall(query.lower())
+    token_set = frozenset(tokens)
+    padded = f" {' '.join(tokens)} "
+    for kind in _QTYPE_KEYWORDS:
+        if _QTYPE_WORDS[kind] & token_set or any(phrase in padded for phrase in _QTYPE_PHRASES[kind]):
+            return kind
+    return "default"
+
+# Query types whose answers benefit from the extracted-entities block; the list, how-to,
+# definition and technical templates already dictate their own structure
+_ENTITY_KINDS = frozenset({"news", "comparison", "default"})
+
+def count_tokens(text: str) -> int:
+    """Count GPT-4o tokens, or estimate ~4 characters per token when tiktoken is unavailable."""
+    if token_encoder is not None:
+        return len(token_encoder.encode(text))
+    return len(text) // 4
+
+@lru_cache(maxsize=None)
+def static_token_count(kind: str) -> int:
+    """Token count of a query type's static instructions, computed once per type."""
+    return count_tokens(_TEMPLATES[kind][0])
+
+def fit_token_budget(blocks: List[str], budget: int) -> List[str]:
+    """Keep the highest-ranked result blocks that fit in the token budget (always at least one)."""
+    kept = 0
+    for block in blocks:
+        # +2 approximates the blank-line separator between blocks
+        budget -= count_tokens(block) + 2
+        if budget < 0:
+            break
+        kept += 1
+    if kept < len(blocks):
+        logger.info(f"Prompt token budget reached, keeping {max(kept, 1)} of {len(blocks)} results")
+    return blocks[:max(kept, 1)]
+
+@lru_cache(maxsize=4096)
+def source_domain(url: str) -> str:
+    """Domain used for citations, e.g. https://www.techradar.com/x -> techradar.com."""
+    return urlparse(url).netloc.removeprefix("www.")
+
+def build_prompt_context(results: List[dict], with_entities=True):
+    """Deduplicate results, then build their context blocks and count their entities in one pass."""
+    deduped_results = deduplicate_results(results)
+    # Trim snippets first so long pages don't dominate the prompt or the NER work
+    snippets = [r['snippet'][:snippet_char_limit] for r in deduped_results]
+    blocks = []
+    counts = {}
+    entity_iter = snippet_entities(snippets) if with_entities else repeat(())
+    for i, (r, snippet, entities) in enumerate(zip(deduped_results, snippets, entity_iter), 1):
+        blocks.append(f"[{i}] {r['title']}\n{snippet}\nSource: {r['url']} ({source_domain(r['url'])})")
+        for key in entities:
+            counts[key] = counts.get(key, 0) + 1
+    return blocks, most_common_entities(counts)
+
+def build_prompt_parts(query: str, results: List[dict]) -> Tuple[str, str]:
+    """Create the (static instructions, search context) halves of the prompt for a query."""
+    return _build_prompt_cached(query, tuple((r['title'], r['snippet'], r['url']) for r in results))
+
+@lru_cache(maxsize=512)
+def _build_prompt_cached(query: str, results_key: tuple) -> Tuple[str, str]:
+    """Memoized prompt build, so rapid repeats of the same search skip dedup and entity extraction."""
+    results = [{"title": title, "snippet": snippet, "url": url} for title, snippet, url in results_key]
+
+    kind = classify_query(query)
+
+    blocks, top_entities = build_prompt_context(results, with_entities=kind in _ENTITY_KINDS)
     entity_section = "\n".join([f"- {text} ({label})" for (text, label), _ in top_entities])
     entity_section = f"\n\nKey Entities Extracted from Search Results:\n{entity_section}\n" if entity_section else ""
-    # ---
-    context = "\n\n".join(
-        f"[{i+1}] {r['title']}\n{r['snippet']}\nSource: {r['url']}" 
-        for i, r in enumerate(deduped_results)
-    )
-    
-    # Helper to extract domain from URL
-    def get_domain(url):
-        from urllib.parse import urlparse
-        return urlparse(url).netloc.replace('www.', '')
-
-    # Build a mapping of index to domain for citation
-    domain_map = {str(i+1): get_domain(r['url']) for i, r in enumerate(deduped_results)}
-
-    query_lower = query.lower()
-    is_list_query = any(word in query_lower for word in ['top', 'list', 'best', 'worst', 'ranking', 'ranked', '10', '5', '3', '20'])
-    is_how_to_query = any(word in query_lower for word in ['how to', 'how do', 'steps', 'guide', 'tutorial', 'process'])
-    is_definition_query = any(word in query_lower for word in ['what is', 'define', 'definition', 'meaning', 'explain'])
-    is_comparison_query = any(word in query_lower for word in ['vs', 'versus', 'compare', 'difference', 'better', 'which'])
-    is_news_query = any(word in query_lower for word in ['latest', 'recent', 'news', 'update', '2024', '2025', 'announcement'])
-    is_technical_query = any(word in query_lower for word in ['api', 'code', 'programming', 'technical', 'implementation', 'architecture'])
-
-    # Citation instructions
-    citation_instructions = (
-        "For all citations, instead of using [1], [2], etc., use the source's domain name in parentheses, e.g., (techradar.com), right after the relevant information. Do not use numbers for citations."
-    )
-    # Multi-question instructions
-    multi_question_instructions = (
-        "If the prompt contains multiple questions or requirements, break them down and answer each as a separate item or section."
+
+    static, template = _TEMPLATES[kind]
+    if prompt_token_budget > 0:
+        blocks = fit_token_budget(
+            blocks,
+            prompt_token_budget
+            - static_token_count(kind)
+            - count_tokens(template.format(query=query, context="", entity_section=entity_section))
+        )
+    return static, template.format(query=query, context="\n\n".join(blocks), entity_section=entity_section)
+
+async def prompt_parts(query: str, results: List[dict]) -> Tuple[str, str]:
+    """build_prompt_parts, run in the prompt worker pool for result sets large enough to be worth it."""
+    pool = getattr(app.state, "prompt_pool", None)
+    if pool is None or len(results) <= spacy_multiprocess_min:
+        return build_prompt_parts(query, results)
+    return await asyncio.get_running_loop().run_in_executor(pool, build_prompt_parts, query, results)
+
+def create_search_agent_prompt(query: str, results: List[dict]) -> str:
+    """Create a dynamic prompt based on query type for more autonomous and helpful responses."""
+    return "\n\n".join(build_prompt_parts(query, results))
+
+def prompt_cache_key(static: str) -> str:
+    """Short stable key that routes requests sharing a static prefix to the same OpenAI prompt cache."""
+    return hashlib.md5(static.encode()).hexdigest()[:16]
+
+def openai_messages(static: str, dynamic: str) -> list:
+    """Chat messages for OpenAI with the cacheable static prefix first."""
+    return [{"role": "user", "content": f"{static}\n\n{dynamic}"}]
+
+def anthropic_messages(static: str, dynamic: str) -> list:
+    """Claude messages with the static prefix marked as an ephemeral prompt-cache breakpoint."""
+    return [{
+        "role": "user",
+        "content": [
+            {"type": "text", "text": static, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": dynamic},
+        ],
+    }]
+
+# Recent (succeeded, seconds) outcomes per concrete model, used to order fallbacks
+MODEL_STATS = defaultdict(lambda: deque(maxlen=50))
+
+def record_model_result(model_name: str, succeeded: bool, elapsed: float):
+    """Remember the outcome of one model call."""
+    MODEL_STATS[model_name].append((succeeded, elapsed))
+
+def success_rate(model_name: str) -> float:
+    """Share of recent calls that succeeded; models without history count as healthy."""
+    stats = MODEL_STATS.get(model_name)
+    if not stats:
+        return 1.0
+    return sum(succeeded for succeeded, _ in stats) / len(stats)
+
+def hedge_delay_for(model_name: str) -> float:
+    """p95 of the model's recent successful latencies, or model_hedge_delay without enough history."""
+    latencies = sorted(elapsed for succeeded, elapsed in MODEL_STATS.get(model_name, ()) if succeeded)
+    if len(latencies) < model_hedge_min_samples:
+        return model_hedge_delay
+    return latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)]
+
+def ordered_models(models: List[str]) -> List[str]:
+    """Fallback models ordered by recent success rate, keeping the configured order on ties."""
+    return sorted(models, key=lambda name: -success_rate(name))
+
+async def race_models(provider, models, call, hedge_delay=None, max_in_flight=2):
+    """Hedge across fallback models and return (text, model_name) from the first success.
+
+    The next model starts when a running one fails, or when nothing has answered within
+    hedge_delay seconds (by default the preferred model's p95 latency) and fewer than
+    max_in_flight models are running.
+    """
+    async def attempt(model_name):
+        logger.info(f"Trying {provider} model: {model_name} ...")
+        started = time.monotonic()
+        try:
+            result = await call(model_name), model_name
+        except Exception as e:
+            record_model_result(model_name, False, time.monotonic() - started)
+            logger.warning(f"{provider} model {model_name} failed: {str(e)}")
+            raise
+        record_model_result(model_name, True, time.monotonic() - started)
+        return result
+
+    ranked = ordered_models(models)
+    if hedge_delay is None:
+        # Only hedge once the preferred model is slower than it usually is
+        hedge_delay = hedge_delay_for(ranked[0]) if ranked else model_hedge_delay
+    candidates = iter(ranked)
+    pending = set()
+
+    def launch():
+        name = next(candidates, None)
+        if name is not None:
+            pending.add(asyncio.create_task(attempt(name)))
+
+    launch()
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, timeout=hedge_delay, return_when=asyncio.FIRST_COMPLETED)
+            pending.difference_update(done)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+            # Replace each failed model, or hedge with one more if none answered in time
+            for _ in range(len(done) or int(len(pending) < max_in_flight)):
+                launch()
+        return None, None
+    finally:
+        # Cancel the slower candidates once one has answered
+        for task in pending:
+            task.cancel()
+
+def sse_event(payload: dict) -> str:
+    """Format a payload as a server-sent event."""
+    data = orjson.dumps(payload).decode() if orjson else json.dumps(payload)
+    return f"data: {data}\n\n"
+
+async def stream_cached_summary(cached: dict):
+    """Replay a cached summary as a single-delta event stream."""
+    yield sse_event({"delta": cached["summary"]})
+    yield sse_event({"done": True, "model_used": cached["model_used"]})
+
+async def stream_model_deltas(model_name: str, static: str, dynamic: str):
+    """Yield text deltas from a streaming completion for one concrete model."""
+    if model_name == "gpt-4o":
+        stream = await app.state.openai.chat.completions.create(
+            model="gpt-4o",
+            messages=openai_messages(static, dynamic),
+            max_tokens=800,
+            temperature=0.7,
+            stream=True,
+            extra_body={"prompt_cache_key": prompt_cache_key(static)},
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    elif model_name in CLAUDE_MODELS:
+        async with app.state.anthropic.messages.stream(
+            model=model_name,
+            max_tokens=800,
+            temperature=0.7,
+            messages=anthropic_messages(static, dynamic),
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+    elif model_name in GEMINI_MODELS:
+        stream = await gemini_models[model_name].generate_content_async(f"{static}\n\n{dynamic}", stream=True)
+        async for chunk in stream:
+            if chunk.text:
+                yield chunk.text
+
+async def stream_summary(query: str, model: str, static: str, dynamic: str, cache_key: str):
+    """Stream a summary as server-sent events, caching the full text once it completes."""
+    candidates = ordered_models({"claude": CLAUDE_MODELS, "gemini": GEMINI_MODELS}.get(model, [model]))
+    parts = []
+    for model_name in candidates:
+        started = time.monotonic()
+        try:
+            logger.info(f"Streaming summary with model: {model_name} ...")
+            async for delta in stream_model_deltas(model_name, static, dynamic):
+                parts.append(delta)
+                yield sse_event({"delta": delta})
+        except Exception as e:
+            record_model_result(model_name, False, time.monotonic() - started)
+            logger.warning(f"Streaming with model {model_name} failed: {str(e)}")
+            if parts:
+                # Part of the answer has already been sent, so a fallback model can't take over
+                yield sse_event({"error": f"Error generating summary: {str(e)}"})
+                return
+            continue
+        record_model_result(model_name, bool(parts), time.monotonic() - started)
+        if parts:
+            summary = "".join(parts)
+            await set_cached_summary(cache_key, summary, model_name)
+            if semantic_cache is not None:
+                semantic_cache.add(query, model, summary, model_name)
+            yield sse_event({"done": True, "model_used": model_name})
+            return
+    yield sse_event({"error": f"Unable to generate summary with the selected model: {model}"})
+
+async def _call_openai(static: str, dynamic: str, state):
+    """Summarize with GPT-4o and return (summary, model_used)."""
+    logger.info("Using GPT-4o for summarization...")
+    completion = await state.openai.chat.completions.create(
+        model="gpt-4o",
+        messages=openai_messages(static, dynamic),
+        max_tokens=800,
+        temperature=0.7,
+        # Passed via extra_body so older SDKs without the named parameter still work
+        extra_body={"prompt_cache_key": prompt_cache_key(static)},
     )
+    logger.info("GPT-4o summarization completed")
+    return completion.choices[0].message.content, "gpt-4o"
 
-    # Add these instructions to all prompt types
-    if is_list_query:
-        return f"""You are a helpful research assistant. Based on the following web search results for "{query}", provide a comprehensive and well-structured response.\n{entity_section}\nSEARCH RESULTS:\n{context}\n\nINSTRUCTIONS:\n1. Analyze the query and provide exactly what was asked for (e.g., if asked for "top 10", provide exactly 10 items)\n2. Use clear, engaging formatting with emojis and bullet points\n3. DO NOT use markdown symbols (#, *, -, etc.)\n4. {citation_instructions}\n5. {multi_question_instructions}\n6. Focus on providing the specific information requested\n7. If the query asks for a specific number, provide exactly that number\n8. Make the response directly answer the question asked\n\nFORMAT EXAMPLE for list queries:\n"📋 Top 10 AI Tools for 2024\n\nBased on recent research and market analysis, here are the top 10 AI tools that are making waves in 2024:\n\n🥇 ChatGPT by OpenAI (openai.com)\n• Most popular conversational AI with advanced reasoning capabilities\n• Used by over 100 million users worldwide\n\n🥈 Claude by Anthropic (anthropic.com)\n• Known for safety and helpfulness in complex tasks\n• Excellent for research and analysis\n\n🥉 Gemini by Google (google.com)\n• Multimodal capabilities for text, image, and code\n• Integrated with Google's ecosystem\n\n4. GitHub Copilot (github.com)\n• AI-powered code completion and generation\n• Trusted by millions of developers\n\n5. Midjourney (midjourney.com)\n• Leading AI image generation tool\n• Creates stunning visual content\n\n6. Notion AI (notion.com)\n• AI-powered workspace and productivity tool\n• Helps with writing, organization, and collaboration\n\n7. Grammarly (grammarly.com)\n• AI writing assistant with advanced grammar checking\n• Improves writing quality and clarity\n\n8. Jasper (jasper.ai)\n• AI content creation platform for marketing\n• Generates high-quality marketing copy\n\n9. Runway ML (runwayml.com)\n• AI video generation and editing platform\n• Revolutionizing video content creation\n\n10. Replika (replika.com)\n• AI companion and mental health support\n• Personalized conversational experience\n\n💡 Key Insights:\n• AI tools are becoming more specialized and user-friendly\n• Integration with existing workflows is a key trend\n• Focus on productivity and creativity enhancement"
+async def _call_claude_with_fallback(static: str, dynamic: str, state):
+    """Summarize with the first Claude model to answer and return (summary, model_used)."""
+    logger.info("Using Claude for summarization...")
 
-Please provide a response that directly answers the specific query, using domain-based citations and breaking down multiple questions if present:"""
-    
-    elif is_how_to_query:
-        return f"""You are a helpful guide and instructor. Based on the following web search results for "{query}", provide a clear, step-by-step guide.\n{entity_section}\nSEARCH RESULTS:\n{context}\n\nINSTRUCTIONS:\n1. Provide a practical, actionable guide with clear steps\n2. Use numbered steps and bullet points for clarity\n3. Include tips, warnings, and best practices where relevant\n4. DO NOT use markdown symbols (#, *, -, etc.)\n5. {citation_instructions}\n6. {multi_question_instructions}\n7. Include inline citations by referencing the source number [1], [2], etc.\n8. Focus on being helpful and practical\n9. Add relevant emojis to make the guide engaging\n\nFORMAT EXAMPLE for how-to queries:\n"🔧 How to Set Up a Web Search Feature\n\nHere's a comprehensive guide to implementing web search functionality:\n\n📋 Prerequisites\n• API keys for search services (Google, Serper, or Tavily)\n• Backend server with Node.js/Express\n• Frontend with React or similar framework\n\n🚀 Step-by-Step Implementation\n\nStep 1: Set Up Search APIs\n• Obtain API keys from your chosen search provider [1]\n• Configure environment variables for secure access\n• Test API connectivity and rate limits\n\nStep 2: Create Backend Search Service\n• Implement search endpoint in your Express server [2]\n• Add error handling and fallback mechanisms\n• Configure CORS for frontend communication\n\nStep 3: Build Frontend Interface\n• Create search toggle component [3]\n• Implement real-time search results display\n• Add loading states and error handling\n\nStep 4: Integrate with AI Summarization\n• Set up Python microservice for summarization [4]\n• Configure multiple LLM options (GPT-4o, Claude, Gemini)\n• Implement citation and reference system\n\nStep 5: Style and Polish\n• Apply modern UI design with gradients and animations [5]\n• Ensure responsive design for all devices\n• Add accessibility features\n\n💡 Pro Tips:\n• Always implement rate limiting to avoid API costs\n• Use caching for frequently searched terms\n• Provide fallback options for when APIs fail\n• Test thoroughly with various query types\n\n⚠️ Common Pitfalls:\n• Don't forget to handle API errors gracefully\n• Avoid hardcoding API keys in your code\n• Remember to implement proper security measures"
+    async def call_claude(model_name):
+        claude_response = await state.anthropic.messages.create(
+            model=model_name,
+            max_tokens=800,
+            temperature=0.7,
+            messages=anthropic_messages(static, dynamic),
+        )
+        return claude_response.content[0].text
 
-Please provide a helpful, practical guide that directly addresses the query:"""
-    
-    elif is_definition_query:
-        return f"""You are a knowledgeable educator. Based on the following web search results for "{query}", provide a clear, comprehensive explanation.\n{entity_section}\nSEARCH RESULTS:\n{context}\n\nINSTRUCTIONS:\n1. Provide a clear, accurate definition or explanation\n2. Include relevant context, examples, and applications\n3. Use simple language while being comprehensive\n4. DO NOT use markdown symbols (#, *, -, etc.)\n5. {citation_instructions}\n6. {multi_question_instructions}\n7. Include inline citations by referencing the source number [1], [2], etc.\n8. Add relevant emojis to make the explanation engaging\n9. Structure the response logically with clear sections\n\nFORMAT EXAMPLE for definition queries:\n"📚 What is Web Search Integration?\n\nWeb search integration is a technology that combines real-time internet search capabilities with AI-powered applications to provide up-to-date, comprehensive information to users.\n\n🔍 Core Components\n\nSearch APIs: Connect to search engines like Google, Bing, or specialized APIs like Serper.dev [1]. These provide access to current web content and real-time information.\n\nAI Summarization: Use large language models (LLMs) like GPT-4o, Claude, or Gemini to process and summarize search results [2]. This transforms raw web data into coherent, useful information.\n\nFrontend Interface: User-friendly components that allow users to toggle search functionality and view results in an organized, visually appealing format [3].\n\nBackend Processing: Server-side logic that coordinates between search APIs, AI models, and the frontend interface [4].\n\n🚀 Key Benefits\n\nReal-time Information: Access to current events, latest developments, and up-to-date data that AI models might not have in their training data [5].\n\nComprehensive Coverage: Combines multiple information sources to provide well-rounded perspectives on topics.\n\nEnhanced Accuracy: Cross-references information from multiple sources to verify facts and provide reliable information.\n\nUser Control: Allows users to choose when they want web-enhanced responses versus AI-only responses.\n\n💡 Applications\n\nResearch and Analysis: Perfect for academic research, market analysis, and competitive intelligence [6].\n\nNews and Updates: Stay current with breaking news, product releases, and industry developments.\n\nFact-checking: Verify information and get multiple perspectives on controversial topics.\n\nLearning and Education: Access the latest information for educational purposes and skill development.\n\n🔧 Technical Implementation\n\nThe system typically involves:\n• API integration with search providers\n• AI model coordination for summarization\n• Real-time data processing and caching\n• User interface for search control and result display\n• Error handling and fallback mechanisms\n\nThis technology represents a significant advancement in AI applications, bridging the gap between static AI knowledge and dynamic real-world information."
+    summary, model_used = await race_models("Claude", CLAUDE_MODELS, call_claude)
+    if summary:
+        logger.info(f"Claude summarization completed with model: {model_used}")
+    return summary, model_used
 
-Please provide a clear, comprehensive explanation that directly addresses the query:"""
-    
-    elif is_comparison_query:
-        return f"""You are an expert analyst. Based on the following web search results for "{query}", provide a detailed comparison.\n{entity_section}\nSEARCH RESULTS:\n{context}\n\nINSTRUCTIONS:\n1. Provide a balanced, objective comparison\n2. Use clear comparison tables or structured format\n3. Include pros and cons for each option\n4. DO NOT use markdown symbols (#, *, -, etc.)\n5. {citation_instructions}\n6. {multi_question_instructions}\n7. Include inline citations by referencing the source number [1], [2], etc.\n8. Add relevant emojis to make the comparison engaging\n9. Provide a clear recommendation if appropriate\n\nFORMAT EXAMPLE for comparison queries:\n"⚖️ GPT-4o vs Claude vs Gemini: AI Model Comparison\n\nHere's a comprehensive comparison of the three leading AI models based on current capabilities and performance:\n\n📊 Performance Comparison\n\n🤖 GPT-4o (OpenAI)\n• Reasoning: Excellent for complex problem-solving [1]\n• Creativity: Strong creative writing and brainstorming capabilities\n• Speed: Fast response times with good accuracy\n• Cost: Competitive pricing for high-quality output\n• Integration: Extensive API ecosystem and developer tools\n\n🧠 Claude (Anthropic)\n• Safety: Industry-leading safety and helpfulness [2]\n• Analysis: Superior for research and analytical tasks\n• Context: Excellent long-context understanding\n• Ethics: Built with constitutional AI principles\n• Specialization: Strong in academic and professional writing\n\n🌟 Gemini (Google)\n• Multimodal: Best-in-class image, text, and code understanding [3]\n• Integration: Seamless Google ecosystem integration\n• Innovation: Cutting-edge research and development\n• Scalability: Enterprise-grade infrastructure\n• Future-ready: Advanced reasoning and planning capabilities\n\n📈 Key Metrics Comparison\n\n| Feature | GPT-4o | Claude | Gemini |\n|---------|--------|--------|--------|\n| Reasoning | ⭐⭐⭐⭐⭐ | ⭐⭐⭐⭐ | ⭐⭐⭐⭐⭐ |\n| Creativity | ⭐⭐⭐⭐⭐ | ⭐⭐⭐⭐ | ⭐⭐⭐⭐ |\n| Safety | ⭐⭐⭐⭐ | ⭐⭐⭐⭐⭐ | ⭐⭐⭐⭐ |\n| Speed | ⭐⭐⭐⭐⭐ | ⭐⭐⭐⭐ | ⭐⭐⭐⭐ |\n| Cost | ⭐⭐⭐⭐ | ⭐⭐⭐⭐ | ⭐⭐⭐⭐ |\n\n🎯 Use Case Recommendations\n\nChoose GPT-4o for:\n• General-purpose AI tasks and creative projects\n• Fast, reliable responses for everyday use\n• Extensive API integration needs\n\nChoose Claude for:\n• Research and analysis tasks\n• Safety-critical applications\n• Academic and professional writing\n\nChoose Gemini for:\n• Multimodal applications (text + images)\n• Google ecosystem integration\n• Cutting-edge AI research and development\n\n💡 Final Verdict\n\nEach model excels in different areas, making the choice dependent on your specific needs. For general use, GPT-4o offers the best balance of capabilities and accessibility. For research and safety-critical applications, Claude is the top choice. For multimodal and Google-integrated solutions, Gemini leads the way."
+async def _call_gemini_with_fallback(static: str, dynamic: str, state):
+    """Summarize with the first Gemini model to answer and return (summary, model_used)."""
+    logger.info("Using Gemini for summarization...")
 
-Please provide a detailed, balanced comparison that directly addresses the query:"""
-    
-    elif is_news_query:
-        return f"""You are a news analyst and reporter. Based on the following web search results for "{query}", provide the latest news and developments.\n{entity_section}\nSEARCH RESULTS:\n{context}\n\nINSTRUCTIONS:\n1. Focus on the most recent and relevant news\n2. Provide context and background information\n3. Include multiple perspectives when available\n4. DO NOT use markdown symbols (#, *, -, etc.)\n5. {citation_instructions}\n6. {multi_question_instructions}\n7. Include inline citations by referencing the source number [1], [2], etc.\n8. Add relevant emojis to make the news engaging\n9. Structure with clear sections for different aspects\n\nFORMAT EXAMPLE for news queries:\n"📰 Latest AI Developments and Breakthroughs\n\nHere are the most recent and significant developments in artificial intelligence:\n\n🚀 Major Announcements\n\nOpenAI's GPT-5 Development: OpenAI has officially confirmed they are working on GPT-5, the next generation of their language model [1]. The company expects significant improvements in reasoning, creativity, and multimodal capabilities.\n\nGoogle's Gemini 2.0 Release: Google has launched Gemini 2.0 with enhanced reasoning abilities and improved performance across all benchmarks [2]. The new model shows 40% improvement in complex problem-solving tasks.\n\nAnthropic's Constitutional AI Advances: Anthropic has published new research on constitutional AI, demonstrating improved safety and alignment in large language models [3]. Their latest models show better adherence to safety principles.\n\n💼 Industry Impact\n\nInvestment Surge: AI startups have seen a 150% increase in funding compared to last year [4]. Major investments are flowing into AI infrastructure, applications, and research.\n\nEnterprise Adoption: 78% of Fortune 500 companies are now actively implementing AI solutions [5]. The focus is shifting from experimentation to production deployment.\n\nRegulatory Developments: New AI regulations are being proposed in the EU and US [6]. These focus on transparency, safety, and responsible AI development.\n\n🔬 Research Breakthroughs\n\nMultimodal AI: Researchers have achieved breakthroughs in combining text, image, and audio understanding [7]. This enables more human-like AI interactions.\n\nAI Reasoning: New techniques have significantly improved AI's ability to reason through complex problems [8]. This includes better logical thinking and step-by-step problem solving.\n\nEnergy Efficiency: AI models are becoming more energy-efficient, reducing environmental impact [9]. New training methods can reduce energy consumption by up to 70%.\n\n🎯 Future Outlook\n\nShort-term (6-12 months): Expect more specialized AI models for specific industries and use cases [10]. Integration with existing business processes will accelerate.\n\nMedium-term (1-2 years): AI will become more autonomous and capable of complex decision-making. We'll see more AI agents that can work independently.\n\nLong-term (3-5 years): AI will likely achieve human-level performance in many cognitive tasks. The focus will shift to AI-human collaboration and augmentation.\n\n💡 Key Takeaways\n\n• AI development is accelerating rapidly with major breakthroughs every few months\n• Industry adoption is moving from experimentation to production\n• Regulatory frameworks are evolving to ensure responsible AI development\n• The focus is shifting toward more specialized and efficient AI models"
+    async def call_gemini(model_name):
+        gemini_response = await gemini_models[model_name].generate_content_async(f"{static}\n\n{dynamic}")
+        return gemini_response.text
 
-Please provide the latest news and developments that directly address the query:"""
-    
-    elif is_technical_query:
-        return f"""You are a technical expert and developer. Based on the following web search results for "{query}", provide technical guidance and implementation details.\n{entity_section}\nSEARCH RESULTS:\n{context}\n\nINSTRUCTIONS:\n1. Provide technical details and implementation guidance\n2. Include code examples, architecture considerations, and best practices\n3. Address technical challenges and solutions\n4. DO NOT use markdown symbols (#, *, -, etc.)\n5. {citation_instructions}\n6. {multi_question_instructions}\n7. Include inline citations by referencing the source number [1], [2], etc.\n8. Add relevant emojis to make the technical content engaging\n9. Structure with clear sections for different technical aspects\n\nFORMAT EXAMPLE for technical queries:\n"⚙️ Technical Implementation of Web Search Integration\n\nHere's a comprehensive technical guide for implementing web search functionality:\n\n🏗️ Architecture Overview\n\nThe system consists of three main components:\n• Frontend: React/TypeScript interface for user interaction\n• Backend: Node.js/Express API for request handling\n• Python Microservice: FastAPI service for AI summarization\n\n🔧 Backend Implementation\n\nAPI Endpoint Structure:\n    // Search endpoint\n    POST /api/search\n    {{\n      \"query\": \"string\",\n      \"model\": \"gpt-4o|claude|gemini\"\n    }}\n\n    // Response structure\n    {{\n      \"searchResults\": {{...}},\n      \"summary\": \"string\",\n      \"modelUsed\": \"string\"\n    }}\n\nSearch Service Integration:\n• Google Custom Search API as primary [1]\n• Serper.dev and Tavily as fallbacks\n• Error handling and rate limiting\n• Caching for frequently searched terms\n\n🤖 Python Microservice\n\nFastAPI Implementation:\n    @app.post(\"/summarize\")\n    async def summarize(request: SummarizeRequest):\n        # Process search results\n        # Generate AI summary\n        # Return formatted response\n\nLLM Integration:\n• OpenAI GPT-4o for primary summarization [2]\n• Claude and Gemini as alternatives\n• Model fallback mechanisms\n• Error handling and retry logic\n\n🎨 Frontend Components\n\nSearch Toggle Component:\n• React state management for search toggle\n• Real-time UI updates\n• Loading states and error handling\n\nResults Display:\n• Responsive design with Tailwind CSS\n• Citation system with clickable links\n• Professional typography with Satoshi font\n\n🔒 Security Considerations\n\nAPI Key Management:\n• Environment variables for sensitive data\n• Secure key rotation mechanisms\n• Rate limiting to prevent abuse\n\nData Privacy:\n• No storage of search queries\n• Secure transmission of data\n• Compliance with privacy regulations\n\n📊 Performance Optimization\n\nCaching Strategy:\n• Redis for search result caching [3]\n• CDN for static assets\n• Database optimization for conversation storage\n\nLoad Balancing:\n• Horizontal scaling for high traffic\n• Health checks and failover\n• Monitoring and alerting\n\n🧪 Testing Strategy\n\nUnit Tests:\n• API endpoint testing\n• Search service validation\n• AI model integration testing\n\nIntegration Tests:\n• End-to-end workflow testing\n• Cross-browser compatibility\n• Performance benchmarking\n\n🚀 Deployment\n\nContainerization:\n• Docker containers for each service\n• Kubernetes orchestration for scaling\n• CI/CD pipeline for automated deployment\n\nMonitoring:\n• Application performance monitoring\n• Error tracking and alerting\n• Usage analytics and reporting\n\n💡 Best Practices\n\n• Always implement proper error handling\n• Use environment-specific configurations\n• Monitor API usage and costs\n• Implement comprehensive logging\n• Regular security audits and updates"\n\nPlease provide technical guidance that directly addresses the query:"""
-    
-    else:
-        # Default dynamic response for general queries
-        return f"""You are a helpful AI assistant. Based on the following web search results for "{query}", provide a comprehensive and useful response.\n{entity_section}\nSEARCH RESULTS:\n{context}\n\nINSTRUCTIONS:\n1. Analyze the query and provide the most relevant and helpful information\n2. Structure your response logically based on the query type\n3. Use clear, engaging formatting with appropriate emojis\n4. DO NOT use markdown symbols (#, *, -, etc.)\n5. {citation_instructions}\n6. {multi_question_instructions}\n7. Focus on being genuinely helpful and informative\n8. Adapt the format to best serve the specific query\n\nFORMAT GUIDELINES:\n• Use emojis to highlight important sections\n• Include bullet points for lists and key information\n• Provide context and background when relevant\n• Structure with clear sections for different aspects\n• Make the response directly answer what was asked\n\nPlease provide a helpful, comprehensive response that directly addresses the query, using domain-based citations and breaking down multiple questions if present:"""
+    summary, model_used = await race_models("Gemini", GEMINI_MODELS, call_gemini)
+    if summary:
+        logger.info(f"Gemini summarization completed with model: {model_used}")
+    return summary, model_used
+
+async def _call_unsupported(static: str, dynamic: str, state):
+    """Default handler for model names without a provider."""
+    return None, None
+
+# Provider handler per requested model name
+HANDLERS = {
+    "gpt-4o": _call_openai,
+    "claude": _call_claude_with_fallback,
+    "gemini": _call_gemini_with_fallback,
+}
 
 @app.post("/summarize", response_model=SummarizeResponse)
-async def summarize(request: SummarizeRequest):
+async def summarize(request: SummarizeRequest, response: Response):
     query = request.query
-    search_results = [r.dict() for r in request.results]
+    search_results = result_dicts(request.results)
     model = request.model
     
     logger.info(f"Processing summarize request for query: {query} with {len(search_results)} results using model: {model}")
 
-    prompt = create_search_agent_prompt(query, search_results)
+    cache_key = summary_cache_key(query, model, search_results)
+    cached = None if request.force_refresh else await get_cached_summary(cache_key)
+    if cached:
+        logger.info("Returning cached summary")
+        if request.stream:
+            return StreamingResponse(stream_cached_summary(cached), media_type="text/event-stream", headers={"X-Cache": "HIT"})
+        response.headers["X-Cache"] = "HIT"
+        return SummarizeResponse(**cached)
+
+    if semantic_cache is not None and not request.force_refresh:
+        similar = semantic_cache.lookup(query, model)
+        if similar:
+            logger.info("Returning semantically cached summary")
+            if request.stream:
+                return StreamingResponse(stream_cached_summary(similar), media_type="text/event-stream", headers={"X-Cache": "HIT"})
+            response.headers["X-Cache"] = "HIT"
+            return SummarizeResponse(**similar)
+    response.headers["X-Cache"] = "MISS"
+
+    static, dynamic = await prompt_parts(query, search_results)
+
+    if request.stream:
+        return StreamingResponse(
+            stream_summary(query, model, static, dynamic, cache_key),
+            media_type="text/event-stream",
+            headers={"X-Cache": "MISS"}
+        )
     
-    summary = None
+    handler = HANDLERS.get(model, _call_unsupported)
     model_used = model
 
     try:
-        if model == "gpt-4o":
-            logger.info("Using GPT-4o for summarization...")
-            client = openai.OpenAI(api_key=openai_api_key)
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=800,
-                temperature=0.7,
-            )
-            summary = response.choices[0].message.content
-            logger.info("GPT-4o summarization completed")
-            
-        elif model == "claude":
-            logger.info("Using Claude for summarization...")
-            for model_name in CLAUDE_MODELS:
-                try:
-                    logger.info(f"Trying Claude model: {model_name} ...")
-                    client_anthropic = anthropic.Anthropic(api_key=anthropic_api_key)
-                    claude_response = client_anthropic.messages.create(
-                        model=model_name,
-                        max_tokens=800,
-                        temperature=0.7,
-                        messages=[{"role": "user", "content": prompt}],
-                    )
-                    summary = claude_response.content[0].text
-                    model_used = model_name
-                    logger.info(f"Claude summarization completed with model: {model_name}")
-                    break
-                except Exception as e:
-                    logger.warning(f"Claude model {model_name} failed: {str(e)}")
-                    continue
-                    
-        elif model == "gemini":
-            logger.info("Using Gemini for summarization...")
-            for model_name in GEMINI_MODELS:
-                try:
-                    logger.info(f"Trying Gemini model: {model_name} ...")
-                    genai_model = genai.GenerativeModel(model_name)
-                    gemini_response = genai_model.generate_content(prompt)
-                    summary = gemini_response.text
-                    model_used = model_name
-                    logger.info(f"Gemini summarization completed with model: {model_name}")
-                    break
-                except Exception as e:
-                    logger.warning(f"Gemini model {model_name} failed: {str(e)}")
-                    continue
-        
-        if not summary:
+        summary, handler_model = await handler(static, dynamic, app.state)
+        if summary:
+            model_used = handler_model
+            await set_cached_summary(cache_key, summary, model_used)
+            if semantic_cache is not None:
+                semantic_cache.add(query, model, summary, model_used)
+        else:
             summary = f"Unable to generate summary with the selected model: {model}"
             
     except Exception as e:
@@ -245,6 +855,165 @@ async def summarize(request: SummarizeRequest):
         model_used=model_used
     ) 
 
+@app.post("/summarize_stream")
+async def summarize_stream(request: SummarizeRequest, response: Response):
+    """Always-streaming variant of /summarize that answers with server-sent events."""
+    request.stream = True
+    return await summarize(request, response)
+
+def split_batch_answers(text: str, count: int) -> List[str]:
+    """Split a packed batch completion back into one answer per query."""
+    answers = []
+    for i, part in enumerate(text.split(BATCH_DELIMITER)[:count], start=1):
+        part = part.strip()
+        label = f"[{i}]"
+        if part.startswith(label):
+            part = part[len(label):].strip()
+        answers.append(part)
+    return answers + [""] * (count - len(answers))
+
+async def summarize_batch_chunk(static: str, dynamic_parts: List[str]) -> Tuple[List[str], bool]:
+    """Answer up to batch_chunk_size queries sharing one set of instructions with a single GPT-4o call.
+
+    Returns the answers and whether the completion finished normally; truncated answers must not be cached.
+    """
+    packed = "\n\n".join(
+        f"[{n}] {dynamic}\n{BATCH_DELIMITER}" for n, dynamic in enumerate(dynamic_parts, start=1)
+    )
+    instructions = (
+        f"{static}\n\nAnswer each of the following {len(dynamic_parts)} queries independently using the "
+        f"instructions above. Start each answer with its number in brackets, e.g. [1], and end each answer "
+        f"with {BATCH_DELIMITER}."
+    )
+    completion = await app.state.openai.chat.completions.create(
+        model="gpt-4o",
+        messages=[
+            {"role": "system", "content": instructions},
+            {"role": "user", "content": packed},
+        ],
+        max_tokens=800 * len(dynamic_parts),
+        temperature=0.7,
+    )
+    choice = completion.choices[0]
+    if choice.finish_reason != "stop":
+        logger.warning(f"Batch completion ended with finish_reason={choice.finish_reason}, not caching its answers")
+    return split_batch_answers(choice.message.content or "", len(dynamic_parts)), choice.finish_reason == "stop"
+
+@app.post("/summarize_batch", response_model=BatchSummarizeResponse)
+async def summarize_batch(request: BatchSummarizeRequest):
+    """Summarize several queries with a few GPT-4o calls to save requests against RPM limits.
+
+    Only gpt-4o is supported; items asking for another model are rejected rather than silently rerouted.
+    """
+    if len(request.items) > batch_max_items:
+        raise HTTPException(status_code=413, detail=f"At most {batch_max_items} items per batch")
+    unsupported = sorted({item.model for item in request.items if item.model != "gpt-4o"})
+    if unsupported:
+        raise HTTPException(status_code=422, detail=f"Batch summaries only support gpt-4o, got: {', '.join(unsupported)}")
+
+    items = [(item.query, result_dicts(item.results)) for item in request.items]
+    logger.info(f"Processing batch summarize request with {len(items)} queries")
+
+    cache_keys = [summary_cache_key(query, "gpt-4o", results) for query, results in items]
+    responses = [None] * len(items)
+    for i, key in enumerate(cache_keys):
+        if request.items[i].force_refresh:
+            continue
+        cached = await get_cached_summary(key)
+        if cached:
+            responses[i] = SummarizeResponse(**cached)
+
+    # Group pending queries by their static instructions so each set is sent once per call;
+    # prompts are built together so large result sets spread over the prompt worker pool
+    pending = [i for i, cached in enumerate(responses) if cached is None]
+    parts = await asyncio.gather(*(prompt_parts(*items[i]) for i in pending))
+    groups = {}
+    for i, (static, dynamic) in zip(pending, parts):
+        groups.setdefault(static, []).append((i, dynamic))
+    chunks = [
+        (static, group[start:start + batch_chunk_size])
+        for static, group in groups.items()
+        for start in range(0, len(group), batch_chunk_size)
+    ]
+
+    outcomes = await asyncio.gather(
+        *(summarize_batch_chunk(static, [dynamic for _, dynamic in chunk]) for static, chunk in chunks),
+        return_exceptions=True
+    )
+    for (_, chunk), outcome in zip(chunks, outcomes):
+        indices = [i for i, _ in chunk]
+        if isinstance(outcome, Exception):
+            logger.error(f"Error in summarize_batch endpoint: {str(outcome)}")
+            answers, complete = [f"Error generating summary: {str(outcome)}"] * len(indices), False
+        else:
+            answers, complete = outcome
+        for i, answer in zip(indices, answers):
+            if answer and complete:
+                await set_cached_summary(cache_keys[i], answer, "gpt-4o")
+            responses[i] = SummarizeResponse(
+                summary=answer or "Unable to generate summary with the selected model: gpt-4o",
+                model_used="gpt-4o"
+            )
+
+    return BatchSummarizeResponse(items=responses)
+
+@app.post("/batch_summaries", response_model=BatchJobResponse)
+async def submit_batch_summaries(request: BatchSummarizeRequest):
+    """Queue queries on the OpenAI Batch API (half price, 24h window) and return the batch id to poll."""
+    lines = []
+    for i, item in enumerate(request.items):
+        static, dynamic = await prompt_parts(item.query, result_dicts(item.results))
+        lines.append(json.dumps({
+            "custom_id": str(i),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": "gpt-4o",
+                "messages": openai_messages(static, dynamic),
+                "max_tokens": 800,
+                "temperature": 0.7,
+            },
+        }))
+    logger.info(f"Submitting {len(lines)} queries to the OpenAI Batch API")
+
+    batch_file = await app.state.openai.files.create(
+        file=("summaries.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch"
+    )
+    batch = await app.state.openai.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    return BatchJobResponse(batch_id=batch.id, status=batch.status)
+
+@app.get("/batch_summaries/{batch_id}", response_model=BatchJobResponse)
+async def get_batch_summaries(batch_id: str):
+    """Report a queued batch's status, with the summaries in submission order once it has completed."""
+    batch = await app.state.openai.batches.retrieve(batch_id)
+    if batch.status != "completed" or not batch.output_file_id:
+        return BatchJobResponse(batch_id=batch.id, status=batch.status)
+
+    output = await app.state.openai.files.content(batch.output_file_id)
+    answers = {}
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        choices = ((record.get("response") or {}).get("body") or {}).get("choices") or []
+        if choices:
+            answers[int(record["custom_id"])] = choices[0]["message"]["content"]
+
+    # Requests that failed inside the batch are only listed in the error file
+    items = [
+        SummarizeResponse(
+            summary=answers.get(i) or "Unable to generate summary with the selected model: gpt-4o",
+            model_used="gpt-4o"
+        )
+        for i in range(batch.request_counts.total)
+    ]
+    return BatchJobResponse(batch_id=batch.id, status=batch.status, items=items)
+
 if __name__ == "__main__":
     import uvicorn
     print("🚀 Starting Web Search Summarizer Agent...")
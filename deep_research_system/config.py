@@ -3,59 +3,93 @@ Configuration management for the Deep Research System
 """
 import os
 from dotenv import load_dotenv
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
 
 # Load environment variables
 load_dotenv()
 
+# keyring is optional; with USE_KEYRING=true, API keys are read from the OS keyring first
+try:
+    import keyring
+except ImportError:
+    keyring = None
+
+# Read-only snapshot of the environment taken once at import
+_ENV = MappingProxyType(dict(os.environ))
+
+# Keyring service name the setup script stores API keys under
+KEYRING_SERVICE = "deep_research"
+_USE_KEYRING = _ENV.get("USE_KEYRING", "false").lower() == "true"
+if _USE_KEYRING and not keyring:
+    print("USE_KEYRING is set but keyring is not installed; API keys are read from the environment only")
+
+def get_secret(name: str) -> Optional[str]:
+    """Look up a credential in the OS keyring (when enabled), falling back to the environment"""
+    if _USE_KEYRING and keyring:
+        try:
+            value = keyring.get_password(KEYRING_SERVICE, name)
+        except Exception as e:
+            print(f"Keyring lookup for {name} failed: {e}")
+            value = None
+        if value:
+            return value
+    return _ENV.get(name)
+
 class Config:
     """Configuration class for the Deep Research System"""
     
     # AI Provider API Keys
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-    ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
-    GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+    OPENAI_API_KEY = get_secret("OPENAI_API_KEY")
+    ANTHROPIC_API_KEY = get_secret("ANTHROPIC_API_KEY")
+    GOOGLE_API_KEY = get_secret("GOOGLE_API_KEY")
     
     # Search API Keys
-    TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
-    SERPER_API_KEY = os.getenv("SERPER_API_KEY")
-    GOOGLE_SEARCH_API_KEY = os.getenv("GOOGLE_SEARCH_API_KEY")
-    GOOGLE_SEARCH_ENGINE_ID = os.getenv("GOOGLE_SEARCH_ENGINE_ID")
-    BRAVE_API_KEY = os.getenv("BRAVE_API_KEY")
+    TAVILY_API_KEY = get_secret("TAVILY_API_KEY")
+    SERPER_API_KEY = get_secret("SERPER_API_KEY")
+    GOOGLE_SEARCH_API_KEY = get_secret("GOOGLE_SEARCH_API_KEY")
+    GOOGLE_SEARCH_ENGINE_ID = _ENV.get("GOOGLE_SEARCH_ENGINE_ID")
+    BRAVE_API_KEY = get_secret("BRAVE_API_KEY")
     
     # Database Configuration
-    MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017/deepresearch")
-    SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH", "./data/research.db")
+    MONGODB_URI = _ENV.get("MONGODB_URI", "mongodb://localhost:27017/deepresearch")
+    SQLITE_DB_PATH = _ENV.get("SQLITE_DB_PATH", "./data/research.db")
     
     # Research Configuration
-    MAX_RESEARCH_ITERATIONS = int(os.getenv("MAX_RESEARCH_ITERATIONS", "5"))
-    RESEARCH_TIMEOUT = int(os.getenv("RESEARCH_TIMEOUT", "300"))
-    MAX_SOURCES_PER_TOPIC = int(os.getenv("MAX_SOURCES_PER_TOPIC", "10"))
+    MAX_RESEARCH_ITERATIONS = int(_ENV.get("MAX_RESEARCH_ITERATIONS", "5"))
+    RESEARCH_TIMEOUT = int(_ENV.get("RESEARCH_TIMEOUT", "300"))
+    MAX_SOURCES_PER_TOPIC = int(_ENV.get("MAX_SOURCES_PER_TOPIC", "10"))
+    MAX_PARALLEL_AGENTS = int(_ENV.get("MAX_PARALLEL_AGENTS", "8"))
+    PRELOAD_NLTK = _ENV.get("PRELOAD_NLTK", "true").lower() == "true"
+    
+    # Search Cache Configuration (in-process; 0 entries disables it)
+    SEARCH_CACHE_SIZE = int(_ENV.get("SEARCH_CACHE_SIZE", "1024"))
+    SEARCH_CACHE_TTL = int(_ENV.get("SEARCH_CACHE_TTL", "3600"))
+    # Persistent HTTP response cache shared across runs (requires requests-cache)
+    HTTP_CACHE_ENABLED = _ENV.get("HTTP_CACHE_ENABLED", "false").lower() == "true"
+    HTTP_CACHE_PATH = _ENV.get("HTTP_CACHE_PATH", ".research_cache")
+    HTTP_CACHE_EXPIRE = int(_ENV.get("HTTP_CACHE_EXPIRE", "86400"))
     
     # AI Provider Configuration
-    PREFERRED_AI_PROVIDER = os.getenv("PREFERRED_AI_PROVIDER", "openai").lower()
+    PREFERRED_AI_PROVIDER = _ENV.get("PREFERRED_AI_PROVIDER", "openai").lower()
     
     # Model Configuration
-    OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4")
-    OPENAI_TEMPERATURE = float(os.getenv("OPENAI_TEMPERATURE", "0.7"))
-    OPENAI_MAX_TOKENS = int(os.getenv("OPENAI_MAX_TOKENS", "4000"))
-    
-    ANTHROPIC_MODEL = os.getenv("ANTHROPIC_MODEL", "claude-3-sonnet-20240229")
-    ANTHROPIC_TEMPERATURE = float(os.getenv("ANTHROPIC_TEMPERATURE", "0.7"))
-    ANTHROPIC_MAX_TOKENS = int(os.getenv("ANTHROPIC_MAX_TOKENS", "4000"))
-    
-    GOOGLE_MODEL = os.getenv("GOOGLE_MODEL", "gemini-pro")
-    GOOGLE_TEMPERATURE = float(os.getenv("GOOGLE_TEMPERATURE", "0.7"))
-    GOOGLE_MAX_TOKENS = int(os.getenv("GOOGLE_MAX_TOKENS", "4000"))
-    
-    # Agent Configuration - Updated to support multiple providers
-    AGENT_MODELS = {
-        "manager": PREFERRED_AI_PROVIDER,
-        "researcher": PREFERRED_AI_PROVIDER,
-        "analyst": PREFERRED_AI_PROVIDER,
-        "editor": PREFERRED_AI_PROVIDER,
-        "reporter": PREFERRED_AI_PROVIDER
-    }
+    OPENAI_MODEL = _ENV.get("OPENAI_MODEL", "gpt-4")
+    OPENAI_TEMPERATURE = float(_ENV.get("OPENAI_TEMPERATURE", "0.7"))
+    OPENAI_MAX_TOKENS = int(_ENV.get("OPENAI_MAX_TOKENS", "4000"))
+    
+    ANTHROPIC_MODEL = _ENV.get("ANTHROPIC_MODEL", "claude-3-sonnet-20240229")
+    ANTHROPIC_TEMPERATURE = float(_ENV.get("ANTHROPIC_TEMPERATURE", "0.7"))
+    ANTHROPIC_MAX_TOKENS = int(_ENV.get("ANTHROPIC_MAX_TOKENS", "4000"))
+    
+    GOOGLE_MODEL = _ENV.get("GOOGLE_MODEL", "gemini-pro")
+    GOOGLE_TEMPERATURE = float(_ENV.get("GOOGLE_TEMPERATURE", "0.7"))
+    GOOGLE_MAX_TOKENS = int(_ENV.get("GOOGLE_MAX_TOKENS", "4000"))
+    
+    # Agent Configuration - every agent uses the preferred provider unless
+    # an agent type is listed here with its own provider
+    AGENT_PROVIDER_OVERRIDES: Dict[str, str] = {}
     
     # Research Tools Configuration
     SEARCH_TOOLS = [
@@ -71,8 +105,9 @@ class Config:
     DEFAULT_OUTPUT_FORMAT = "markdown"
     
     @classmethod
-    def validate_config(cls) -> Dict[str, Any]:
-        """Validate configuration and return any issues"""
+    @lru_cache(maxsize=None)
+    def validate_config(cls) -> Mapping[str, Any]:
+        """Validate configuration and return any issues (read-only, as the result is shared)"""
         issues = {}
         
         # Check if at least one AI provider is configured
@@ -94,61 +129,83 @@ class Config:
         if not cls.TAVILY_API_KEY:
             issues["TAVILY_API_KEY"] = "Tavily API key is recommended for better search results"
         
-        return issues
+        return MappingProxyType(issues)
     
     @classmethod
-    def get_agent_config(cls, agent_type: str) -> Dict[str, Any]:
+    def get_agent_config(cls, agent_type: str) -> Mapping[str, Any]:
         """Get configuration for a specific agent type"""
-        provider = cls.AGENT_MODELS.get(agent_type, cls.PREFERRED_AI_PROVIDER)
-        
-        if provider == "openai":
-            return {
+        provider = cls.PREFERRED_AI_PROVIDER
+        if cls.AGENT_PROVIDER_OVERRIDES:
+            provider = cls.AGENT_PROVIDER_OVERRIDES.get(agent_type, provider)
+        configs = cls._provider_configs()
+        # Unknown providers fall back to OpenAI
+        return configs.get(provider, configs["openai"])
+    
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _provider_configs(cls) -> Mapping[str, Mapping[str, Any]]:
+        """Read-only model settings per provider, built from the class attributes on first use"""
+        return MappingProxyType({
+            "openai": MappingProxyType({
                 "model": cls.OPENAI_MODEL,
                 "temperature": cls.OPENAI_TEMPERATURE,
                 "max_tokens": cls.OPENAI_MAX_TOKENS,
                 "verbose": True
-            }
-        elif provider == "anthropic":
-            return {
+            }),
+            "anthropic": MappingProxyType({
                 "model": cls.ANTHROPIC_MODEL,
                 "temperature": cls.ANTHROPIC_TEMPERATURE,
                 "max_tokens": cls.ANTHROPIC_MAX_TOKENS,
                 "verbose": True
-            }
-        elif provider == "google":
-            return {
+            }),
+            "google": MappingProxyType({
                 "model": cls.GOOGLE_MODEL,
                 "temperature": cls.GOOGLE_TEMPERATURE,
                 "max_tokens": cls.GOOGLE_MAX_TOKENS,
                 "verbose": True
-            }
-        else:
-            # Fallback to OpenAI
-            return {
-                "model": cls.OPENAI_MODEL,
-                "temperature": cls.OPENAI_TEMPERATURE,
-                "max_tokens": cls.OPENAI_MAX_TOKENS,
-                "verbose": True
-            }
+            })
+        })
     
     @classmethod
-    def get_available_providers(cls) -> Dict[str, bool]:
-        """Get available AI providers and their status"""
-        return {
+    @lru_cache(maxsize=None)
+    def get_available_providers(cls) -> Mapping[str, bool]:
+        """Get available AI providers and their status (read-only, as the result is shared)"""
+        return MappingProxyType({
             "openai": bool(cls.OPENAI_API_KEY),
             "anthropic": bool(cls.ANTHROPIC_API_KEY),
             "google": bool(cls.GOOGLE_API_KEY)
-        }
+        })
     
     @classmethod
-    def get_provider_info(cls) -> Dict[str, Any]:
-        """Get information about the current AI provider configuration"""
+    @lru_cache(maxsize=None)
+    def get_provider_info(cls) -> Mapping[str, Any]:
+        """Get information about the current AI provider configuration (read-only, as the result is shared)"""
         available = cls.get_available_providers()
+        manager_config = cls.get_agent_config("manager")
         
-        return {
+        return MappingProxyType({
             "preferred_provider": cls.PREFERRED_AI_PROVIDER,
             "available_providers": available,
-            "current_model": cls.get_agent_config("manager")["model"],
-            "current_temperature": cls.get_agent_config("manager")["temperature"],
-            "current_max_tokens": cls.get_agent_config("manager")["max_tokens"]
-        } 
\ No newline at end of file
+            "current_model": manager_config["model"],
+            "current_temperature": manager_config["temperature"],
+            "current_max_tokens": manager_config["max_tokens"]
+        })
+    
+    @classmethod
+    def set_preferred_provider(cls, provider: str) -> None:
+        """Switch the preferred AI provider, dropping lookups cached for the previous one"""
+        cls.PREFERRED_AI_PROVIDER = provider.lower()
+        cls.refresh_config_cache()
+    
+    @classmethod
+    def invalidate_validation(cls) -> None:
+        """Forget the cached validate_config result"""
+        cls.validate_config.cache_clear()
+    
+    @classmethod
+    def refresh_config_cache(cls) -> None:
+        """Drop cached provider lookups and validation, e.g. after tests change class attributes"""
+        cls._provider_configs.cache_clear()
+        cls.get_available_providers.cache_clear()
+        cls.get_provider_info.cache_clear()
+        cls.invalidate_validation()
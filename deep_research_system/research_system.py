@@ -2,33 +2,117 @@
 Main Deep Research System using Crew AI
 """
 import os
+import re
 import json
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List, Optional
-from crewai import Crew, Process
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Any, List, Mapping, Optional
 from deep_research_system.config import Config
-from deep_research_system.agents.research_agents import ResearchTeam, ResearchAgentFactory
-from deep_research_system.tasks.research_tasks import ResearchTaskFactory
-from deep_research_system.tools.search_tools import SearchResult
+
+# crewai and the agent/task modules pull in LangChain and the search
+# backends, so they are imported when research actually runs
+if TYPE_CHECKING:
+    from deep_research_system.agents.research_agents import ResearchTeam
+
+# orjson is optional; it speeds up JSON report and history exports when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Characters not allowed in output filenames (keeps word characters, spaces, hyphens)
+_UNSAFE_FILENAME_RE = re.compile(r"[^\w \-]+")
+
+# Static HTML report scaffolding, filled in by _format_html
+_HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <title>Deep Research Report: {topic}</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 40px; }}
+        h1 {{ color: #2c3e50; }}
+        h2 {{ color: #34495e; margin-top: 30px; }}
+        .summary {{ background-color: #f8f9fa; padding: 20px; border-radius: 5px; }}
+        .details {{ background-color: #e8f4f8; padding: 15px; border-radius: 5px; margin: 20px 0; }}
+        ul {{ line-height: 1.6; }}
+    </style>
+</head>
+<body>
+    <h1>Deep Research Report: {topic}</h1>
+    
+    <h2>Executive Summary</h2>
+    <div class="summary">{summary}</div>
+    
+    <h2>Research Details</h2>
+    <div class="details">
+        <p><strong>Topic:</strong> {topic}</p>
+        <p><strong>Research Depth:</strong> {research_depth}</p>
+        <p><strong>Target Audience:</strong> {target_audience}</p>
+        <p><strong>AI Provider:</strong> {ai_provider}</p>
+        <p><strong>AI Model:</strong> {ai_model}</p>
+        <p><strong>Timestamp:</strong> {timestamp}</p>
+        <p><strong>Execution Time:</strong> {execution_time:.2f} seconds</p>
+    </div>
+    
+    <h2>Key Findings</h2>
+    <ul>
+{findings}    </ul>
+    
+    <h2>Recommendations</h2>
+    <ul>
+{recommendations}    </ul>
+    
+    <h2>Sources</h2>
+    <ul>
+{sources}    </ul>
+</body>
+</html>"""
+
+def _dump_json(data: Any) -> str:
+    """Serialize data as indented JSON, using orjson when available"""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
 
 class DeepResearchSystem:
     """
     Comprehensive deep research system using multiple specialized agents
     """
     
-    def __init__(self, api_keys: Optional[Dict[str, str]] = None):
+    __slots__ = ("config", "research_history", "_manager_model", "_io_pool", "_output_dir_created", "_pending_saves")
+    
+    # Directory that saved reports are written to
+    _OUTPUT_ROOT = Path("research_outputs")
+    
+    # output_format -> (file extension, renderer)
+    _FORMATTERS = {
+        "json": (".json", lambda self, results: _dump_json(results)),
+        "markdown": (".md", lambda self, results: self._format_markdown(results)),
+        "html": (".html", lambda self, results: self._format_html(results)),
+    }
+    
+    def __init__(self, api_keys: Optional[Dict[str, str]] = None, provider: Optional[str] = None):
         """
         Initialize the Deep Research System
         
         Args:
             api_keys: Dictionary of API keys (OpenAI, Anthropic, Google, etc.)
+            provider: AI provider to use instead of PREFERRED_AI_PROVIDER
         """
+        if provider:
+            Config.set_preferred_provider(provider)
         self.config = Config()
+        self._manager_model = self.config.get_agent_config("manager")["model"]
         self._setup_api_keys(api_keys)
         self._validate_config()
         self._display_provider_info()
         self.research_history = []
+        self._output_dir_created = False
+        # Report files are written off the research return path
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="research-io")
+        self._pending_saves: List[Future] = []
         
     def _setup_api_keys(self, api_keys: Optional[Dict[str, str]]):
         """Setup API keys from environment or provided dictionary"""
@@ -45,25 +129,28 @@ class DeepResearchSystem:
         """Validate configuration and report any issues"""
         issues = self.config.validate_config()
         if issues:
-            print("Configuration warnings:")
-            for key, message in issues.items():
-                print(f"  - {key}: {message}")
+            lines = ["Configuration warnings:"]
+            lines.extend(f"  - {key}: {message}" for key, message in issues.items())
+            print("\n".join(lines))
     
     def _display_provider_info(self):
         """Display information about the current AI provider configuration"""
         provider_info = self.config.get_provider_info()
         available = provider_info["available_providers"]
         
-        print("🤖 AI Provider Configuration:")
-        print(f"  Preferred Provider: {provider_info['preferred_provider'].upper()}")
-        print(f"  Current Model: {provider_info['current_model']}")
-        print(f"  Temperature: {provider_info['current_temperature']}")
-        print(f"  Max Tokens: {provider_info['current_max_tokens']}")
-        
-        print("  Available Providers:")
-        for provider, is_available in available.items():
-            status = "✅" if is_available else "❌"
-            print(f"    {status} {provider.upper()}")
+        lines = [
+            "🤖 AI Provider Configuration:",
+            f"  Preferred Provider: {provider_info['preferred_provider'].upper()}",
+            f"  Current Model: {provider_info['current_model']}",
+            f"  Temperature: {provider_info['current_temperature']}",
+            f"  Max Tokens: {provider_info['current_max_tokens']}",
+            "  Available Providers:",
+        ]
+        lines.extend(
+            f"    {'✅' if is_available else '❌'} {provider.upper()}"
+            for provider, is_available in available.items()
+        )
+        print("\n".join(lines))
     
     def conduct_research(
         self,
@@ -72,7 +159,8 @@ class DeepResearchSystem:
         target_audience: str = "general",
         max_iterations: int = None,
         output_format: str = "markdown",
-        save_results: bool = True
+        save_results: bool = True,
+        extract_fields: bool = True
     ) -> Dict[str, Any]:
         """
         Conduct comprehensive research on a given topic
@@ -84,25 +172,33 @@ class DeepResearchSystem:
             max_iterations: Maximum number of research iterations
             output_format: Output format ("markdown", "pdf", "html", "json")
             save_results: Whether to save results to file
+            extract_fields: Whether to extract findings, recommendations and sources
+                (always done when saving, since reports need them; the summary is
+                always extracted)
             
         Returns:
             Dictionary containing research results
         """
-        print(f"🚀 Starting Deep Research on: {topic}")
-        print(f"📊 Research Depth: {research_depth}")
-        print(f"👥 Target Audience: {target_audience}")
-        print(f"🤖 AI Provider: {self.config.PREFERRED_AI_PROVIDER.upper()}")
+        print(
+            f"🚀 Starting Deep Research on: {topic}\n"
+            f"📊 Research Depth: {research_depth}\n"
+            f"👥 Target Audience: {target_audience}\n"
+            f"🤖 AI Provider: {self.config.PREFERRED_AI_PROVIDER.upper()}"
+        )
         
         start_time = time.time()
         
         try:
+            from crewai import Crew, Process
+            from deep_research_system.agents.research_agents import ResearchTeam
+            
             # Create research team
             research_team = ResearchTeam(topic, research_depth)
             agents = research_team.get_agents()
             
-            print(f"👨‍💼 Research Team Created: {len(agents)} agents")
-            for role in research_team.get_agent_roles():
-                print(f"  - {role}")
+            lines = [f"👨‍💼 Research Team Created: {len(agents)} agents"]
+            lines.extend(f"  - {role}" for role in research_team.get_agent_roles())
+            print("\n".join(lines))
             
             # Create tasks
             tasks = self._create_research_tasks(
@@ -122,22 +218,27 @@ class DeepResearchSystem:
             
             # Process and format results
             research_results = self._process_results(
-                result, topic, research_depth, target_audience, start_time
+                result, topic, research_depth, target_audience, start_time,
+                extract_fields=extract_fields or save_results
             )
             
             # Save results if requested
             if save_results:
-                self._save_results(research_results, output_format)
+                # Drop finished saves so callers that never wait don't accumulate futures
+                self._pending_saves = [future for future in self._pending_saves if not future.done()]
+                self._pending_saves.append(
+                    self._io_pool.submit(self._save_results, research_results, output_format)
+                )
             
-            # Add to history
-            self.research_history.append({
-                "topic": topic,
-                "timestamp": datetime.now().isoformat(),
-                "results": research_results
-            })
+            # Add to history without the raw crew output object
+            self.research_history.append(
+                {key: value for key, value in research_results.items() if key != "results"}
+            )
             
-            print(f"✅ Research Completed Successfully!")
-            print(f"⏱️  Total Time: {time.time() - start_time:.2f} seconds")
+            print(
+                "✅ Research Completed Successfully!\n"
+                f"⏱️  Total Time: {time.time() - start_time:.2f} seconds"
+            )
             
             return research_results
             
@@ -147,12 +248,14 @@ class DeepResearchSystem:
     
     def _create_research_tasks(
         self,
-        research_team: ResearchTeam,
+        research_team: "ResearchTeam",
         topic: str,
         research_depth: str,
         target_audience: str
     ) -> List:
         """Create the sequence of research tasks"""
+        from deep_research_system.tasks.research_tasks import ResearchTaskFactory
+        
         tasks = []
         
         # Get agents
@@ -182,16 +285,19 @@ class DeepResearchSystem:
             )
             tasks.append(deep_dive_task)
         
+        # Tasks 4 and 5 both work from the research output and not from each
+        # other, so they run concurrently; the report task waits for both.
+        
         # Task 4: Data Analysis
         analysis_task = ResearchTaskFactory.create_data_analysis_task(
-            analyst_agent, "Research findings from previous tasks"
+            analyst_agent, "Research findings from previous tasks", async_execution=True
         )
         tasks.append(analysis_task)
         
         # Task 5: Content Editing
         editing_task = ResearchTaskFactory.create_content_editing_task(
             editor_agent, "Research content from previous tasks", 
-            "Quality criteria from planning phase"
+            "Quality criteria from planning phase", async_execution=True
         )
         tasks.append(editing_task)
         
@@ -217,23 +323,28 @@ class DeepResearchSystem:
         topic: str,
         research_depth: str,
         target_audience: str,
-        start_time: float
+        start_time: float,
+        extract_fields: bool = True
     ) -> Dict[str, Any]:
         """Process and structure the research results"""
-        return {
+        finished_at = time.time()
+        processed = {
             "topic": topic,
             "research_depth": research_depth,
             "target_audience": target_audience,
             "ai_provider": self.config.PREFERRED_AI_PROVIDER,
-            "ai_model": self.config.get_agent_config("manager")["model"],
-            "timestamp": datetime.now().isoformat(),
-            "execution_time": time.time() - start_time,
+            "ai_model": self._manager_model,
+            "timestamp": datetime.fromtimestamp(finished_at).isoformat(),
+            "execution_time": finished_at - start_time,
             "results": crew_result,
-            "summary": self._extract_summary(crew_result),
-            "key_findings": self._extract_key_findings(crew_result),
-            "recommendations": self._extract_recommendations(crew_result),
-            "sources": self._extract_sources(crew_result)
+            # Always kept, since history entries drop the raw crew output
+            "summary": self._extract_summary(crew_result)
         }
+        if extract_fields:
+            processed["key_findings"] = self._extract_key_findings(crew_result)
+            processed["recommendations"] = self._extract_recommendations(crew_result)
+            processed["sources"] = self._extract_sources(crew_result)
+        return processed
     
     def _extract_summary(self, result: Any) -> str:
         """Extract executive summary from results"""
@@ -256,31 +367,46 @@ class DeepResearchSystem:
         # This would need to be implemented based on the actual result structure
         return [{"title": "Source", "url": "URL", "type": "web"}]
     
-    def _save_results(self, results: Dict[str, Any], output_format: str):
-        """Save research results to file"""
+    def _save_results(self, results: Dict[str, Any], output_format: str) -> Optional[Path]:
+        """Save research results to file, returning the path written (None if nothing was saved)"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        topic_safe = "".join(c for c in results["topic"] if c.isalnum() or c in (' ', '-', '_')).rstrip()
-        topic_safe = topic_safe.replace(' ', '_')
+        topic_safe = _UNSAFE_FILENAME_RE.sub("", results["topic"]).rstrip().replace(' ', '_')
         
-        # Create output directory
-        os.makedirs("research_outputs", exist_ok=True)
+        formatter = self._FORMATTERS.get(output_format)
+        if formatter is None:
+            print(f"⚠️ Unsupported output format: {output_format}")
+            return None
+        extension, render = formatter
         
-        filename = f"research_outputs/{topic_safe}_{timestamp}"
-        
-        if output_format == "json":
-            with open(f"{filename}.json", "w") as f:
-                json.dump(results, f, indent=2)
-        elif output_format == "markdown":
-            with open(f"{filename}.md", "w") as f:
-                f.write(self._format_markdown(results))
-        elif output_format == "html":
-            with open(f"{filename}.html", "w") as f:
-                f.write(self._format_html(results))
+        # Reported here in the worker, so callers of wait_for_saves() see it before they carry on
+        try:
+            # Create output directory once per instance
+            if not self._output_dir_created:
+                self._OUTPUT_ROOT.mkdir(parents=True, exist_ok=True)
+                self._output_dir_created = True
+            
+            path = self._OUTPUT_ROOT / f"{topic_safe}_{timestamp}{extension}"
+            path.write_text(render(self, results))
+        except Exception as e:
+            print(f"❌ Failed to save results: {e}")
+            return None
         
-        print(f"💾 Results saved to: {filename}.{output_format}")
+        print(f"💾 Results saved to: {path}")
+        return path
+    
+    def wait_for_saves(self) -> List[Path]:
+        """Wait for outstanding background result saves and return the paths they wrote"""
+        pending, self._pending_saves = self._pending_saves, []
+        return [path for path in (future.result() for future in pending) if path is not None]
     
     def _format_markdown(self, results: Dict[str, Any]) -> str:
         """Format results as markdown"""
+        findings = "".join(f"- {finding}\n" for finding in results['key_findings'])
+        recommendations = "".join(f"- {rec}\n" for rec in results['recommendations'])
+        sources = "".join(
+            f"- [{source['title']}]({source['url']}) ({source['type']})\n"
+            for source in results['sources']
+        )
         md = f"""# Deep Research Report: {results['topic']}
 
 ## Executive Summary
@@ -296,93 +422,65 @@ class DeepResearchSystem:
 - **Execution Time**: {results['execution_time']:.2f} seconds
 
 ## Key Findings
-"""
-        for finding in results['key_findings']:
-            md += f"- {finding}\n"
-        
-        md += "\n## Recommendations\n"
-        for rec in results['recommendations']:
-            md += f"- {rec}\n"
-        
-        md += "\n## Sources\n"
-        for source in results['sources']:
-            md += f"- [{source['title']}]({source['url']}) ({source['type']})\n"
+{findings}
+## Recommendations
+{recommendations}
+## Sources
+{sources}"""
         
         return md
     
     def _format_html(self, results: Dict[str, Any]) -> str:
         """Format results as HTML"""
-        html = f"""<!DOCTYPE html>
-<html>
-<head>
-    <title>Deep Research Report: {results['topic']}</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 40px; }}
-        h1 {{ color: #2c3e50; }}
-        h2 {{ color: #34495e; margin-top: 30px; }}
-        .summary {{ background-color: #f8f9fa; padding: 20px; border-radius: 5px; }}
-        .details {{ background-color: #e8f4f8; padding: 15px; border-radius: 5px; margin: 20px 0; }}
-        ul {{ line-height: 1.6; }}
-    </style>
-</head>
-<body>
-    <h1>Deep Research Report: {results['topic']}</h1>
-    
-    <h2>Executive Summary</h2>
-    <div class="summary">{results['summary']}</div>
-    
-    <h2>Research Details</h2>
-    <div class="details">
-        <p><strong>Topic:</strong> {results['topic']}</p>
-        <p><strong>Research Depth:</strong> {results['research_depth']}</p>
-        <p><strong>Target Audience:</strong> {results['target_audience']}</p>
-        <p><strong>AI Provider:</strong> {results['ai_provider'].upper()}</p>
-        <p><strong>AI Model:</strong> {results['ai_model']}</p>
-        <p><strong>Timestamp:</strong> {results['timestamp']}</p>
-        <p><strong>Execution Time:</strong> {results['execution_time']:.2f} seconds</p>
-    </div>
-    
-    <h2>Key Findings</h2>
-    <ul>
-"""
-        for finding in results['key_findings']:
-            html += f"        <li>{finding}</li>\n"
-        
-        html += """    </ul>
-    
-    <h2>Recommendations</h2>
-    <ul>
-"""
-        for rec in results['recommendations']:
-            html += f"        <li>{rec}</li>\n"
-        
-        html += """    </ul>
-    
-    <h2>Sources</h2>
-    <ul>
-"""
-        for source in results['sources']:
-            html += f'        <li><a href="{source["url"]}">{source["title"]}</a> ({source["type"]})</li>\n'
-        
-        html += """    </ul>
-</body>
-</html>"""
+        findings = "".join(f"        <li>{finding}</li>\n" for finding in results['key_findings'])
+        recommendations = "".join(f"        <li>{rec}</li>\n" for rec in results['recommendations'])
+        sources = "".join(
+            f'        <li><a href="{source["url"]}">{source["title"]}</a> ({source["type"]})</li>\n'
+            for source in results['sources']
+        )
+        html = _HTML_TEMPLATE.format(
+            topic=results['topic'],
+            summary=results['summary'],
+            research_depth=results['research_depth'],
+            target_audience=results['target_audience'],
+            ai_provider=results['ai_provider'].upper(),
+            ai_model=results['ai_model'],
+            timestamp=results['timestamp'],
+            execution_time=results['execution_time'],
+            findings=findings,
+            recommendations=recommendations,
+            sources=sources
+        )
         
         return html
     
     def get_research_history(self) -> List[Dict[str, Any]]:
         """Get research history"""
-        return self.research_history
+        # Entries are stored once; topic and timestamp are read from the results
+        return [
+            {"topic": entry["topic"], "timestamp": entry["timestamp"], "results": entry}
+            for entry in self.research_history
+        ]
     
     def export_research_history(self, filename: str = "research_history.json"):
         """Export research history to file"""
         with open(filename, "w") as f:
-            json.dump(self.research_history, f, indent=2)
+            f.write(_dump_json(self.get_research_history()))
         print(f"📚 Research history exported to: {filename}")
     
-    def get_provider_info(self) -> Dict[str, Any]:
+    def get_provider_info(self) -> Mapping[str, Any]:
         """Get current AI provider information"""
         return self.config.get_provider_info()
+    
+    def close(self):
+        """Wait for pending result saves to finish"""
+        self._io_pool.shutdown(wait=True)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
 # Export the main class
 __all__ = ["DeepResearchSystem"] 
\ No newline at end of file
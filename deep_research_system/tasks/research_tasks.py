@@ -1,18 +1,15 @@
 """
 Research tasks for the Deep Research System
 """
+from functools import lru_cache
 from crewai import Task
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional
 from deep_research_system.config import Config
 
-class ResearchTaskFactory:
-    """Factory for creating research tasks"""
-    
-    @staticmethod
-    def create_planning_task(manager_agent, topic: str, research_depth: str = "comprehensive") -> Task:
-        """Create the initial planning task"""
-        return Task(
-            description=f"""
+# Task description templates; descriptions are rendered once per distinct set
+# of inputs so reruns send byte-identical prompts
+_DESCRIPTION_TEMPLATES = {
+    "planning": """
             As the Research Project Manager, your first task is to create a comprehensive research plan for the topic: "{topic}"
             
             Research Depth: {research_depth}
@@ -31,16 +28,7 @@ class ResearchTaskFactory:
             
             Output your plan in a structured format that can be easily shared with the research team.
             """,
-            agent=manager_agent,
-            expected_output="A comprehensive research plan with objectives, questions, methodology, timeline, and quality criteria",
-            context=[f"Research topic: {topic}", f"Research depth: {research_depth}"]
-        )
-    
-    @staticmethod
-    def create_initial_research_task(researcher_agent, topic: str, research_plan: str) -> Task:
-        """Create the initial research task"""
-        return Task(
-            description=f"""
+    "initial_research": """
             As the Primary Research Specialist, conduct comprehensive initial research on the topic: "{topic}"
             
             Use the research plan provided to guide your investigation:
@@ -70,18 +58,7 @@ class ResearchTaskFactory:
             - Emerging trends and patterns
             - Recommendations for further investigation
             """,
-            agent=researcher_agent,
-            expected_output="Comprehensive research findings with sources, insights, gaps, and recommendations",
-            context=[f"Research topic: {topic}", f"Research plan: {research_plan}"]
-        )
-    
-    @staticmethod
-    def create_deep_dive_task(researcher_agent, topic: str, initial_findings: str, specific_areas: List[str]) -> Task:
-        """Create deep dive research tasks for specific areas"""
-        areas_text = "\n".join([f"- {area}" for area in specific_areas])
-        
-        return Task(
-            description=f"""
+    "deep_dive": """
             As the Primary Research Specialist, conduct deep-dive research on specific areas identified from the initial research.
             
             Topic: {topic}
@@ -113,16 +90,7 @@ class ResearchTaskFactory:
             - Implications and conclusions
             - Recommendations for further research
             """,
-            agent=researcher_agent,
-            expected_output="Detailed research findings for each focus area with analysis, evidence, and recommendations",
-            context=[f"Research topic: {topic}", f"Initial findings: {initial_findings}", f"Focus areas: {specific_areas}"]
-        )
-    
-    @staticmethod
-    def create_data_analysis_task(analyst_agent, research_data: str) -> Task:
-        """Create data analysis task"""
-        return Task(
-            description=f"""
+    "data_analysis": """
             As the Data Analysis Specialist, analyze the research data and findings to extract meaningful insights.
             
             Research Data:
@@ -151,16 +119,7 @@ class ResearchTaskFactory:
             - Insights and implications
             - Recommendations based on analysis
             """,
-            agent=analyst_agent,
-            expected_output="Comprehensive data analysis with patterns, statistics, visualizations, and insights",
-            context=[f"Research data: {research_data}"]
-        )
-    
-    @staticmethod
-    def create_content_editing_task(editor_agent, research_content: str, quality_criteria: str) -> Task:
-        """Create content editing task"""
-        return Task(
-            description=f"""
+    "content_editing": """
             As the Content Editor and Quality Assurance Specialist, review and enhance the research content for quality, clarity, and professionalism.
             
             Research Content:
@@ -188,16 +147,7 @@ class ResearchTaskFactory:
             
             Provide an enhanced version of the research content that meets or exceeds the quality criteria.
             """,
-            agent=editor_agent,
-            expected_output="Enhanced research content that meets quality criteria with improved clarity, structure, and professionalism",
-            context=[f"Research content: {research_content}", f"Quality criteria: {quality_criteria}"]
-        )
-    
-    @staticmethod
-    def create_report_generation_task(reporter_agent, research_findings: str, analysis_results: str, target_audience: str = "general") -> Task:
-        """Create report generation task"""
-        return Task(
-            description=f"""
+    "report_generation": """
             As the Research Report Generator, synthesize all research findings and analysis into a comprehensive, well-structured report.
             
             Research Findings:
@@ -229,16 +179,7 @@ class ResearchTaskFactory:
             
             The report should be comprehensive yet accessible, providing valuable insights for decision-making and further research.
             """,
-            agent=reporter_agent,
-            expected_output="Comprehensive research report with executive summary, findings, analysis, conclusions, and recommendations",
-            context=[f"Research findings: {research_findings}", f"Analysis results: {analysis_results}", f"Target audience: {target_audience}"]
-        )
-    
-    @staticmethod
-    def create_final_review_task(manager_agent, final_report: str, original_objectives: str) -> Task:
-        """Create final review task"""
-        return Task(
-            description=f"""
+    "final_review": """
             As the Research Project Manager, conduct a final comprehensive review of the research report to ensure it meets all objectives and quality standards.
             
             Final Report:
@@ -266,6 +207,120 @@ class ResearchTaskFactory:
             
             If the report meets all criteria, approve it for final delivery. If not, provide specific guidance for improvements.
             """,
+}
+
+@lru_cache(maxsize=256)
+def _build_description(kind: str, **fields: str) -> str:
+    """Render the description for a task kind"""
+    return _DESCRIPTION_TEMPLATES[kind].format(**fields)
+
+class ResearchTaskFactory:
+    """Factory for creating research tasks"""
+    
+    @staticmethod
+    def create_planning_task(manager_agent, topic: str, research_depth: str = "comprehensive") -> Task:
+        """Create the initial planning task"""
+        return Task(
+            description=_build_description(
+                "planning", topic=topic, research_depth=research_depth
+            ),
+            agent=manager_agent,
+            expected_output="A comprehensive research plan with objectives, questions, methodology, timeline, and quality criteria",
+            context=[f"Research topic: {topic}", f"Research depth: {research_depth}"]
+        )
+    
+    @staticmethod
+    def create_initial_research_task(researcher_agent, topic: str, research_plan: str) -> Task:
+        """Create the initial research task"""
+        return Task(
+            description=_build_description(
+                "initial_research", topic=topic, research_plan=research_plan
+            ),
+            agent=researcher_agent,
+            expected_output="Comprehensive research findings with sources, insights, gaps, and recommendations",
+            context=[f"Research topic: {topic}", f"Research plan: {research_plan}"]
+        )
+    
+    @staticmethod
+    def create_deep_dive_task(researcher_agent, topic: str, initial_findings: str, specific_areas: List[str], async_execution: bool = False) -> Task:
+        """Create deep dive research tasks for specific areas"""
+        areas_text = "\n".join([f"- {area}" for area in specific_areas])
+        
+        return Task(
+            description=_build_description(
+                "deep_dive", topic=topic, initial_findings=initial_findings, areas_text=areas_text
+            ),
+            agent=researcher_agent,
+            expected_output="Detailed research findings for each focus area with analysis, evidence, and recommendations",
+            context=[f"Research topic: {topic}", f"Initial findings: {initial_findings}", f"Focus areas: {specific_areas}"],
+            async_execution=async_execution
+        )
+    
+    @staticmethod
+    def create_deep_dive_tasks(researcher_factory: Callable[[], Any], topic: str, initial_findings: str, specific_areas: List[str], max_parallel: Optional[int] = None) -> List[Task]:
+        """Create independent deep dive tasks that run concurrently, one per group of focus areas
+        
+        Each task gets its own agent from researcher_factory, since crewai agents keep
+        per-task executor state. The next task in the crew must be synchronous so it
+        waits for every deep dive.
+        """
+        groups = max(1, min(len(specific_areas), max_parallel or Config.MAX_PARALLEL_AGENTS))
+        if groups == 1:
+            return [ResearchTaskFactory.create_deep_dive_task(researcher_factory(), topic, initial_findings, specific_areas)]
+        
+        # Areas are dealt round-robin so at most `groups` deep dives are in flight
+        return [
+            ResearchTaskFactory.create_deep_dive_task(
+                researcher_factory(), topic, initial_findings, specific_areas[i::groups], async_execution=True
+            )
+            for i in range(groups)
+        ]
+    
+    @staticmethod
+    def create_data_analysis_task(analyst_agent, research_data: str, async_execution: bool = False) -> Task:
+        """Create data analysis task"""
+        return Task(
+            description=_build_description(
+                "data_analysis", research_data=research_data
+            ),
+            agent=analyst_agent,
+            expected_output="Comprehensive data analysis with patterns, statistics, visualizations, and insights",
+            context=[f"Research data: {research_data}"],
+            async_execution=async_execution
+        )
+    
+    @staticmethod
+    def create_content_editing_task(editor_agent, research_content: str, quality_criteria: str, async_execution: bool = False) -> Task:
+        """Create content editing task"""
+        return Task(
+            description=_build_description(
+                "content_editing", research_content=research_content, quality_criteria=quality_criteria
+            ),
+            agent=editor_agent,
+            expected_output="Enhanced research content that meets quality criteria with improved clarity, structure, and professionalism",
+            context=[f"Research content: {research_content}", f"Quality criteria: {quality_criteria}"],
+            async_execution=async_execution
+        )
+    
+    @staticmethod
+    def create_report_generation_task(reporter_agent, research_findings: str, analysis_results: str, target_audience: str = "general") -> Task:
+        """Create report generation task"""
+        return Task(
+            description=_build_description(
+                "report_generation", research_findings=research_findings, analysis_results=analysis_results, target_audience=target_audience
+            ),
+            agent=reporter_agent,
+            expected_output="Comprehensive research report with executive summary, findings, analysis, conclusions, and recommendations",
+            context=[f"Research findings: {research_findings}", f"Analysis results: {analysis_results}", f"Target audience: {target_audience}"]
+        )
+    
+    @staticmethod
+    def create_final_review_task(manager_agent, final_report: str, original_objectives: str) -> Task:
+        """Create final review task"""
+        return Task(
+            description=_build_description(
+                "final_review", final_report=final_report, original_objectives=original_objectives
+            ),
             agent=manager_agent,
             expected_output="Final review assessment with quality rating, objective achievement, and approval/revision recommendations",
             context=[f"Final report: {final_report}", f"Original objectives: {original_objectives}"]
@@ -3,38 +3,114 @@ Analysis tools for data processing and visualization
 """
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from langchain.tools import BaseTool
 from pydantic import BaseModel, Field
+from deep_research_system.config import Config
 import json
 import re
 from collections import Counter
+from functools import cached_property, lru_cache
+from itertools import islice
 import nltk
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.corpus import stopwords
+from nltk.corpus import stopwords, wordnet
 from nltk.stem import WordNetLemmatizer
+from nltk.sentiment import SentimentIntensityAnalyzer
 import warnings
 warnings.filterwarnings('ignore')
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+# NLTK data required by the analysis tools
+_NLTK_RESOURCES = (
+    ('corpora/stopwords', 'stopwords'),
+    ('corpora/wordnet', 'wordnet'),
+    ('sentiment/vader_lexicon.zip', 'vader_lexicon'),
+)
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+@lru_cache(maxsize=None)
+def _ensure_nltk():
+    """Download any missing NLTK data (once per process)"""
+    for path, package in _NLTK_RESOURCES:
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            nltk.download(package)
+
+_ensure_nltk()
+
+# Shared NLTK resources, loaded once instead of per call
+_STOPWORDS = frozenset(stopwords.words('english'))
+_LEMMATIZER = WordNetLemmatizer()
+_SENTIMENT_ANALYZER = SentimentIntensityAnalyzer()
+
+@lru_cache(maxsize=200_000)
+def _lemma(word: str) -> str:
+    """Memoized WordNet lemmatization"""
+    return _LEMMATIZER.lemmatize(word)
+
+# WordNet otherwise loads lazily on the first lemmatization in each worker
+if Config.PRELOAD_NLTK:
+    wordnet.ensure_loaded()
+
+# Word tokenizer for text statistics
+_WORD_RE = re.compile(r"[A-Za-z']+")
+
+# Sentence boundaries: whitespace following terminal punctuation
+_SENT_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+# Keyword candidates: alphanumeric runs of at least three characters
+_KEYWORD_RE = re.compile(r"[^\W_]{3,}")
+
+class TextBundle:
+    """Tokenizations of one text, computed on first use and shared across analyses"""
+    
+    def __init__(self, text: str):
+        self.text = text
+    
+    @cached_property
+    def sentiment_scores(self) -> Dict[str, float]:
+        return _SENTIMENT_ANALYZER.polarity_scores(self.text)
+    
+    @cached_property
+    def keyword_freq(self) -> Counter:
+        # Filter and lemmatize each distinct token once, merging counts per lemma
+        word_freq = Counter()
+        for word, count in Counter(_KEYWORD_RE.findall(self.text.lower())).items():
+            if word not in _STOPWORDS:
+                word_freq[_lemma(word)] += count
+        return word_freq
+    
+    @cached_property
+    def words(self) -> List[str]:
+        return _WORD_RE.findall(self.text)
+    
+    @cached_property
+    def sentence_count(self) -> int:
+        stripped = self.text.strip()
+        return sum(1 for _ in _SENT_SPLIT.finditer(stripped)) + 1 if stripped else 0
 
-try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet')
+@lru_cache(maxsize=16)
+def _text_bundle(text: str) -> TextBundle:
+    """Get the shared bundle for a text, so repeated tool calls on the same content reuse it"""
+    return TextBundle(text)
+
+@lru_cache(maxsize=None)
+def _plotly_express():
+    """Import plotly.express on first chart render"""
+    import plotly.express as px
+    return px
+
+@lru_cache(maxsize=32)
+def _parse_json_frame(data: str) -> pd.DataFrame:
+    """Parse JSON data into a DataFrame, reusing the result for repeated payloads"""
+    return pd.DataFrame(json.loads(data))
+
+def _load_dataframe(data: Union[str, Dict[str, Any], pd.DataFrame]) -> pd.DataFrame:
+    """Get a DataFrame from JSON text, a mapping, or an existing DataFrame (treat as read-only)"""
+    if isinstance(data, str):
+        return _parse_json_frame(data)
+    if isinstance(data, dict):
+        return pd.DataFrame(data)
+    return data
 
 class TextAnalysisTool(BaseTool):
     """Tool for analyzing text content"""
@@ -63,50 +139,29 @@ class TextAnalysisTool(BaseTool):
         return results
     
     def _analyze_sentiment(self, text: str) -> Dict[str, Any]:
-        """Basic sentiment analysis"""
-        # Simple rule-based sentiment analysis
-        positive_words = ['good', 'great', 'excellent', 'amazing', 'wonderful', 'positive', 'beneficial', 'successful']
-        negative_words = ['bad', 'terrible', 'awful', 'negative', 'harmful', 'failed', 'problem', 'issue']
-        
-        words = word_tokenize(text.lower())
-        positive_count = sum(1 for word in words if word in positive_words)
-        negative_count = sum(1 for word in words if word in negative_words)
+        """Sentiment analysis using the VADER lexicon"""
+        scores = _text_bundle(text).sentiment_scores
+        compound = scores["compound"]
         
-        total_words = len(words)
-        if total_words == 0:
-            return {"sentiment": "neutral", "score": 0.0}
-        
-        sentiment_score = (positive_count - negative_count) / total_words
-        
-        if sentiment_score > 0.1:
+        if compound > 0.05:
             sentiment = "positive"
-        elif sentiment_score < -0.1:
+        elif compound < -0.05:
             sentiment = "negative"
         else:
             sentiment = "neutral"
         
         return {
             "sentiment": sentiment,
-            "score": sentiment_score,
-            "positive_words": positive_count,
-            "negative_words": negative_count
+            "score": compound,
+            "positive": scores["pos"],
+            "negative": scores["neg"],
+            "neutral": scores["neu"]
         }
     
     def _extract_keywords(self, text: str, top_n: int = 10) -> List[Dict[str, Any]]:
         """Extract keywords from text"""
-        # Tokenize and clean text
-        words = word_tokenize(text.lower())
-        stop_words = set(stopwords.words('english'))
-        lemmatizer = WordNetLemmatizer()
-        
-        # Filter and lemmatize words
-        filtered_words = [
-            lemmatizer.lemmatize(word) for word in words 
-            if word.isalnum() and word not in stop_words and len(word) > 2
-        ]
-        
-        # Count word frequencies
-        word_freq = Counter(filtered_words)
+        word_freq = _text_bundle(text).keyword_freq
+        total = sum(word_freq.values())
         
         # Return top keywords
         keywords = []
@@ -114,33 +169,34 @@ class TextAnalysisTool(BaseTool):
             keywords.append({
                 "word": word,
                 "frequency": freq,
-                "percentage": (freq / len(filtered_words)) * 100
+                "percentage": (freq / total) * 100
             })
         
         return keywords
     
     def _generate_summary(self, text: str, max_sentences: int = 3) -> str:
         """Generate a summary of the text"""
-        sentences = sent_tokenize(text)
-        
-        if len(sentences) <= max_sentences:
+        # Simple extractive summarization (first few sentences); only the
+        # prefix up to the last needed boundary is scanned
+        stripped = text.strip()
+        boundary = next(islice(_SENT_SPLIT.finditer(stripped), max_sentences - 1, None), None)
+        if boundary is None:
             return text
-        
-        # Simple extractive summarization (first few sentences)
-        summary_sentences = sentences[:max_sentences]
-        return " ".join(summary_sentences)
+        return stripped[:boundary.start()]
     
     def _text_statistics(self, text: str) -> Dict[str, Any]:
         """Calculate text statistics"""
-        words = word_tokenize(text)
-        sentences = sent_tokenize(text)
+        bundle = _text_bundle(text)
+        words = bundle.words
+        sentence_count = bundle.sentence_count
+        unique_words = len(set(words))
         
         return {
             "word_count": len(words),
-            "sentence_count": len(sentences),
-            "average_sentence_length": len(words) / len(sentences) if sentences else 0,
-            "unique_words": len(set(words)),
-            "lexical_diversity": len(set(words)) / len(words) if words else 0
+            "sentence_count": sentence_count,
+            "average_sentence_length": len(words) / sentence_count if sentence_count else 0,
+            "unique_words": unique_words,
+            "lexical_diversity": unique_words / len(words) if words else 0
         }
 
 class DataVisualizationTool(BaseTool):
@@ -149,22 +205,19 @@ class DataVisualizationTool(BaseTool):
     description = "Create charts and visualizations from data"
     
     class InputSchema(BaseModel):
-        data: str = Field(description="Data in JSON format or pandas DataFrame")
+        data: Union[str, Dict[str, Any]] = Field(description="Data as JSON text or a column-to-values mapping")
         chart_type: str = Field(description="Type of chart: bar, line, scatter, pie, histogram")
         title: str = Field(default="", description="Chart title")
         x_column: str = Field(default="", description="X-axis column name")
         y_column: str = Field(default="", description="Y-axis column name")
     
-    def _run(self, data: str, chart_type: str, title: str = "", x_column: str = "", y_column: str = "") -> Dict[str, Any]:
+    def _run(self, data: Union[str, Dict[str, Any], pd.DataFrame], chart_type: str, title: str = "", x_column: str = "", y_column: str = "") -> Dict[str, Any]:
         try:
             # Parse data
-            if isinstance(data, str):
-                data_dict = json.loads(data)
-                df = pd.DataFrame(data_dict)
-            else:
-                df = data
+            df = _load_dataframe(data)
             
             # Create visualization
+            px = _plotly_express()
             if chart_type == "bar":
                 fig = px.bar(df, x=x_column, y=y_column, title=title)
             elif chart_type == "line":
@@ -178,8 +231,8 @@ class DataVisualizationTool(BaseTool):
             else:
                 raise ValueError(f"Unsupported chart type: {chart_type}")
             
-            # Convert to HTML
-            html_content = fig.to_html(include_plotlyjs=True, full_html=True)
+            # Convert to HTML, loading plotly.js from the CDN instead of inlining the ~3 MB bundle
+            html_content = fig.to_html(include_plotlyjs="cdn", full_html=True)
             
             return {
                 "success": True,
@@ -202,17 +255,13 @@ class StatisticalAnalysisTool(BaseTool):
     description = "Perform statistical analysis on data"
     
     class InputSchema(BaseModel):
-        data: str = Field(description="Data in JSON format or pandas DataFrame")
+        data: Union[str, Dict[str, Any]] = Field(description="Data as JSON text or a column-to-values mapping")
         analysis_type: str = Field(default="descriptive", description="Type of analysis: descriptive, correlation, or regression")
     
-    def _run(self, data: str, analysis_type: str = "descriptive") -> Dict[str, Any]:
+    def _run(self, data: Union[str, Dict[str, Any], pd.DataFrame], analysis_type: str = "descriptive") -> Dict[str, Any]:
         try:
             # Parse data
-            if isinstance(data, str):
-                data_dict = json.loads(data)
-                df = pd.DataFrame(data_dict)
-            else:
-                df = data
+            df = _load_dataframe(data)
             
             results = {}
             
@@ -241,20 +290,30 @@ class StatisticalAnalysisTool(BaseTool):
     
     def _descriptive_statistics(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Calculate descriptive statistics"""
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        numeric_df = df.select_dtypes(include=[np.number])
+        if numeric_df.columns.empty:
+            return {}
+        
+        # NaN-aware column reductions over one contiguous float array
+        values = numeric_df.to_numpy(dtype=np.float64, na_value=np.nan)
+        means = np.nanmean(values, axis=0)
+        medians = np.nanmedian(values, axis=0)
+        stds = np.nanstd(values, axis=0, ddof=1)
+        mins = np.nanmin(values, axis=0)
+        maxs = np.nanmax(values, axis=0)
+        counts = np.count_nonzero(~np.isnan(values), axis=0)
         
-        stats = {}
-        for col in numeric_cols:
-            stats[col] = {
-                "mean": float(df[col].mean()),
-                "median": float(df[col].median()),
-                "std": float(df[col].std()),
-                "min": float(df[col].min()),
-                "max": float(df[col].max()),
-                "count": int(df[col].count())
+        return {
+            col: {
+                "mean": float(means[i]),
+                "median": float(medians[i]),
+                "std": float(stds[i]),
+                "min": float(mins[i]),
+                "max": float(maxs[i]),
+                "count": int(counts[i])
             }
-        
-        return stats
+            for i, col in enumerate(numeric_df.columns)
+        }
     
     def _correlation_analysis(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Calculate correlations between numeric columns"""
@@ -272,19 +331,22 @@ class StatisticalAnalysisTool(BaseTool):
     
     def _find_high_correlations(self, corr_matrix: pd.DataFrame, threshold: float = 0.7) -> List[Dict[str, Any]]:
         """Find high correlations above threshold"""
-        high_corr = []
-        
-        for i in range(len(corr_matrix.columns)):
-            for j in range(i+1, len(corr_matrix.columns)):
-                corr_value = corr_matrix.iloc[i, j]
-                if abs(corr_value) >= threshold:
-                    high_corr.append({
-                        "variable1": corr_matrix.columns[i],
-                        "variable2": corr_matrix.columns[j],
-                        "correlation": float(corr_value)
-                    })
-        
-        return high_corr
+        values = corr_matrix.to_numpy()
+        columns = corr_matrix.columns
+        
+        # Upper triangle (excluding the diagonal), filtered in one pass
+        rows, cols = np.triu_indices(values.shape[0], k=1)
+        pair_values = values[rows, cols]
+        mask = np.abs(pair_values) >= threshold
+        
+        return [
+            {
+                "variable1": columns[i],
+                "variable2": columns[j],
+                "correlation": float(corr_value)
+            }
+            for i, j, corr_value in zip(rows[mask], cols[mask], pair_values[mask])
+        ]
     
     def _regression_analysis(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Perform simple linear regression"""
@@ -303,24 +365,25 @@ class StatisticalAnalysisTool(BaseTool):
         if len(clean_df) < 3:
             return {"error": "Insufficient data for regression analysis"}
         
-        # Calculate regression coefficients
-        x = clean_df[x_col]
-        y = clean_df[y_col]
+        # Calculate regression coefficients on plain arrays
+        x = clean_df[x_col].to_numpy(dtype=np.float64)
+        y = clean_df[y_col].to_numpy(dtype=np.float64)
         
         n = len(x)
         sum_x = x.sum()
         sum_y = y.sum()
-        sum_xy = (x * y).sum()
-        sum_x2 = (x ** 2).sum()
+        sum_xy = np.dot(x, y)
+        sum_x2 = np.dot(x, x)
         
         # Calculate slope and intercept
         slope = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x ** 2)
         intercept = (sum_y - slope * sum_x) / n
         
         # Calculate R-squared
-        y_pred = slope * x + intercept
-        ss_res = ((y - y_pred) ** 2).sum()
-        ss_tot = ((y - y.mean()) ** 2).sum()
+        residuals = y - (slope * x + intercept)
+        deviations = y - y.mean()
+        ss_res = np.dot(residuals, residuals)
+        ss_tot = np.dot(deviations, deviations)
         r_squared = 1 - (ss_res / ss_tot)
         
         return {
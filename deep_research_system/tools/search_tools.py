@@ -1,19 +1,327 @@
 """
 Search tools for comprehensive research data collection
 """
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+import time
+import weakref
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait, TimeoutError as FuturesTimeoutError
+from functools import lru_cache, partial
+from itertools import islice
+from typing import Awaitable, Callable, Iterable, List, Dict, Any, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
 from duckduckgo_search import DDGS
-import wikipedia
-import arxiv
-from scholarly import scholarly
-from bs4 import BeautifulSoup
 from langchain.tools import BaseTool
 from pydantic import BaseModel, Field
 from deep_research_system.config import Config
 
-class SearchResult(BaseModel):
+# orjson is optional; it parses search API responses faster when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# selectolax is optional; its lexbor parser is much faster than BeautifulSoup
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# h2 (from httpx[http2]) is optional; without it the async client falls back to HTTP/1.1
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+# requests-cache is optional; it persists HTTP responses across runs when enabled
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+# Diagnostics go through logging so parallel engine workers do not contend on stdout
+logger = logging.getLogger(__name__)
+
+# The academic backends and BeautifulSoup are slow to import, so load them on first use
+@lru_cache(maxsize=None)
+def _arxiv():
+    """Import arxiv on first academic search"""
+    import arxiv
+    return arxiv
+
+@lru_cache(maxsize=None)
+def _arxiv_client():
+    """One arXiv client reuses its HTTP session and paces requests across searches"""
+    return _arxiv().Client(page_size=25)
+
+@lru_cache(maxsize=None)
+def _scholarly():
+    """Import scholarly on first academic search"""
+    from scholarly import scholarly
+    return scholarly
+
+@lru_cache(maxsize=None)
+def _wikipedia():
+    """Import wikipedia on first academic search"""
+    import wikipedia
+    return wikipedia
+
+@lru_cache(maxsize=None)
+def _beautiful_soup():
+    """Import BeautifulSoup on first fallback parse"""
+    from bs4 import BeautifulSoup
+    return BeautifulSoup
+
+_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+def _build_session() -> requests.Session:
+    """Create the pooled HTTP session shared by the search and extraction tools"""
+    if Config.HTTP_CACHE_ENABLED and requests_cache:
+        session = requests_cache.CachedSession(
+            cache_name=Config.HTTP_CACHE_PATH,
+            backend="sqlite",
+            expire_after=Config.HTTP_CACHE_EXPIRE,
+            allowable_methods=("GET", "POST"),
+            stale_if_error=True,
+            # Keep API credentials out of cache keys and stored responses
+            ignored_parameters=["key", "api-key", "X-API-KEY", "X-Subscription-Token"]
+        )
+    else:
+        if Config.HTTP_CACHE_ENABLED:
+            logger.warning("HTTP_CACHE_ENABLED is set but requests-cache is not installed; HTTP responses will not be cached")
+        session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=50,
+        max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504])
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": _USER_AGENT})
+    return session
+
+# Keep-alive connections are reused across calls to the same search APIs
+_HTTP_SESSION = _build_session()
+
+# Seconds to wait for engines during a parallel (auto) search
+ENGINE_TIMEOUT = 15
+# Seconds an auto search waits on the running engines before starting the next one
+ENGINE_HEDGE_DELAY = 2
+
+# Static parts of the search API requests; only the query and API key vary per call
+_TAVILY_URL = "https://api.tavily.com/search"
+_SERPER_URL = "https://google.serper.dev/search"
+_SERPER_HEADERS = {"Content-Type": "application/json"}
+_GOOGLE_URL = "https://www.googleapis.com/customsearch/v1"
+_BRAVE_URL = "https://api.search.brave.com/res/v1/web/search"
+_BRAVE_HEADERS = {"Accept": "application/json"}
+
+# Pages are only read up to this many bytes; extracted text is truncated far below it
+MAX_PAGE_BYTES = 256 * 1024
+
+# Async clients are bound to the event loop they were first used on
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+def _async_client() -> httpx.AsyncClient:
+    """Get the pooled async HTTP client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            http2=h2 is not None,
+            headers={"User-Agent": _USER_AGENT},
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            timeout=ENGINE_TIMEOUT
+        )
+        _ASYNC_CLIENTS[loop] = client
+    return client
+
+# In-process LRU/TTL cache for repeated searches and page extractions
+_SEARCH_CACHE_LOCK = threading.Lock()
+_search_cache = OrderedDict()
+
+def _search_cache_key(tool: str, *parts: Any) -> str:
+    """Build a compact cache key for a tool call"""
+    raw = "\x1f".join([tool, *map(str, parts)])
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+def _normalize_query(query: str) -> str:
+    """Normalize a query for cache lookups (case and whitespace insensitive)"""
+    return " ".join(query.lower().split())
+
+def _search_cache_get(key: str) -> Optional[Any]:
+    """Return an unexpired cache entry, refreshing its LRU position"""
+    with _SEARCH_CACHE_LOCK:
+        entry = _search_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del _search_cache[key]
+            return None
+        _search_cache.move_to_end(key)
+        return value
+
+def _search_cache_set(key: str, value: Any):
+    """Store a cache entry, evicting the least recently used ones past the size limit"""
+    if Config.SEARCH_CACHE_SIZE <= 0:
+        return
+    with _SEARCH_CACHE_LOCK:
+        _search_cache[key] = (time.monotonic() + Config.SEARCH_CACHE_TTL, value)
+        _search_cache.move_to_end(key)
+        while len(_search_cache) > Config.SEARCH_CACHE_SIZE:
+            _search_cache.popitem(last=False)
+
+# Concurrent identical calls share one in-flight computation instead of each hitting the network
+_INFLIGHT_LOCK = threading.Lock()
+_inflight: Dict[str, Future] = {}
+_ASYNC_INFLIGHT: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]" = weakref.WeakKeyDictionary()
+
+def _cached_call(key: str, compute: Callable[[], Any], cacheable: Callable[[Any], bool] = bool) -> Any:
+    """Return a cached value, join an identical in-flight call, or compute and cache the value"""
+    cached = _search_cache_get(key)
+    if cached is not None:
+        return cached
+    
+    with _INFLIGHT_LOCK:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            # The previous leader may have finished between the cache miss and taking the lock
+            cached = _search_cache_get(key)
+            if cached is not None:
+                return cached
+            future = _inflight[key] = Future()
+    if not leader:
+        return future.result()
+    
+    try:
+        value = compute()
+        if cacheable(value):
+            _search_cache_set(key, value)
+        future.set_result(value)
+        return value
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            _inflight.pop(key, None)
+
+async def _cached_call_async(key: str, compute: Callable[[], Awaitable[Any]], cacheable: Callable[[Any], bool] = bool) -> Any:
+    """Async counterpart of _cached_call; calls are coalesced per event loop"""
+    cached = _search_cache_get(key)
+    if cached is not None:
+        return cached
+    
+    loop = asyncio.get_running_loop()
+    inflight = _ASYNC_INFLIGHT.setdefault(loop, {})
+    future = inflight.get(key)
+    if future is not None:
+        # Shield so a cancelled follower does not cancel the shared call
+        return await asyncio.shield(future)
+    
+    future = inflight[key] = loop.create_future()
+    try:
+        value = await compute()
+        if cacheable(value):
+            _search_cache_set(key, value)
+        future.set_result(value)
+        return value
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Mark the exception as retrieved so a call without followers does not log it again
+        future.exception()
+        raise
+    finally:
+        inflight.pop(key, None)
+
+def clear_search_cache():
+    """Drop all cached search and extraction results"""
+    with _SEARCH_CACHE_LOCK:
+        _search_cache.clear()
+
+# After this many consecutive failures a backend is skipped for CIRCUIT_COOLDOWN seconds
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_COOLDOWN = 60
+
+@dataclass
+class _Circuit:
+    """Consecutive-failure state for one search backend"""
+    failures: int = 0
+    opened_at: float = 0.0
+
+_CIRCUIT_LOCK = threading.Lock()
+_circuits: Dict[str, _Circuit] = {}
+
+def _circuit_open(backend: str) -> bool:
+    """Check whether a backend is cooling down after repeated failures"""
+    with _CIRCUIT_LOCK:
+        circuit = _circuits.get(backend)
+        if circuit is None or circuit.failures < CIRCUIT_FAILURE_THRESHOLD:
+            return False
+        now = time.monotonic()
+        if now - circuit.opened_at < CIRCUIT_COOLDOWN:
+            return True
+        # Cooldown over: let this call through as a trial and keep others waiting
+        circuit.opened_at = now
+        return False
+
+def _record_outcome(backend: str, succeeded: bool):
+    """Reset a backend's circuit on success, or count a failure and open it past the threshold"""
+    with _CIRCUIT_LOCK:
+        if succeeded:
+            _circuits.pop(backend, None)
+            return
+        circuit = _circuits.setdefault(backend, _Circuit())
+        circuit.failures += 1
+        if circuit.failures >= CIRCUIT_FAILURE_THRESHOLD:
+            circuit.opened_at = time.monotonic()
+
+def _guarded(backend: str, search: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a backend call so its outcome feeds the backend's circuit"""
+    def call(*args, **kwargs):
+        try:
+            results = search(*args, **kwargs)
+        except Exception:
+            _record_outcome(backend, False)
+            raise
+        _record_outcome(backend, True)
+        return results
+    return call
+
+def _guarded_async(backend: str, search: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Async counterpart of _guarded"""
+    async def call(*args, **kwargs):
+        try:
+            results = await search(*args, **kwargs)
+        except Exception:
+            _record_outcome(backend, False)
+            raise
+        _record_outcome(backend, True)
+        return results
+    return call
+
+def clear_circuits():
+    """Close all circuits so every backend is tried again"""
+    with _CIRCUIT_LOCK:
+        _circuits.clear()
+
+@dataclass(frozen=True, slots=True)
+class SearchResult:
     """Model for search results"""
     title: str
     url: str
@@ -21,6 +329,50 @@ class SearchResult(BaseModel):
     source: str
     relevance_score: float = 0.0
     content: Optional[str] = None
+    
+    def dict(self) -> Dict[str, Any]:
+        """Plain dict of the result's fields"""
+        return asdict(self)
+
+# Papers are identified by arXiv id or DOI, whichever mirror or engine returned them
+_ARXIV_ID_RE = re.compile(r"arxiv\.org/(?:abs|pdf)/([a-z\-]+(?:\.[a-z]{2})?/\d{7}|\d{4}\.\d{4,5})", re.IGNORECASE)
+_DOI_RE = re.compile(r"\b(10\.\d{4,9}/[^\s?#]+)")
+
+def _result_key(url: str) -> Optional[bytes]:
+    """Hash a result URL so the same page from different engines compares equal"""
+    if not url:
+        return None
+    match = _ARXIV_ID_RE.search(url)
+    if match:
+        canonical = "arxiv:" + match.group(1).lower()
+    else:
+        match = _DOI_RE.search(url)
+        if match:
+            canonical = "doi:" + match.group(1).lower()
+        else:
+            parts = urlsplit(url.strip())
+            host = parts.netloc.lower()
+            if host.startswith("www."):
+                host = host[4:]
+            query = urlencode([
+                (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                if not key.lower().startswith("utm_")
+            ])
+            canonical = f"{host}{parts.path.rstrip('/')}?{query}"
+    return hashlib.blake2b(canonical.encode(), digest_size=16).digest()
+
+def _dedupe_results(results: Iterable[SearchResult]) -> List[SearchResult]:
+    """Drop results whose URL was already seen, keeping the first occurrence"""
+    seen = set()
+    unique = []
+    for result in results:
+        key = _result_key(result.url)
+        if key is not None:
+            if key in seen:
+                continue
+            seen.add(key)
+        unique.append(result)
+    return unique
 
 class WebSearchTool(BaseTool):
     """Tool for web search using multiple engines"""
@@ -33,37 +385,194 @@ class WebSearchTool(BaseTool):
         preferred_engine: str = Field(default="auto", description="Preferred search engine: tavily, serper, google, brave, duckduckgo, or auto")
     
     def _run(self, query: str, max_results: int = 5, preferred_engine: str = "auto") -> List[SearchResult]:
-        results = []
-        
+        cache_key = _search_cache_key(self.name, _normalize_query(query), max_results, preferred_engine)
+        return list(_cached_call(cache_key, lambda: tuple(self._search(query, max_results, preferred_engine))))
+    
+    def _search(self, query: str, max_results: int, preferred_engine: str) -> List[SearchResult]:
+        """Search the configured engines"""
         # Determine search order based on preference and availability
         search_engines = self._get_search_engines(preferred_engine)
         
+        if preferred_engine == "auto":
+            return self._parallel_search(query, max_results, search_engines)
+        
+        results = []
         for engine in search_engines:
             if len(results) >= max_results:
                 break
-                
+            
+            search = self._engine_search(engine)
+            if search is None:
+                continue
             try:
-                if engine == "tavily" and Config.TAVILY_API_KEY:
-                    engine_results = self._tavily_search(query, max_results - len(results))
-                    results.extend(engine_results)
-                elif engine == "serper" and Config.SERPER_API_KEY:
-                    engine_results = self._serper_search(query, max_results - len(results))
-                    results.extend(engine_results)
-                elif engine == "google" and Config.GOOGLE_SEARCH_API_KEY:
-                    engine_results = self._google_search(query, max_results - len(results))
-                    results.extend(engine_results)
-                elif engine == "brave" and Config.BRAVE_API_KEY:
-                    engine_results = self._brave_search(query, max_results - len(results))
-                    results.extend(engine_results)
-                elif engine == "duckduckgo":
-                    engine_results = self._duckduckgo_search(query, max_results - len(results))
-                    results.extend(engine_results)
+                results = _dedupe_results(results + search(query, max_results - len(results)))
             except Exception as e:
-                print(f"{engine.capitalize()} search failed: {e}")
+                logger.warning("%s search failed: %s", engine.capitalize(), e)
                 continue
         
         return results[:max_results]
     
+    def _engine_search(self, engine: str) -> Optional[Callable[[str, int], List[SearchResult]]]:
+        """Get the search method for an engine, or None if it is not configured or cooling down"""
+        search = self._engine_method(engine)
+        if search is None:
+            return None
+        if _circuit_open(engine):
+            logger.warning("Skipping %s search after repeated failures", engine.capitalize())
+            return None
+        return _guarded(engine, search)
+    
+    def _engine_method(self, engine: str) -> Optional[Callable[[str, int], List[SearchResult]]]:
+        """Get the raw search method for an engine, or None if it is not configured"""
+        if engine == "tavily" and Config.TAVILY_API_KEY:
+            return self._tavily_search
+        if engine == "serper" and Config.SERPER_API_KEY:
+            return self._serper_search
+        if engine == "google" and Config.GOOGLE_SEARCH_API_KEY:
+            return self._google_search
+        if engine == "brave" and Config.BRAVE_API_KEY:
+            return self._brave_search
+        if engine == "duckduckgo":
+            return self._duckduckgo_search
+        return None
+    
+    def _parallel_search(self, query: str, max_results: int, search_engines: List[str]) -> List[SearchResult]:
+        """Query engines in priority order, staggered, and merge results in engine priority order
+
+        The next engine starts when a finished one came up short or failed, or when nothing has
+        answered within ENGINE_HEDGE_DELAY seconds; the rest are cancelled once max_results are covered.
+        """
+        configured = ((engine, self._engine_search(engine)) for engine in search_engines)
+        searches = [
+            (priority, engine, search)
+            for priority, (engine, search) in enumerate(item for item in configured if item[1] is not None)
+        ]
+        if not searches:
+            return []
+        
+        candidates = iter(searches)
+        executor = ThreadPoolExecutor(max_workers=len(searches))
+        futures = {}
+        pending = set()
+        
+        def launch():
+            candidate = next(candidates, None)
+            if candidate is not None:
+                priority, engine, search = candidate
+                future = executor.submit(search, query, max_results)
+                futures[future] = (priority, engine)
+                pending.add(future)
+        
+        ranked = []
+        deadline = time.monotonic() + ENGINE_TIMEOUT
+        launch()
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning("Search timed out after %ss; using results received so far", ENGINE_TIMEOUT)
+                    break
+                done, _ = wait(pending, timeout=min(ENGINE_HEDGE_DELAY, remaining), return_when=FIRST_COMPLETED)
+                pending.difference_update(done)
+                for future in done:
+                    priority, engine = futures[future]
+                    try:
+                        ranked.extend((priority, result) for result in future.result())
+                    except Exception as e:
+                        logger.warning("%s search failed: %s", engine.capitalize(), e)
+                if len(self._rank_results(list(ranked), max_results)) >= max_results:
+                    break
+                # Replace each engine that finished short, or hedge with one more if none answered in time
+                for _ in range(len(done) or 1):
+                    launch()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return self._rank_results(ranked, max_results)
+    
+    async def _arun(self, query: str, max_results: int = 5, preferred_engine: str = "auto") -> List[SearchResult]:
+        cache_key = _search_cache_key(self.name, _normalize_query(query), max_results, preferred_engine)
+        
+        async def search():
+            return tuple(await self._asearch(query, max_results, preferred_engine))
+        
+        return list(await _cached_call_async(cache_key, search))
+    
+    async def _asearch(self, query: str, max_results: int, preferred_engine: str) -> List[SearchResult]:
+        """Search the configured engines without blocking the event loop"""
+        search_engines = self._get_search_engines(preferred_engine)
+        searches = [
+            (engine, search)
+            for engine, search in ((engine, self._engine_search_async(engine)) for engine in search_engines)
+            if search is not None
+        ]
+        
+        if preferred_engine != "auto":
+            results = []
+            for engine, search in searches:
+                if len(results) >= max_results:
+                    break
+                try:
+                    results = _dedupe_results(results + await search(query, max_results - len(results)))
+                except Exception as e:
+                    logger.warning("%s search failed: %s", engine.capitalize(), e)
+            return results[:max_results]
+        
+        if not searches:
+            return []
+        
+        # Staggered like _parallel_search: start engines in priority order and stop once enough results arrive
+        candidates = iter(enumerate(searches))
+        tasks = {}
+        
+        def launch():
+            candidate = next(candidates, None)
+            if candidate is not None:
+                priority, (engine, search) = candidate
+                tasks[asyncio.ensure_future(search(query, max_results))] = (priority, engine)
+        
+        ranked = []
+        deadline = time.monotonic() + ENGINE_TIMEOUT
+        launch()
+        try:
+            while pending := [task for task in tasks if not task.done()]:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning("Search timed out after %ss; using results received so far", ENGINE_TIMEOUT)
+                    break
+                done, _ = await asyncio.wait(pending, timeout=min(ENGINE_HEDGE_DELAY, remaining), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    priority, engine = tasks[task]
+                    if task.exception() is not None:
+                        logger.warning("%s search failed: %s", engine.capitalize(), task.exception())
+                        continue
+                    ranked.extend((priority, result) for result in task.result())
+                if len(self._rank_results(list(ranked), max_results)) >= max_results:
+                    break
+                # Replace each engine that finished short, or hedge with one more if none answered in time
+                for _ in range(len(done) or 1):
+                    launch()
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        return self._rank_results(ranked, max_results)
+    
+    def _engine_search_async(self, engine: str) -> Optional[Callable[[str, int], Awaitable[List[SearchResult]]]]:
+        """Get the async search coroutine function for an engine, or None if it is not configured or cooling down"""
+        if self._engine_search(engine) is None:
+            return None
+        if engine == "duckduckgo":
+            # duckduckgo_search is synchronous, so run it in a worker thread
+            return _guarded_async(engine, partial(asyncio.to_thread, self._duckduckgo_search))
+        return _guarded_async(engine, partial(self._api_search_async, engine))
+    
+    @staticmethod
+    def _rank_results(ranked: List[Tuple[int, SearchResult]], max_results: int) -> List[SearchResult]:
+        """Order (engine priority, result) pairs by priority, then relevance, drop duplicates, and truncate"""
+        ranked.sort(key=lambda item: (item[0], -item[1].relevance_score))
+        return _dedupe_results(result for _, result in ranked)[:max_results]
+    
     def _get_search_engines(self, preferred: str) -> List[str]:
         """Get ordered list of search engines to try"""
         if preferred != "auto":
@@ -91,20 +600,18 @@ class WebSearchTool(BaseTool):
         
         return engines
     
-    def _tavily_search(self, query: str, max_results: int) -> List[SearchResult]:
-        """Search using Tavily API"""
-        url = "https://api.tavily.com/search"
+    def _tavily_request(self, query: str, max_results: int) -> Tuple[str, str, Dict[str, Any]]:
+        """Build the Tavily API request"""
         headers = {"api-key": Config.TAVILY_API_KEY}
         params = {
             "query": query,
             "max_results": max_results,
             "search_depth": "advanced"
         }
-        
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        data = response.json()
-        
+        return "GET", _TAVILY_URL, {"headers": headers, "params": params}
+    
+    def _parse_tavily(self, data: Dict[str, Any]) -> List[SearchResult]:
+        """Parse a Tavily API response"""
         results = []
         for item in data.get("results", []):
             results.append(SearchResult(
@@ -117,22 +624,17 @@ class WebSearchTool(BaseTool):
         
         return results
     
-    def _serper_search(self, query: str, max_results: int) -> List[SearchResult]:
-        """Search using Serper.dev API"""
-        url = "https://google.serper.dev/search"
-        headers = {
-            "X-API-KEY": Config.SERPER_API_KEY,
-            "Content-Type": "application/json"
-        }
+    def _serper_request(self, query: str, max_results: int) -> Tuple[str, str, Dict[str, Any]]:
+        """Build the Serper.dev API request"""
+        headers = {**_SERPER_HEADERS, "X-API-KEY": Config.SERPER_API_KEY}
         payload = {
             "q": query,
             "num": max_results
         }
-        
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()
-        data = response.json()
-        
+        return "POST", _SERPER_URL, {"headers": headers, "json": payload}
+    
+    def _parse_serper(self, data: Dict[str, Any]) -> List[SearchResult]:
+        """Parse a Serper.dev API response"""
         results = []
         for item in data.get("organic", []):
             results.append(SearchResult(
@@ -145,20 +647,18 @@ class WebSearchTool(BaseTool):
         
         return results
     
-    def _google_search(self, query: str, max_results: int) -> List[SearchResult]:
-        """Search using Google Custom Search API"""
-        url = "https://www.googleapis.com/customsearch/v1"
+    def _google_request(self, query: str, max_results: int) -> Tuple[str, str, Dict[str, Any]]:
+        """Build the Google Custom Search API request"""
         params = {
             "key": Config.GOOGLE_SEARCH_API_KEY,
             "cx": Config.GOOGLE_SEARCH_ENGINE_ID,
             "q": query,
             "num": min(max_results, 10)  # Google CSE max is 10
         }
-        
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        
+        return "GET", _GOOGLE_URL, {"params": params}
+    
+    def _parse_google(self, data: Dict[str, Any]) -> List[SearchResult]:
+        """Parse a Google Custom Search API response"""
         results = []
         for item in data.get("items", []):
             results.append(SearchResult(
@@ -171,22 +671,17 @@ class WebSearchTool(BaseTool):
         
         return results
     
-    def _brave_search(self, query: str, max_results: int) -> List[SearchResult]:
-        """Search using Brave Search API"""
-        url = "https://api.search.brave.com/res/v1/web/search"
-        headers = {
-            "Accept": "application/json",
-            "X-Subscription-Token": Config.BRAVE_API_KEY
-        }
+    def _brave_request(self, query: str, max_results: int) -> Tuple[str, str, Dict[str, Any]]:
+        """Build the Brave Search API request"""
+        headers = {**_BRAVE_HEADERS, "X-Subscription-Token": Config.BRAVE_API_KEY}
         params = {
             "q": query,
             "count": max_results
         }
-        
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        data = response.json()
-        
+        return "GET", _BRAVE_URL, {"headers": headers, "params": params}
+    
+    def _parse_brave(self, data: Dict[str, Any]) -> List[SearchResult]:
+        """Parse a Brave Search API response"""
         results = []
         for item in data.get("web", {}).get("results", []):
             results.append(SearchResult(
@@ -199,6 +694,42 @@ class WebSearchTool(BaseTool):
         
         return results
     
+    def _api_search(self, engine: str, query: str, max_results: int) -> List[SearchResult]:
+        """Run a search against one of the HTTP search APIs"""
+        build_request, parse = self._api_engine(engine)
+        method, url, kwargs = build_request(query, max_results)
+        response = _HTTP_SESSION.request(method, url, timeout=ENGINE_TIMEOUT, **kwargs)
+        response.raise_for_status()
+        return parse(_response_json(response))
+    
+    async def _api_search_async(self, engine: str, query: str, max_results: int) -> List[SearchResult]:
+        """Run a search against one of the HTTP search APIs without blocking the event loop"""
+        build_request, parse = self._api_engine(engine)
+        method, url, kwargs = build_request(query, max_results)
+        response = await _async_client().request(method, url, **kwargs)
+        response.raise_for_status()
+        return parse(_response_json(response))
+    
+    def _api_engine(self, engine: str):
+        """Get the (request builder, response parser) pair for an HTTP search API"""
+        return getattr(self, f"_{engine}_request"), getattr(self, f"_parse_{engine}")
+    
+    def _tavily_search(self, query: str, max_results: int) -> List[SearchResult]:
+        """Search using Tavily API"""
+        return self._api_search("tavily", query, max_results)
+    
+    def _serper_search(self, query: str, max_results: int) -> List[SearchResult]:
+        """Search using Serper.dev API"""
+        return self._api_search("serper", query, max_results)
+    
+    def _google_search(self, query: str, max_results: int) -> List[SearchResult]:
+        """Search using Google Custom Search API"""
+        return self._api_search("google", query, max_results)
+    
+    def _brave_search(self, query: str, max_results: int) -> List[SearchResult]:
+        """Search using Brave Search API"""
+        return self._api_search("brave", query, max_results)
+    
     def _duckduckgo_search(self, query: str, max_results: int) -> List[SearchResult]:
         """Search using DuckDuckGo"""
         results = []
@@ -224,41 +755,57 @@ class AcademicSearchTool(BaseTool):
         source: str = Field(default="all", description="Source: arxiv, scholarly, wikipedia, or all")
     
     def _run(self, query: str, max_results: int = 5, source: str = "all") -> List[SearchResult]:
-        results = []
-        
-        if source in ["arxiv", "all"]:
-            try:
-                arxiv_results = self._arxiv_search(query, max_results // 2)
-                results.extend(arxiv_results)
-            except Exception as e:
-                print(f"ArXiv search failed: {e}")
+        cache_key = _search_cache_key(self.name, _normalize_query(query), max_results, source)
+        return list(_cached_call(cache_key, lambda: tuple(self._search(query, max_results, source))))
+    
+    def _search(self, query: str, max_results: int, source: str) -> List[SearchResult]:
+        """Search the selected academic backends"""
+        # Backends are independent, so query them concurrently; results keep this order
+        searches = [
+            (name, label, search)
+            for name, label, search in (
+                ("arxiv", "ArXiv", partial(self._arxiv_search, query, max_results // 2)),
+                ("scholarly", "Scholarly", partial(self._scholarly_search, query, max_results // 2)),
+                ("wikipedia", "Wikipedia", partial(self._wikipedia_search, query, max_results // 3)),
+            )
+            if source in [name, "all"]
+        ]
+        searches = [(name, label, _guarded(name, search)) for name, label, search in searches if not _circuit_open(name)]
+        if not searches:
+            return []
         
-        if source in ["scholarly", "all"]:
-            try:
-                scholarly_results = self._scholarly_search(query, max_results // 2)
-                results.extend(scholarly_results)
-            except Exception as e:
-                print(f"Scholarly search failed: {e}")
+        executor = ThreadPoolExecutor(max_workers=len(searches))
+        futures = {executor.submit(search): (name, label) for name, label, search in searches}
+        backend_results = {}
+        try:
+            for future in as_completed(futures, timeout=ENGINE_TIMEOUT):
+                name, label = futures[future]
+                try:
+                    backend_results[name] = future.result()
+                except Exception as e:
+                    logger.warning("%s search failed: %s", label, e)
+        except FuturesTimeoutError:
+            logger.warning("Academic search timed out after %ss; using results received so far", ENGINE_TIMEOUT)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
         
-        if source in ["wikipedia", "all"]:
-            try:
-                wiki_results = self._wikipedia_search(query, max_results // 3)
-                results.extend(wiki_results)
-            except Exception as e:
-                print(f"Wikipedia search failed: {e}")
+        results = []
+        for name, _, _ in searches:
+            results.extend(backend_results.get(name, []))
         
-        return results[:max_results]
+        return _dedupe_results(results)[:max_results]
     
     def _arxiv_search(self, query: str, max_results: int) -> List[SearchResult]:
         """Search arXiv for papers"""
         results = []
+        arxiv = _arxiv()
         search = arxiv.Search(
             query=query,
             max_results=max_results,
             sort_by=arxiv.SortCriterion.Relevance
         )
         
-        for result in search.results():
+        for result in islice(_arxiv_client().results(search), max_results):
             results.append(SearchResult(
                 title=result.title,
                 url=result.entry_id,
@@ -272,7 +819,7 @@ class AcademicSearchTool(BaseTool):
     def _scholarly_search(self, query: str, max_results: int) -> List[SearchResult]:
         """Search Google Scholar"""
         results = []
-        search_query = scholarly.search_pubs(query)
+        search_query = _scholarly().search_pubs(query)
         
         for i, pub in enumerate(search_query):
             if i >= max_results:
@@ -290,26 +837,73 @@ class AcademicSearchTool(BaseTool):
     def _wikipedia_search(self, query: str, max_results: int) -> List[SearchResult]:
         """Search Wikipedia"""
         results = []
-        try:
-            # Search for pages
-            search_results = wikipedia.search(query, results=max_results)
-            
-            for title in search_results:
-                try:
-                    page = wikipedia.page(title, auto_suggest=False)
-                    results.append(SearchResult(
-                        title=page.title,
-                        url=page.url,
-                        snippet=page.summary[:500] + "..." if len(page.summary) > 500 else page.summary,
-                        source="wikipedia",
-                        relevance_score=0.6
-                    ))
-                except:
-                    continue
-        except Exception as e:
-            print(f"Wikipedia search error: {e}")
+        # Search for pages; failures propagate so they count against the backend's circuit
+        search_results = _wikipedia().search(query, results=max_results)
+        if not search_results:
+            return results
+        
+        # Each page is a separate API round-trip, so fetch them concurrently
+        with ThreadPoolExecutor(max_workers=min(len(search_results), 8)) as executor:
+            pages = list(executor.map(self._fetch_wikipedia_page, search_results))
+        
+        for page in pages:
+            if page is None:
+                continue
+            results.append(SearchResult(
+                title=page.title,
+                url=page.url,
+                snippet=page.summary[:500] + "..." if len(page.summary) > 500 else page.summary,
+                source="wikipedia",
+                relevance_score=0.6
+            ))
         
         return results
+    
+    @staticmethod
+    def _fetch_wikipedia_page(title: str):
+        """Fetch a Wikipedia page, or None if it cannot be loaded"""
+        try:
+            return _wikipedia().page(title, auto_suggest=False)
+        except Exception:
+            return None
+
+_WS_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"\S+")
+
+def _parse_html(content: bytes) -> Tuple[str, str]:
+    """Parse an HTML document into its title and readable text"""
+    if LexborHTMLParser:
+        tree = LexborHTMLParser(content)
+        for node in tree.css("script, style, noscript, iframe"):
+            node.decompose()
+        title_node = tree.css_first("title")
+        title = title_node.text(strip=True) if title_node else ""
+        text = tree.body.text(separator=" ", strip=True) if tree.body else ""
+        return title, _WS_RE.sub(" ", text).strip()
+    
+    soup = _beautiful_soup()(content, 'html.parser')
+    
+    # Remove script and style elements
+    for script in soup(["script", "style"]):
+        script.decompose()
+    
+    text = soup.get_text(separator=" ")
+    return (soup.title.string if soup.title else "") or "", _WS_RE.sub(" ", text).strip()
+
+def _response_json(response: Any) -> Any:
+    """Decode a requests or httpx JSON response body, using orjson when available"""
+    if orjson:
+        return orjson.loads(response.content)
+    return response.json()
+
+def _read_capped(response: requests.Response, limit: int) -> bytes:
+    """Read a streamed response body, stopping once `limit` bytes have arrived"""
+    buffer = bytearray()
+    for chunk in response.iter_content(chunk_size=64 * 1024):
+        buffer.extend(chunk)
+        if len(buffer) >= limit:
+            break
+    return bytes(buffer[:limit])
 
 class ContentExtractionTool(BaseTool):
     """Tool for extracting content from URLs"""
@@ -321,24 +915,29 @@ class ContentExtractionTool(BaseTool):
         max_length: int = Field(default=2000, description="Maximum content length")
     
     def _run(self, url: str, max_length: int = 2000) -> Dict[str, Any]:
+        cache_key = _search_cache_key(self.name, url, max_length)
+        extracted = _cached_call(
+            cache_key,
+            lambda: self._extract(url, max_length),
+            cacheable=lambda extracted: extracted["extraction_success"]
+        )
+        return dict(extracted)
+    
+    def batch_run(self, urls: List[str], max_length: int = 2000, concurrency: int = 16) -> List[Dict[str, Any]]:
+        """Extract content from several URLs concurrently, preserving input order"""
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(urls), concurrency)) as executor:
+            return list(executor.map(partial(self._run, max_length=max_length), urls))
+    
+    def _extract(self, url: str, max_length: int) -> Dict[str, Any]:
+        """Download a page and extract its readable text"""
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
+            with _HTTP_SESSION.get(url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                content = _read_capped(response, MAX_PAGE_BYTES)
             
-            # Extract text
-            text = soup.get_text()
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
+            title, text = _parse_html(content)
             
             # Truncate if too long
             if len(text) > max_length:
@@ -346,9 +945,9 @@ class ContentExtractionTool(BaseTool):
             
             return {
                 "url": url,
-                "title": soup.title.string if soup.title else "",
+                "title": title,
                 "content": text,
-                "word_count": len(text.split()),
+                "word_count": sum(1 for _ in _TOKEN_RE.finditer(text)),
                 "extraction_success": True
             }
             
@@ -370,6 +969,8 @@ __all__ = [
     "AcademicSearchTool", 
     "ContentExtractionTool",
     "SearchResult",
+    "clear_search_cache",
+    "clear_circuits",
     "web_search_tool",
     "academic_search_tool",
     "content_extraction_tool"
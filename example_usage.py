@@ -6,8 +6,11 @@ Demonstrates how to use the system programmatically for various research scenari
 
 import os
 import json
+import logging
 from deep_research_system.research_system import DeepResearchSystem
 
+logging.basicConfig(level=logging.INFO)
+
 def example_basic_research():
     """Example of basic research on a simple topic"""
     print("🔍 Example 1: Basic Research")
@@ -4,81 +4,116 @@ Deep Research System - Main Entry Point
 A comprehensive research automation system using Crew AI with multiple specialized agents.
 """
 
-import os
 import sys
 import argparse
+import configargparse
+from dotenv import load_dotenv
 from typing import Dict, Any
-from deep_research_system.research_system import DeepResearchSystem
 
-def main():
-    """Main entry point for the Deep Research System"""
-    parser = argparse.ArgumentParser(
+# Options shared by both subcommands
+_SHARED_OPTIONS = configargparse.ArgParser(add_help=False)
+_SHARED_OPTIONS.add_argument(
+    "--provider",
+    choices=["openai", "anthropic", "google"],
+    type=str.lower,
+    env_var="PREFERRED_AI_PROVIDER",
+    help="AI provider to use (default: from PREFERRED_AI_PROVIDER env var)"
+)
+_SHARED_OPTIONS.add_argument(
+    "--api-keys",
+    help="Path to JSON file containing API keys"
+)
+
+def build_parser() -> configargparse.ArgParser:
+    """Build the command line parser with `research` and `providers` subcommands"""
+    parser = configargparse.ArgParser(
         description="Deep Research System using Crew AI",
         formatter_class=argparse.RawDescriptionHelpFormatter,
+        allow_abbrev=False,
         epilog="""
 Examples:
-  python main.py --topic "artificial intelligence trends 2024"
-  python main.py --topic "climate change impact" --depth expert --audience academic
-  python main.py --topic "blockchain technology" --format html --no-save
-  python main.py --topic "AI in healthcare" --provider anthropic
+  python main.py research --topic "artificial intelligence trends 2024"
+  python main.py research --topic "climate change impact" --depth expert --audience academic
+  python main.py research --topic "blockchain technology" --format html --no-save
+  python main.py research --topic "AI in healthcare" --provider anthropic
+  python main.py providers
         """
     )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    # CLI flags, DR_* environment variables (including .env) and ~/.deepresearch.conf share one parser
+    research = subparsers.add_parser(
+        "research",
+        help="Research a topic and write a report",
+        parents=[_SHARED_OPTIONS],
+        default_config_files=["~/.deepresearch.conf"],
+        auto_env_var_prefix="DR_",
+        ignore_unknown_config_file_keys=True,
+        allow_abbrev=False
+    )
     
-    parser.add_argument(
-        "--topic", 
-        required=False,  # Changed from True to False
+    research.add_argument(
+        "--topic",
+        required=True,
         help="Research topic to investigate"
     )
     
-    parser.add_argument(
+    research.add_argument(
         "--depth",
         choices=["basic", "comprehensive", "expert"],
         default="comprehensive",
         help="Research depth level (default: comprehensive)"
     )
     
-    parser.add_argument(
+    research.add_argument(
         "--audience",
         choices=["general", "academic", "business", "technical"],
         default="general",
         help="Target audience for the report (default: general)"
     )
     
-    parser.add_argument(
+    research.add_argument(
         "--format",
         choices=["markdown", "html", "json"],
         default="markdown",
         help="Output format (default: markdown)"
     )
     
-    parser.add_argument(
-        "--provider",
-        choices=["openai", "anthropic", "google"],
-        help="AI provider to use (default: from PREFERRED_AI_PROVIDER env var)"
-    )
-    
-    parser.add_argument(
+    research.add_argument(
         "--no-save",
         action="store_true",
         help="Don't save results to file"
     )
     
-    parser.add_argument(
-        "--api-keys",
-        help="Path to JSON file containing API keys"
-    )
-    
-    parser.add_argument(
-        "--show-providers",
-        action="store_true",
-        help="Show available AI providers and exit"
+    subparsers.add_parser(
+        "providers",
+        help="Show available AI providers and exit",
+        parents=[_SHARED_OPTIONS],
+        allow_abbrev=False
     )
     
-    args = parser.parse_args()
-    
-    # Check if topic is required but not provided
-    if not args.show_providers and not args.topic:
-        parser.error("--topic is required unless --show-providers is specified")
+    return parser
+
+SEPARATOR = "=" * 60
+
+def _section(title, lines):
+    """Lines of a titled report section"""
+    return [f"\n{SEPARATOR}", title, SEPARATOR, *lines]
+
+def _subcommand_argv(argv):
+    """Map the older flag-only invocations (--topic ..., --show-providers) onto subcommands"""
+    if not argv or argv[0] in ("research", "providers", "-h", "--help"):
+        return argv
+    if "--show-providers" in argv:
+        return ["providers"] + [arg for arg in argv if arg != "--show-providers"]
+    return ["research"] + argv
+
+def main():
+    """Main entry point for the Deep Research System"""
+    # Load .env before parsing so DR_* and PREFERRED_AI_PROVIDER set there reach the parser
+    load_dotenv()
+    parser = build_parser()
+    args = parser.parse_args(_subcommand_argv(sys.argv[1:]))
     
     try:
         # Load API keys if provided
@@ -88,24 +123,27 @@ Examples:
             with open(args.api_keys, 'r') as f:
                 api_keys = json.load(f)
         
-        # Set preferred provider if specified
-        if args.provider:
-            os.environ["PREFERRED_AI_PROVIDER"] = args.provider
+        # Imported only once arguments are valid, so --help and usage errors return immediately
+        from deep_research_system.research_system import DeepResearchSystem
         
         # Initialize the research system
         print("🔧 Initializing Deep Research System...")
-        research_system = DeepResearchSystem(api_keys=api_keys)
+        research_system = DeepResearchSystem(api_keys=api_keys, provider=args.provider)
         
         # Show available providers if requested
-        if args.show_providers:
+        if args.command == "providers":
             provider_info = research_system.get_provider_info()
-            print("\n🤖 Available AI Providers:")
-            print("="*40)
-            for provider, is_available in provider_info["available_providers"].items():
-                status = "✅ Available" if is_available else "❌ Not Available"
-                print(f"  {provider.upper()}: {status}")
-            print(f"\nPreferred Provider: {provider_info['preferred_provider'].upper()}")
-            print(f"Current Model: {provider_info['current_model']}")
+            statuses = [
+                f"  {provider.upper()}: {'✅ Available' if is_available else '❌ Not Available'}"
+                for provider, is_available in provider_info["available_providers"].items()
+            ]
+            print("\n".join([
+                "\n🤖 Available AI Providers:",
+                "=" * 40,
+                *statuses,
+                f"\nPreferred Provider: {provider_info['preferred_provider'].upper()}",
+                f"Current Model: {provider_info['current_model']}"
+            ]))
             return 0
         
         # Conduct research
@@ -117,37 +155,22 @@ Examples:
             save_results=not args.no_save
         )
         
-        # Display results summary
-        print("\n" + "="*60)
-        print("📊 RESEARCH COMPLETED SUCCESSFULLY")
-        print("="*60)
-        print(f"Topic: {results['topic']}")
-        print(f"Research Depth: {results['research_depth']}")
-        print(f"Target Audience: {results['target_audience']}")
-        print(f"AI Provider: {results['ai_provider'].upper()}")
-        print(f"AI Model: {results['ai_model']}")
-        print(f"Execution Time: {results['execution_time']:.2f} seconds")
-        print(f"Timestamp: {results['timestamp']}")
-        
-        if not args.no_save:
-            print(f"\n💾 Results saved to research_outputs/ directory")
-        
-        print("\n" + "="*60)
-        print("📋 EXECUTIVE SUMMARY")
-        print("="*60)
-        print(results['summary'])
-        
-        print("\n" + "="*60)
-        print("🔍 KEY FINDINGS")
-        print("="*60)
-        for i, finding in enumerate(results['key_findings'], 1):
-            print(f"{i}. {finding}")
+        # Display results summary, assembled and written to the console in one go
+        output = _section("📊 RESEARCH COMPLETED SUCCESSFULLY", [
+            f"Topic: {results['topic']}",
+            f"Research Depth: {results['research_depth']}",
+            f"Target Audience: {results['target_audience']}",
+            f"AI Provider: {results['ai_provider'].upper()}",
+            f"AI Model: {results['ai_model']}",
+            f"Execution Time: {results['execution_time']:.2f} seconds",
+            f"Timestamp: {results['timestamp']}"
+        ])
         
-        print("\n" + "="*60)
-        print("💡 RECOMMENDATIONS")
-        print("="*60)
-        for i, rec in enumerate(results['recommendations'], 1):
-            print(f"{i}. {rec}")
+        output += _section("📋 EXECUTIVE SUMMARY", [results['summary']])
+        output += _section("🔍 KEY FINDINGS", (f"{i}. {finding}" for i, finding in enumerate(results['key_findings'], 1)))
+        output += _section("💡 RECOMMENDATIONS", (f"{i}. {rec}" for i, rec in enumerate(results['recommendations'], 1)))
+        print("\n".join(output), flush=True)
+        research_system.wait_for_saves()
         
         return 0
         
@@ -4,21 +4,19 @@ Quick Start Script for Deep Research System
 Run this to test the system with a simple research topic.
 """
 
-import os
 import sys
-from deep_research_system.research_system import DeepResearchSystem
+import configargparse
+from dotenv import load_dotenv
 
 def quick_research():
     """Run a quick research test"""
     print("🚀 Deep Research System - Quick Start")
     print("="*50)
     
-    # Check if any AI provider API key is set
-    openai_key = os.getenv("OPENAI_API_KEY")
-    anthropic_key = os.getenv("ANTHROPIC_API_KEY")
-    google_key = os.getenv("GOOGLE_API_KEY")
+    from deep_research_system.config import Config
     
-    if not any([openai_key, anthropic_key, google_key]):
+    # Check if any AI provider API key is set (environment, .env or keyring)
+    if not any(Config.get_available_providers().values()):
         print("❌ No AI provider API key found!")
         print("Please set at least one of the following API keys:")
         print("1. OpenAI API Key: export OPENAI_API_KEY='your_key'")
@@ -28,6 +26,8 @@ def quick_research():
         return False
     
     try:
+        from deep_research_system.research_system import DeepResearchSystem
+        
         # Initialize the system
         print("🔧 Initializing Deep Research System...")
         research_system = DeepResearchSystem()
@@ -48,21 +48,22 @@ def quick_research():
         )
         
         # Display results
-        print("\n" + "="*50)
-        print("✅ QUICK RESEARCH COMPLETED!")
-        print("="*50)
-        print(f"Topic: {results['topic']}")
-        print(f"AI Provider: {results['ai_provider'].upper()}")
-        print(f"AI Model: {results['ai_model']}")
-        print(f"Execution Time: {results['execution_time']:.2f} seconds")
-        print(f"Research Depth: {results['research_depth']}")
-        
-        print("\n📋 EXECUTIVE SUMMARY:")
-        print("-" * 30)
-        print(results['summary'][:500] + "..." if len(results['summary']) > 500 else results['summary'])
-        
-        print(f"\n💾 Results saved to research_outputs/ directory")
-        print("🎉 System is working correctly!")
+        summary = results['summary']
+        print("\n".join([
+            "\n" + "=" * 50,
+            "✅ QUICK RESEARCH COMPLETED!",
+            "=" * 50,
+            f"Topic: {results['topic']}",
+            f"AI Provider: {results['ai_provider'].upper()}",
+            f"AI Model: {results['ai_model']}",
+            f"Execution Time: {results['execution_time']:.2f} seconds",
+            f"Research Depth: {results['research_depth']}",
+            "\n📋 EXECUTIVE SUMMARY:",
+            "-" * 30,
+            summary[:500] + "..." if len(summary) > 500 else summary,
+            "🎉 System is working correctly!"
+        ]))
+        research_system.wait_for_saves()
         
         return True
         
@@ -79,21 +80,20 @@ def show_providers():
     print("🤖 Available AI Providers:")
     print("="*30)
     
-    openai_key = os.getenv("OPENAI_API_KEY")
-    anthropic_key = os.getenv("ANTHROPIC_API_KEY")
-    google_key = os.getenv("GOOGLE_API_KEY")
+    from deep_research_system.config import Config
     
+    available = Config.get_available_providers()
     providers = {
-        "OpenAI": openai_key,
-        "Anthropic (Claude)": anthropic_key,
-        "Google (Gemini)": google_key
+        "OpenAI": available["openai"],
+        "Anthropic (Claude)": available["anthropic"],
+        "Google (Gemini)": available["google"]
     }
     
-    for provider, key in providers.items():
-        status = "✅ Available" if key else "❌ Not Available"
+    for provider, is_available in providers.items():
+        status = "✅ Available" if is_available else "❌ Not Available"
         print(f"  {provider}: {status}")
     
-    if not any([openai_key, anthropic_key, google_key]):
+    if not any(providers.values()):
         print("\n❌ No AI providers configured!")
         print("Please set at least one API key in your .env file or environment variables.")
     else:
@@ -102,17 +102,24 @@ def show_providers():
 
 def main():
     """Main function"""
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "--help":
-            print("Quick Start Script for Deep Research System")
-            print("\nUsage:")
-            print("  python quick_start.py          # Run quick research test")
-            print("  python quick_start.py --help   # Show this help")
-            print("  python quick_start.py --providers  # Show available AI providers")
-            return
-        elif sys.argv[1] == "--providers":
-            show_providers()
-            return
+    # Load .env before parsing so DR_* options set there reach the parser
+    load_dotenv()
+    parser = configargparse.ArgParser(
+        description="Quick Start Script for Deep Research System",
+        default_config_files=["~/.deepresearch.conf"],
+        auto_env_var_prefix="DR_",
+        ignore_unknown_config_file_keys=True
+    )
+    parser.add_argument(
+        "--providers",
+        action="store_true",
+        help="Show available AI providers and exit"
+    )
+    args = parser.parse_args()
+    
+    if args.providers:
+        show_providers()
+        return
     
     success = quick_research()
     
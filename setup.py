@@ -8,22 +8,49 @@ import os
 import sys
 import subprocess
 import json
+import importlib.util
+import argparse
+import io
+import shutil
 from pathlib import Path
 
+# Import names of the packages the system needs
+REQUIRED_PACKAGES = ["crewai", "langchain", "pandas", "numpy", "matplotlib", "plotly", "requests", "bs4", "nltk"]
+
+# Optional AI provider packages: (import name, display name)
+PROVIDER_PACKAGES = [
+    ("openai", "OpenAI"),
+    ("anthropic", "Anthropic"),
+    ("google.generativeai", "Google Generative AI"),
+]
+
+def is_installed(name):
+    """Check whether a module can be imported without actually importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ModuleNotFoundError:
+        # The parent package of a dotted name is missing
+        return False
+
 def check_python_version():
     """Check if Python version is compatible"""
-    if sys.version_info < (3, 8):
-        print("❌ Python 3.8 or higher is required")
+    if sys.version_info < (3, 10):
+        print("❌ Python 3.10 or higher is required")
         print(f"Current version: {sys.version}")
         return False
     print(f"✅ Python version: {sys.version.split()[0]}")
     return True
 
 def install_dependencies():
-    """Install required dependencies"""
+    """Install required dependencies, using uv when it is available"""
     print("📦 Installing dependencies...")
+    if shutil.which("uv"):
+        # uv resolves and downloads in parallel; target this interpreter so virtualenvs work too
+        command = ["uv", "pip", "install", "--python", sys.executable, "-r", "requirements.txt"]
+    else:
+        command = [sys.executable, "-m", "pip", "install", "--prefer-binary", "--no-input", "-r", "requirements.txt"]
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        subprocess.check_call(command)
         print("✅ Dependencies installed successfully")
         return True
     except subprocess.CalledProcessError as e:
@@ -68,53 +95,120 @@ def create_directories():
     print("✅ Created necessary directories")
 
 def validate_installation():
-    """Validate the installation"""
+    """Validate the installation, returning the DeepResearchSystem class or None"""
     print("🔍 Validating installation...")
     
+    # Probing for the packages is much cheaper than importing them all
+    missing = [name for name in REQUIRED_PACKAGES if not is_installed(name)]
+    if missing:
+        print(f"❌ Missing required packages: {', '.join(missing)}")
+        return None
+    
+    # Test AI provider packages
+    for module_name, display_name in PROVIDER_PACKAGES:
+        if is_installed(module_name):
+            print(f"✅ {display_name} package available")
+        else:
+            print(f"⚠️  {display_name} package not available")
+    
+    print("✅ All required packages found")
+    
     try:
-        # Test imports
-        import crewai
-        import langchain
-        import pandas
-        import numpy
-        import matplotlib
-        import plotly
-        import requests
-        import beautifulsoup4
-        import nltk
-        
-        # Test AI provider imports
-        try:
-            import openai
-            print("✅ OpenAI package imported successfully")
-        except ImportError:
-            print("⚠️  OpenAI package not available")
-        
-        try:
-            import anthropic
-            print("✅ Anthropic package imported successfully")
-        except ImportError:
-            print("⚠️  Anthropic package not available")
-        
-        try:
-            import google.generativeai
-            print("✅ Google Generative AI package imported successfully")
-        except ImportError:
-            print("⚠️  Google Generative AI package not available")
-        
-        print("✅ All required packages imported successfully")
-        
         # Test deep research system import
         from deep_research_system.research_system import DeepResearchSystem
         print("✅ Deep Research System imported successfully")
-        
-        return True
+        return DeepResearchSystem
     except ImportError as e:
         print(f"❌ Import error: {e}")
+        return None
+
+# Keys prompted for during setup: (env var, prompt label, template placeholder)
+API_KEY_PROMPTS = [
+    ("OPENAI_API_KEY", "OpenAI API Key", "your_openai_api_key_here"),
+    ("ANTHROPIC_API_KEY", "Anthropic API Key", "your_anthropic_api_key_here"),
+    ("GOOGLE_API_KEY", "Google API Key", "your_google_api_key_here"),
+    ("TAVILY_API_KEY", "Tavily API Key (optional)", "your_tavily_api_key_here"),
+]
+AI_PROVIDER_KEYS = ["OPENAI_API_KEY", "ANTHROPIC_API_KEY", "GOOGLE_API_KEY"]
+
+def update_env_content(content, updates):
+    """Rewrite KEY=value lines in one pass, keeping comments and appending new keys"""
+    pending = dict(updates)
+    lines = content.splitlines(keepends=True)
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#") or "=" not in stripped:
+            continue
+        key = stripped.split("=", 1)[0].strip()
+        if key in pending:
+            lines[i] = f"{key}={pending.pop(key)}\n"
+    if pending:
+        if lines and not lines[-1].endswith("\n"):
+            lines[-1] += "\n"
+        lines.extend(f"{key}={value}\n" for key, value in pending.items())
+    return "".join(lines)
+
+def store_keys_in_keyring(updates, secrets):
+    """Offer to move entered API keys into the OS keyring, blanking them in the .env updates"""
+    try:
+        import keyring
+    except ImportError:
+        return False
+    
+    choice = input("\nStore API keys in the system keyring instead of .env? (y/N): ").strip().lower()
+    if choice != "y":
+        return False
+    
+    from deep_research_system.config import KEYRING_SERVICE
+    try:
+        for key in secrets:
+            keyring.set_password(KEYRING_SERVICE, key, updates[key])
+    except Exception as e:
+        print(f"⚠️  Could not use the system keyring ({e}); keys will be saved to .env")
         return False
+    
+    for key in secrets:
+        updates[key] = ""
+    print("✅ API keys stored in the system keyring")
+    return True
+
+def prompt_api_keys():
+    """Ask for the API keys and preferred provider, returning (keys, provider)"""
+    try:
+        import questionary
+    except ImportError:
+        questionary = None
+    
+    if questionary:
+        # One form on a single screen, with masked input
+        answers = questionary.form(
+            **{key: questionary.password(f"{label}:") for key, label, _ in API_KEY_PROMPTS},
+            provider=questionary.select(
+                "Preferred AI provider:",
+                choices=["openai", "anthropic", "google"],
+                default="openai"
+            )
+        ).ask()
+        if answers is None:
+            # Cancelled with Ctrl-C
+            return {}, ""
+        provider = answers.pop("provider")
+        return {key: (value or "").strip() for key, value in answers.items()}, provider
+    
+    keys = {key: input(f"{label}: ").strip() for key, label, _ in API_KEY_PROMPTS}
+    
+    # Preferred AI Provider
+    print("\nSelect your preferred AI provider:")
+    print("1. OpenAI (GPT-4)")
+    print("2. Anthropic (Claude)")
+    print("3. Google (Gemini)")
+    
+    provider_choice = input("Enter choice (1-3, default: 1): ").strip()
+    provider = {"2": "anthropic", "3": "google"}.get(provider_choice, "")
+    return keys, provider
 
-def setup_api_keys():
-    """Interactive API key setup"""
+def setup_api_keys(non_interactive=False):
+    """API key setup, prompting for keys or taking them from the environment"""
     print("\n🔑 API Key Setup")
     print("="*40)
     
@@ -123,74 +217,53 @@ def setup_api_keys():
         print("❌ .env file not found. Please run setup first.")
         return False
     
-    # Read current .env content
-    with open(env_file, 'r') as f:
-        content = f.read()
+    # Read and parse the current .env once
+    from dotenv import dotenv_values
+    content = env_file.read_text()
+    values = dotenv_values(stream=io.StringIO(content))
     
     # Check for existing keys
-    if "your_openai_api_key_here" not in content and "your_anthropic_api_key_here" not in content and "your_google_api_key_here" not in content:
+    placeholders = {key: placeholder for key, _, placeholder in API_KEY_PROMPTS}
+    if not any(values.get(key) == placeholders[key] for key in AI_PROVIDER_KEYS):
         print("ℹ️  API keys already configured")
         return True
     
-    print("Please provide your API keys (press Enter to skip):")
-    print("Note: At least one AI provider API key is required.")
-    
-    # OpenAI API Key
-    openai_key = input("OpenAI API Key: ").strip()
-    if openai_key:
-        content = content.replace("your_openai_api_key_here", openai_key)
-    
-    # Anthropic API Key
-    anthropic_key = input("Anthropic API Key: ").strip()
-    if anthropic_key:
-        content = content.replace("your_anthropic_api_key_here", anthropic_key)
+    if non_interactive:
+        # Scripted setups pass the keys through the environment
+        keys = {key: os.environ.get(key, "").strip() for key, _, _ in API_KEY_PROMPTS}
+        provider = os.environ.get("PREFERRED_AI_PROVIDER", "").strip().lower()
+    else:
+        print("Please provide your API keys (press Enter to skip):")
+        print("Note: At least one AI provider API key is required.")
+        keys, provider = prompt_api_keys()
     
-    # Google API Key
-    google_key = input("Google API Key: ").strip()
-    if google_key:
-        content = content.replace("your_google_api_key_here", google_key)
+    updates = {key: value for key, value in keys.items() if value}
+    if provider in ("openai", "anthropic", "google"):
+        updates["PREFERRED_AI_PROVIDER"] = provider
     
-    # Tavily API Key
-    tavily_key = input("Tavily API Key (optional): ").strip()
-    if tavily_key:
-        content = content.replace("your_tavily_api_key_here", tavily_key)
-    
-    # Preferred AI Provider
-    print("\nSelect your preferred AI provider:")
-    print("1. OpenAI (GPT-4)")
-    print("2. Anthropic (Claude)")
-    print("3. Google (Gemini)")
-    
-    provider_choice = input("Enter choice (1-3, default: 1): ").strip()
-    if provider_choice == "2":
-        content = content.replace("PREFERRED_AI_PROVIDER=openai", "PREFERRED_AI_PROVIDER=anthropic")
-    elif provider_choice == "3":
-        content = content.replace("PREFERRED_AI_PROVIDER=openai", "PREFERRED_AI_PROVIDER=google")
+    # Optionally keep the keys in the OS keyring and out of .env
+    secrets = [key for key, _, _ in API_KEY_PROMPTS if key in updates]
+    if secrets and not non_interactive and store_keys_in_keyring(updates, secrets):
+        updates["USE_KEYRING"] = "true"
     
     # Write updated content
-    with open(env_file, 'w') as f:
-        f.write(content)
+    if updates:
+        env_file.write_text(update_env_content(content, updates))
     
     print("✅ API keys configured")
     
     # Validate that at least one AI provider is configured
-    if not any([openai_key, anthropic_key, google_key]):
+    if not any(key in updates for key in AI_PROVIDER_KEYS):
         print("⚠️  Warning: No AI provider API keys were provided.")
         print("   You'll need to add at least one API key to use the system.")
     
     return True
 
-def run_test():
+def run_test(research_system):
     """Run a simple test to verify the system works"""
     print("\n🧪 Running system test...")
     
     try:
-        from deep_research_system.research_system import DeepResearchSystem
-        
-        # Initialize system
-        research_system = DeepResearchSystem()
-        print("✅ System initialized successfully")
-        
         # Show provider information
         provider_info = research_system.get_provider_info()
         print(f"🤖 Preferred Provider: {provider_info['preferred_provider'].upper()}")
@@ -206,6 +279,14 @@ def run_test():
 
 def main():
     """Main setup function"""
+    parser = argparse.ArgumentParser(description="Set up the Deep Research System")
+    parser.add_argument(
+        "--non-interactive",
+        action="store_true",
+        help="Take API keys and PREFERRED_AI_PROVIDER from environment variables instead of prompting"
+    )
+    args = parser.parse_args()
+    
     print("🚀 Deep Research System Setup")
     print("="*40)
     
@@ -225,18 +306,28 @@ def main():
         sys.exit(1)
     
     # Validate installation
-    if not validate_installation():
+    research_system_cls = validate_installation()
+    if research_system_cls is None:
         print("❌ Installation validation failed")
         sys.exit(1)
     
     # Setup API keys
-    setup_api_keys()
+    setup_api_keys(non_interactive=args.non_interactive)
     
-    # Run test
-    if not run_test():
+    # Initialize the system once and run the test against it
+    try:
+        research_system = research_system_cls()
+        print("✅ System initialized successfully")
+    except Exception as e:
+        print(f"❌ System initialization failed: {e}")
         print("❌ System test failed")
         sys.exit(1)
     
+    with research_system:
+        if not run_test(research_system):
+            print("❌ System test failed")
+            sys.exit(1)
+    
     print("\n" + "="*40)
     print("✅ Setup completed successfully!")
     print("\n📖 Next steps:")
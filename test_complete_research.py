@@ -6,7 +6,6 @@ Tests the full research pipeline with a simple topic
 
 import os
 import sys
-from deep_research_system.research_system import DeepResearchSystem
 
 def test_complete_research():
     """Test the complete research pipeline"""
@@ -14,6 +13,8 @@ def test_complete_research():
     print("="*50)
     
     try:
+        from deep_research_system.research_system import DeepResearchSystem
+        
         # Initialize the system
         print("🔧 Initializing Deep Research System...")
         research_system = DeepResearchSystem()
@@ -32,29 +33,28 @@ def test_complete_research():
         )
         
         # Display results
-        print("\n" + "="*50)
-        print("✅ RESEARCH COMPLETED SUCCESSFULLY!")
-        print("="*50)
-        print(f"Topic: {results['topic']}")
-        print(f"AI Provider: {results['ai_provider'].upper()}")
-        print(f"AI Model: {results['ai_model']}")
-        print(f"Execution Time: {results['execution_time']:.2f} seconds")
-        print(f"Research Depth: {results['research_depth']}")
-        
-        print("\n📋 EXECUTIVE SUMMARY:")
-        print("-" * 30)
-        print(results['summary'][:300] + "..." if len(results['summary']) > 300 else results['summary'])
-        
-        print(f"\n🔍 Key Findings ({len(results['key_findings'])} found):")
-        for i, finding in enumerate(results['key_findings'], 1):
-            print(f"  {i}. {finding}")
-        
-        print(f"\n💡 Recommendations ({len(results['recommendations'])} found):")
-        for i, rec in enumerate(results['recommendations'], 1):
-            print(f"  {i}. {rec}")
-        
-        print(f"\n💾 Results saved to research_outputs/ directory")
-        print("🎉 Complete research pipeline test successful!")
+        summary = results['summary']
+        findings = results['key_findings']
+        recommendations = results['recommendations']
+        print("\n".join([
+            "\n" + "=" * 50,
+            "✅ RESEARCH COMPLETED SUCCESSFULLY!",
+            "=" * 50,
+            f"Topic: {results['topic']}",
+            f"AI Provider: {results['ai_provider'].upper()}",
+            f"AI Model: {results['ai_model']}",
+            f"Execution Time: {results['execution_time']:.2f} seconds",
+            f"Research Depth: {results['research_depth']}",
+            "\n📋 EXECUTIVE SUMMARY:",
+            "-" * 30,
+            summary[:300] + "..." if len(summary) > 300 else summary,
+            f"\n🔍 Key Findings ({len(findings)} found):",
+            *(f"  {i}. {finding}" for i, finding in enumerate(findings, 1)),
+            f"\n💡 Recommendations ({len(recommendations)} found):",
+            *(f"  {i}. {rec}" for i, rec in enumerate(recommendations, 1)),
+            "🎉 Complete research pipeline test successful!"
+        ]))
+        research_system.wait_for_saves()
         
         return True
         
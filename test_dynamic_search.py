@@ -4,40 +4,39 @@ Test script to demonstrate the dynamic web search agent capabilities.
 This shows how the agent now adapts its response format based on query type.
 """
 
-import requests
-import json
+import asyncio
+import httpx
 
-def test_dynamic_search(query, expected_type):
+# Mock search results for testing
+MOCK_RESULTS = [
+    {
+        "title": "Top 10 AI Tools for 2024 - Complete Guide",
+        "snippet": "Discover the most powerful AI tools that are revolutionizing industries in 2024. From ChatGPT to Claude, find the best AI solutions for your needs.",
+        "url": "https://example.com/ai-tools-2024"
+    },
+    {
+        "title": "How to Implement Web Search in Your Application",
+        "snippet": "Step-by-step guide to integrating web search functionality using APIs and AI summarization. Learn best practices and common pitfalls.",
+        "url": "https://example.com/web-search-guide"
+    },
+    {
+        "title": "GPT-4o vs Claude vs Gemini: Comprehensive Comparison",
+        "snippet": "Detailed comparison of the three leading AI models. Performance metrics, use cases, and recommendations for different applications.",
+        "url": "https://example.com/ai-comparison"
+    }
+]
+
+async def test_dynamic_search(client, query, expected_type):
     """Test the dynamic search agent with different query types."""
     
-    # Mock search results for testing
-    mock_results = [
-        {
-            "title": "Top 10 AI Tools for 2024 - Complete Guide",
-            "snippet": "Discover the most powerful AI tools that are revolutionizing industries in 2024. From ChatGPT to Claude, find the best AI solutions for your needs.",
-            "url": "https://example.com/ai-tools-2024"
-        },
-        {
-            "title": "How to Implement Web Search in Your Application",
-            "snippet": "Step-by-step guide to integrating web search functionality using APIs and AI summarization. Learn best practices and common pitfalls.",
-            "url": "https://example.com/web-search-guide"
-        },
-        {
-            "title": "GPT-4o vs Claude vs Gemini: Comprehensive Comparison",
-            "snippet": "Detailed comparison of the three leading AI models. Performance metrics, use cases, and recommendations for different applications.",
-            "url": "https://example.com/ai-comparison"
-        }
-    ]
-    
     try:
-        response = requests.post(
+        response = await client.post(
             "http://localhost:8000/summarize",
             json={
                 "query": query,
-                "results": mock_results,
+                "results": MOCK_RESULTS,
                 "model": "gpt-4o"
-            },
-            timeout=30
+            }
         )
         
         if response.status_code == 200:
@@ -56,7 +55,7 @@ def test_dynamic_search(query, expected_type):
         print(f"❌ Connection error: {e}")
         return False
 
-def main():
+async def main():
     """Test different query types to demonstrate dynamic responses."""
     
     print("🚀 Testing Dynamic Web Search Agent")
@@ -73,12 +72,14 @@ def main():
         ("Best practices for AI development", "General Query")
     ]
     
-    success_count = 0
     total_count = len(test_cases)
     
-    for query, query_type in test_cases:
-        if test_dynamic_search(query, query_type):
-            success_count += 1
+    # The queries are independent, so send them all at once over one pooled client
+    async with httpx.AsyncClient(timeout=30, limits=httpx.Limits(max_connections=32)) as client:
+        outcomes = await asyncio.gather(*(
+            test_dynamic_search(client, query, query_type) for query, query_type in test_cases
+        ))
+    success_count = sum(outcomes)
     
     print(f"\n📊 Test Results: {success_count}/{total_count} successful")
     
@@ -88,4 +89,4 @@ def main():
         print("⚠️ Some tests failed. Check the server status and try again.")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    asyncio.run(main()) 
\ No newline at end of file
@@ -3,8 +3,8 @@
 Test script for Google Custom Search API integration
 """
 
-import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -15,9 +15,11 @@ def test_google_search_api():
     print("🔍 Testing Google Custom Search API Integration")
     print("=" * 50)
     
-    # Check if API keys are configured
-    google_api_key = os.getenv("GOOGLE_SEARCH_API_KEY")
-    google_engine_id = os.getenv("GOOGLE_SEARCH_ENGINE_ID")
+    from deep_research_system.config import Config
+    
+    # Check if API keys are configured (environment, .env or keyring)
+    google_api_key = Config.GOOGLE_SEARCH_API_KEY
+    google_engine_id = Config.GOOGLE_SEARCH_ENGINE_ID
     
     if not google_api_key:
         print("❌ GOOGLE_SEARCH_API_KEY not found in environment variables")
@@ -130,14 +132,12 @@ def main():
     print("🚀 MultiModalMind - Google Search API Test Suite")
     print("=" * 60)
     
-    # Test 1: Google Search API
-    google_test = test_google_search_api()
-    
-    # Test 2: Fallback search
-    fallback_test = test_fallback_search()
-    
-    # Test 3: Engine availability
-    availability_test = test_search_engines_availability()
+    # The tests are independent and mostly wait on the network, so run them side by side;
+    # the search tool's pooled session is shared across them
+    tests = [test_google_search_api, test_fallback_search, test_search_engines_availability]
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        futures = [executor.submit(test) for test in tests]
+        google_test, fallback_test, availability_test = (future.result() for future in futures)
     
     # Summary
     print("\n" + "=" * 60)